@@ -0,0 +1,42 @@
+"""Add item coordinates and catalog indexes
+
+Revision ID: 3f9b6d2e8a41
+Revises: e5a0c93f17d4
+Create Date: 2026-10-18 13:02:55.940162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9b6d2e8a41'
+down_revision: Union[str, None] = 'e5a0c93f17d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('items', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_items_category_price', 'items', ['category_id', 'price_per_day'], unique=False)
+    op.create_index('ix_items_category_created', 'items', ['category_id', 'created_at'], unique=False)
+    op.create_index('ix_items_city_price', 'items', [sa.text('lower(city)'), 'price_per_day'], unique=False)
+    op.create_index('ix_items_price', 'items', ['price_per_day'], unique=False)
+    op.create_index('ix_items_created', 'items', ['created_at'], unique=False)
+    op.create_index('ix_items_rating', 'items', ['rating_avg', 'rating_count'], unique=False)
+    op.create_index('ix_items_location', 'items', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_items_location', table_name='items')
+    op.drop_index('ix_items_rating', table_name='items')
+    op.drop_index('ix_items_created', table_name='items')
+    op.drop_index('ix_items_price', table_name='items')
+    op.drop_index('ix_items_city_price', table_name='items')
+    op.drop_index('ix_items_category_created', table_name='items')
+    op.drop_index('ix_items_category_price', table_name='items')
+    op.drop_column('items', 'longitude')
+    op.drop_column('items', 'latitude')
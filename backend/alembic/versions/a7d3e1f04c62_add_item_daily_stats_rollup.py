@@ -0,0 +1,77 @@
+"""Add item daily stats rollup
+
+Revision ID: a7d3e1f04c62
+Revises: 3f9b6d2e8a41
+Create Date: 2026-10-18 14:40:18.302775
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e1f04c62'
+down_revision: Union[str, None] = '3f9b6d2e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('item_daily_stats',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('bookings_pending', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('bookings_confirmed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('bookings_cancelled', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('bookings_completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('booked_days', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('earnings', sa.Float(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('item_id', 'day')
+    )
+    op.create_index('ix_item_daily_stats_owner_day', 'item_daily_stats', ['owner_id', 'day'], unique=False)
+
+    # Backfill from the existing bookings. Counts go to the start day; booked
+    # days and earnings are spread over the billed days of confirmed and
+    # completed bookings (same rules as utilities/analytics.py).
+    op.execute("""
+        WITH counts AS (
+            SELECT b.item_id, CAST(b.start_date AS date) AS day, i.owner_id,
+                   COUNT(*) FILTER (WHERE b.status = 'pending') AS bookings_pending,
+                   COUNT(*) FILTER (WHERE b.status = 'confirmed') AS bookings_confirmed,
+                   COUNT(*) FILTER (WHERE b.status = 'cancelled') AS bookings_cancelled,
+                   COUNT(*) FILTER (WHERE b.status = 'completed') AS bookings_completed
+            FROM bookings b JOIN items i ON i.id = b.item_id
+            GROUP BY 1, 2, 3
+        ),
+        rentals AS (
+            SELECT b.item_id, b.start_date, b.total_price, i.owner_id,
+                   GREATEST(CEIL(EXTRACT(EPOCH FROM b.end_date - b.start_date) / 86400), 1)::int AS days
+            FROM bookings b JOIN items i ON i.id = b.item_id
+            WHERE b.status IN ('confirmed', 'completed')
+        ),
+        occupancy AS (
+            SELECT r.item_id, CAST(r.start_date AS date) + d.offset_days AS day, r.owner_id,
+                   COUNT(*) AS booked_days, SUM(r.total_price / r.days) AS earnings
+            FROM rentals r
+            CROSS JOIN LATERAL generate_series(0, r.days - 1) AS d(offset_days)
+            GROUP BY 1, 2, 3
+        )
+        INSERT INTO item_daily_stats (item_id, day, owner_id, bookings_pending, bookings_confirmed,
+                                      bookings_cancelled, bookings_completed, booked_days, earnings)
+        SELECT COALESCE(c.item_id, o.item_id), COALESCE(c.day, o.day), COALESCE(c.owner_id, o.owner_id),
+               COALESCE(c.bookings_pending, 0), COALESCE(c.bookings_confirmed, 0),
+               COALESCE(c.bookings_cancelled, 0), COALESCE(c.bookings_completed, 0),
+               COALESCE(o.booked_days, 0), COALESCE(o.earnings, 0)
+        FROM counts c
+        FULL OUTER JOIN occupancy o ON o.item_id = c.item_id AND o.day = c.day
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_daily_stats_owner_day', table_name='item_daily_stats')
+    op.drop_table('item_daily_stats')
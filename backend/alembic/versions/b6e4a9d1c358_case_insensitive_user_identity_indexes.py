@@ -0,0 +1,45 @@
+"""Case-insensitive unique indexes on username and email
+
+Revision ID: b6e4a9d1c358
+Revises: d2b8f5c7e913
+Create Date: 2026-10-19 09:12:44.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e4a9d1c358'
+down_revision: Union[str, None] = 'd2b8f5c7e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Accounts that only differ in case cannot be merged automatically; stop and list them
+    connection = op.get_bind()
+    for column in ('username', 'email'):
+        duplicates = connection.execute(sa.text(
+            f"SELECT lower({column}) FROM users GROUP BY lower({column}) HAVING COUNT(*) > 1 LIMIT 20"
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                f"users.{column} has values that only differ in case, resolve them before upgrading: "
+                + ", ".join(duplicates)
+            )
+
+    op.create_index('uq_users_username_lower', 'users', [sa.text('lower(username)')], unique=True)
+    op.create_index('uq_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    # The case-insensitive indexes enforce (and serve) everything the old ones did
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.drop_index('uq_users_email_lower', table_name='users')
+    op.drop_index('uq_users_username_lower', table_name='users')
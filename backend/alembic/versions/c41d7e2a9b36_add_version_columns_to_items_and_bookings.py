@@ -0,0 +1,28 @@
+"""Add version columns to items and bookings
+
+Revision ID: c41d7e2a9b36
+Revises: 852978b74962
+Create Date: 2026-10-18 10:03:41.220914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2a9b36'
+down_revision: Union[str, None] = '852978b74962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('bookings', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('bookings', 'version')
+    op.drop_column('items', 'version')
@@ -0,0 +1,54 @@
+"""Add item vectors and similar items tables
+
+Revision ID: c8d2f6a9e417
+Revises: f1c7a2e5b804
+Create Date: 2026-10-19 11:41:09.377212
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f6a9e417'
+down_revision: Union[str, None] = 'f1c7a2e5b804'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing items start stale; run scripts/rebuild_similarities.py to fill the lists at once
+    op.add_column('items', sa.Column('similarity_stale', sa.Boolean(), server_default=sa.text('true'), nullable=False))
+    op.create_index(
+        'ix_items_similarity_stale', 'items', ['id'], unique=False,
+        postgresql_where=sa.text('similarity_stale'), sqlite_where=sa.text('similarity_stale'),
+    )
+    op.create_table('item_vectors',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_index('ix_item_vectors_category', 'item_vectors', ['category_id'], unique=False)
+    op.create_table('item_similarities',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('similar_item_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.ForeignKeyConstraint(['similar_item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('item_id', 'rank')
+    )
+    op.create_index('ix_item_similarities_similar', 'item_similarities', ['similar_item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_similarities_similar', table_name='item_similarities')
+    op.drop_table('item_similarities')
+    op.drop_index('ix_item_vectors_category', table_name='item_vectors')
+    op.drop_table('item_vectors')
+    op.drop_index('ix_items_similarity_stale', table_name='items')
+    op.drop_column('items', 'similarity_stale')
@@ -0,0 +1,162 @@
+"""Partition bookings by start_date, add bookings archive and booking indexes
+
+Revision ID: d2b8f5c7e913
+Revises: a7d3e1f04c62
+Create Date: 2026-10-19 09:21:47.113608
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8f5c7e913'
+down_revision: Union[str, None] = 'a7d3e1f04c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BOOKING_INDEXES = [
+    ('ix_bookings_item_status_start', ['item_id', 'status', 'start_date']),
+    ('ix_bookings_renter_start', ['renter_id', 'start_date']),
+    ('ix_bookings_status_start', ['status', 'start_date']),
+    ('ix_bookings_status_end', ['status', 'end_date']),
+]
+
+
+def _partition_bookings() -> None:
+    """
+    Rebuilds bookings as a table range partitioned by month of start_date.
+    Partitions cover the existing data up to three months ahead; the
+    scheduler keeps creating future ones (utilities/partitions.py).
+    """
+    op.execute("ALTER TABLE bookings RENAME TO bookings_unpartitioned")
+    op.execute("ALTER INDEX bookings_pkey RENAME TO bookings_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_bookings_id RENAME TO ix_bookings_unpartitioned_id")
+
+    op.execute("""
+        CREATE TABLE bookings (LIKE bookings_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (start_date)
+    """)
+    # The primary key of a partitioned table must contain the partition key
+    op.execute("ALTER TABLE bookings ADD PRIMARY KEY (id, start_date)")
+    op.execute("ALTER TABLE bookings ADD FOREIGN KEY (item_id) REFERENCES items (id)")
+    op.execute("ALTER TABLE bookings ADD FOREIGN KEY (renter_id) REFERENCES users (id)")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+
+    op.execute("""
+        DO $$
+        DECLARE
+            month date;
+            last_month date := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(MIN(start_date), now()))::date INTO month FROM bookings_unpartitioned;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)',
+                    'bookings_p' || to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+
+    op.execute("INSERT INTO bookings SELECT * FROM bookings_unpartitioned")
+    op.execute("DROP TABLE bookings_unpartitioned")
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+
+
+def _create_partitioned_archive() -> None:
+    """bookings_archive, partitioned by year of start_date (cold data)."""
+    op.execute("""
+        CREATE TABLE bookings_archive (
+            id INTEGER NOT NULL,
+            start_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            end_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            total_price DOUBLE PRECISION NOT NULL,
+            status bookingstatus NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1,
+            item_id INTEGER NOT NULL REFERENCES items (id),
+            renter_id INTEGER NOT NULL REFERENCES users (id),
+            archived_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, start_date)
+        ) PARTITION BY RANGE (start_date)
+    """)
+    op.execute("""
+        DO $$
+        DECLARE
+            year date;
+            last_year date := (date_trunc('year', now()) + interval '1 year')::date;
+        BEGIN
+            SELECT date_trunc('year', COALESCE(MIN(start_date), now()))::date INTO year FROM bookings;
+            WHILE year <= last_year LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF bookings_archive FOR VALUES FROM (%L) TO (%L)',
+                    'bookings_archive_p' || to_char(year, 'YYYY'), year, (year + interval '1 year')::date
+                );
+                year := (year + interval '1 year')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE bookings_archive_default PARTITION OF bookings_archive DEFAULT")
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    if is_postgres:
+        _partition_bookings()
+        _create_partitioned_archive()
+    else:
+        op.create_table('bookings_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'confirmed', 'cancelled', 'completed', name='bookingstatus'), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('renter_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+        sa.ForeignKeyConstraint(['renter_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    for name, columns in BOOKING_INDEXES:
+        op.create_index(name, 'bookings', columns, unique=False)
+    op.create_index('ix_bookings_archive_renter_start', 'bookings_archive', ['renter_id', 'start_date'], unique=False)
+    op.create_index('ix_bookings_archive_item_start', 'bookings_archive', ['item_id', 'start_date'], unique=False)
+    op.create_index('ix_items_owner_id', 'items', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    op.drop_index('ix_items_owner_id', table_name='items')
+    for name, _ in BOOKING_INDEXES:
+        op.drop_index(name, table_name='bookings')
+
+    # Archived bookings go back into the hot table before it is un-partitioned
+    op.execute("""
+        INSERT INTO bookings (id, start_date, end_date, total_price, status, version, item_id, renter_id)
+        SELECT id, start_date, end_date, total_price, status, version, item_id, renter_id FROM bookings_archive
+    """)
+    op.drop_table('bookings_archive')
+
+    if is_postgres:
+        op.execute("ALTER TABLE bookings RENAME TO bookings_partitioned")
+        op.execute("ALTER INDEX ix_bookings_id RENAME TO ix_bookings_partitioned_id")
+        op.execute("ALTER TABLE bookings_partitioned RENAME CONSTRAINT bookings_pkey TO bookings_partitioned_pkey")
+        op.execute("""
+            CREATE TABLE bookings (LIKE bookings_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        """)
+        op.execute("ALTER TABLE bookings ADD CONSTRAINT bookings_pkey PRIMARY KEY (id)")
+        op.execute("ALTER TABLE bookings ADD FOREIGN KEY (item_id) REFERENCES items (id)")
+        op.execute("ALTER TABLE bookings ADD FOREIGN KEY (renter_id) REFERENCES users (id)")
+        op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+        op.execute("INSERT INTO bookings SELECT * FROM bookings_partitioned")
+        op.execute("DROP TABLE bookings_partitioned")
+        op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
@@ -0,0 +1,44 @@
+"""Add notification frequency and pending notifications
+
+Revision ID: e4b9d2a6c713
+Revises: a3f7c1d9e286
+Create Date: 2026-10-19 17:32:51.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9d2a6c713'
+down_revision: Union[str, None] = 'a3f7c1d9e286'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+notification_frequency = sa.Enum('immediate', 'hourly', 'daily', name='notificationfrequency')
+
+
+def upgrade() -> None:
+    notification_frequency.create(op.get_bind(), checkfirst=True)
+    op.add_column('users', sa.Column(
+        'notification_frequency', notification_frequency, server_default='immediate', nullable=False
+    ))
+    op.create_table('pending_notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pending_notifications_user_id', 'pending_notifications', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pending_notifications_user_id', table_name='pending_notifications')
+    op.drop_table('pending_notifications')
+    op.drop_column('users', 'notification_frequency')
+    notification_frequency.drop(op.get_bind(), checkfirst=True)
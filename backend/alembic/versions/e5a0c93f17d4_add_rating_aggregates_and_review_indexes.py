@@ -0,0 +1,66 @@
+"""Add rating aggregates and review indexes
+
+Revision ID: e5a0c93f17d4
+Revises: c41d7e2a9b36
+Create Date: 2026-10-18 11:26:10.583017
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0c93f17d4'
+down_revision: Union[str, None] = 'c41d7e2a9b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Several reviews of one item by the same renter cannot be merged automatically; stop and list them
+    connection = op.get_bind()
+    duplicate_count = connection.execute(sa.text(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM reviews GROUP BY item_id, user_id HAVING COUNT(*) > 1) AS duplicates"
+    )).scalar()
+    if duplicate_count:
+        duplicates = connection.execute(sa.text(
+            "SELECT item_id, user_id, COUNT(*) FROM reviews GROUP BY item_id, user_id HAVING COUNT(*) > 1 LIMIT 20"
+        )).all()
+        raise RuntimeError(
+            f"reviews has {duplicate_count} (item_id, user_id) pairs with more than one review, "
+            "resolve them before upgrading: "
+            + ", ".join(f"item {item_id} / user {user_id} ({count} reviews)" for item_id, user_id, count in duplicates)
+        )
+
+    op.add_column('items', sa.Column('rating_avg', sa.Float(), server_default='0', nullable=False))
+    op.add_column('items', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('rating_avg', sa.Float(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_unique_constraint('uq_reviews_item_user', 'reviews', ['item_id', 'user_id'])
+    op.create_index('ix_reviews_item_created', 'reviews', ['item_id', 'created_at', 'id'], unique=False)
+
+    # Backfill the aggregates from the existing reviews
+    op.execute("""
+        UPDATE items SET
+            rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.item_id = items.id),
+            rating_avg = COALESCE((SELECT AVG(rating) FROM reviews WHERE reviews.item_id = items.id), 0)
+    """)
+    op.execute("""
+        UPDATE users SET
+            rating_count = (SELECT COUNT(*) FROM reviews JOIN items ON items.id = reviews.item_id
+                            WHERE items.owner_id = users.id),
+            rating_avg = COALESCE((SELECT AVG(rating) FROM reviews JOIN items ON items.id = reviews.item_id
+                                   WHERE items.owner_id = users.id), 0)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_item_created', table_name='reviews')
+    op.drop_constraint('uq_reviews_item_user', 'reviews', type_='unique')
+    op.drop_column('users', 'rating_count')
+    op.drop_column('users', 'rating_avg')
+    op.drop_column('items', 'rating_count')
+    op.drop_column('items', 'rating_avg')
@@ -0,0 +1,32 @@
+"""Add item pricing rules
+
+Revision ID: f1c7a2e5b804
+Revises: b6e4a9d1c358
+Create Date: 2026-10-19 10:03:27.915640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a2e5b804'
+down_revision: Union[str, None] = 'b6e4a9d1c358'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('weekend_price_per_day', sa.Float(), nullable=True))
+    op.add_column('items', sa.Column('weekly_discount_pct', sa.Float(), server_default='0', nullable=False))
+    op.add_column('items', sa.Column('monthly_discount_pct', sa.Float(), server_default='0', nullable=False))
+    op.add_column('items', sa.Column('min_rental_days', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('items', 'min_rental_days')
+    op.drop_column('items', 'monthly_discount_pct')
+    op.drop_column('items', 'weekly_discount_pct')
+    op.drop_column('items', 'weekend_price_per_day')
@@ -1,20 +1,115 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from fastapi import Request
+from typing import Optional
 import os
+import threading
+import time
 
 # In a real application, this should come from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://rentify_user:your_secure_password@db/rentify_db")
 
+# Optional streaming replica for read-only routes. When unset (local setups
+# and tests) the read routes use the primary through the same code path.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# Reads fall back to the primary while the replica is further behind than this
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", 2))
+# After a write, the same client reads from the primary for this long
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 10))
+READ_YOUR_WRITES_COOKIE = "rentify_primary_until"
+# psycopg 3 prepares a statement server-side once a connection has run it
+# this many times; "none" turns that off (needed behind PgBouncer in
+# transaction mode before 1.21). psycopg2 never prepares statements.
+DB_PREPARE_THRESHOLD = os.getenv("DB_PREPARE_THRESHOLD", "2")
+# Compiled statements SQLAlchemy keeps per engine (every fieldset/filter
+# combination of the read routes is a separate entry)
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", 1500))
 
-engine = create_engine(DATABASE_URL)
+# ===================================================================
+# ENGINES
+# ===================================================================
+# Engines are created on first use, in the process that uses them. With
+# `gunicorn --preload` the app is built in the master, which therefore never
+# opens a connection; and if it did, each worker replaces the inherited
+# pools after the fork instead of sharing the master's sockets.
+
+_engine: Optional[Engine] = None
+_replica_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine, shared by the app and the scripts."""
+    options = {"query_cache_size": DB_QUERY_CACHE_SIZE}
+    if make_url(url).get_dialect().driver == "psycopg":
+        threshold = DB_PREPARE_THRESHOLD.strip().lower()
+        options["connect_args"] = {"prepare_threshold": None if threshold in ("", "none") else int(threshold)}
+    return options
+
+
+def configure(database_url: str, replica_url: Optional[str] = None):
+    """Sets the URLs the engines are created from (called by main.create_app)."""
+    global DATABASE_URL, DATABASE_REPLICA_URL, _engine, _replica_engine
+    with _engine_lock:
+        if (database_url, replica_url) == (DATABASE_URL, DATABASE_REPLICA_URL):
+            return
+        for existing in {_engine, _replica_engine} - {None}:
+            existing.dispose()
+        DATABASE_URL, DATABASE_REPLICA_URL = database_url, replica_url
+        _engine = _replica_engine = None
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+    return _engine
+
+
+def get_replica_engine() -> Engine:
+    global _replica_engine
+    if not DATABASE_REPLICA_URL:
+        return get_engine()
+    if _replica_engine is None:
+        with _engine_lock:
+            if _replica_engine is None:
+                _replica_engine = create_engine(DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL))
+    return _replica_engine
 
-# In a real application, this should come from environment variables
-#SQLALCHEMY_DATABASE_URL = "postgresql://rentify_user:your_secure_password@db/rentify_db"
 
-#engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def __getattr__(name: str):
+    # `database.engine` and `database.replica_engine` keep working
+    if name == "engine":
+        return get_engine()
+    if name == "replica_engine":
+        return get_replica_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _reset_engines_after_fork():
+    # The child must not use connections inherited from the parent; close=False
+    # leaves them to the parent and gives the child fresh, empty pools
+    for existing in {_engine, _replica_engine} - {None}:
+        existing.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_engines_after_fork)
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+def SessionLocal(**kwargs) -> Session:
+    return _session_factory(bind=get_engine(), **kwargs)
+
+
+def ReplicaSessionLocal(**kwargs) -> Session:
+    return _session_factory(bind=get_replica_engine(), **kwargs)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -29,3 +124,73 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class ReplicaLagMonitor:
+    """
+    Measures replication lag at most every REPLICA_LAG_CHECK_SECONDS and
+    caches the answer, so routing a read costs no extra query.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = True
+
+    def is_healthy(self) -> bool:
+        if not DATABASE_REPLICA_URL:
+            return True
+        now = time.monotonic()
+        if now - self._checked_at < REPLICA_LAG_CHECK_SECONDS:
+            return self._healthy
+        with self._lock:
+            if now - self._checked_at >= REPLICA_LAG_CHECK_SECONDS:
+                self._healthy = self._measure() <= REPLICA_MAX_LAG_SECONDS
+                self._checked_at = now
+        return self._healthy
+
+    def _measure(self) -> float:
+        try:
+            with get_replica_engine().connect() as connection:
+                # A replica that has replayed everything it received is not behind,
+                # however old the last transaction is (an idle primary sends nothing)
+                lag = connection.execute(text("""
+                    SELECT CASE
+                        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                """)).scalar()
+            return float(lag or 0)
+        except Exception as e:
+            print(f"--- REPLICA LAG CHECK FAILED: {e} (reading from primary) ---")
+            return float("inf")
+
+
+replica_lag = ReplicaLagMonitor()
+
+
+def _wants_primary(request: Request) -> bool:
+    """True if this client wrote recently and must see its own writes."""
+    if request.headers.get("X-Read-Consistency", "").lower() == "strong":
+        return True
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+# Dependency for read-only routes
+def get_read_db(request: Request):
+    """
+    Like get_db, but routed to the replica unless the client wrote within
+    READ_YOUR_WRITES_SECONDS (see utilities/read_your_writes.py) or the
+    replica lags too far behind. Only use it for routes that never write.
+    """
+    if _wants_primary(request) or not replica_lag.is_healthy():
+        db = SessionLocal()
+    else:
+        db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
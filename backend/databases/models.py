@@ -9,9 +9,12 @@ from sqlalchemy import (
     Date,
     Enum as SQLAlchemyEnum,
     JSON,
+    UniqueConstraint,
+    Index,
+    LargeBinary,
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 from .database import Base
 
@@ -23,11 +26,29 @@ class BookingStatus(enum.Enum):
     completed = "completed"
 
 
+class NotificationFrequency(enum.Enum):
+    immediate = "immediate"
+    hourly = "hourly"
+    daily = "daily"
+
+
+# Allowed booking status changes; anything else is rejected with 409.
+BOOKING_TRANSITIONS = {
+    BookingStatus.pending: {BookingStatus.confirmed, BookingStatus.cancelled},
+    BookingStatus.confirmed: {BookingStatus.completed, BookingStatus.cancelled},
+}
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Usernames and emails are unique regardless of case; lookups go through lower()
+        Index("uq_users_username_lower", text("lower(username)"), unique=True),
+        Index("uq_users_email_lower", text("lower(email)"), unique=True),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    username: Mapped[str] = mapped_column(String, unique=True, index=True)
-    email: Mapped[str] = mapped_column(String, unique=True, index=True)
+    username: Mapped[str] = mapped_column(String)
+    email: Mapped[str] = mapped_column(String)
     hashed_password: Mapped[str] = mapped_column(String)
     full_name: Mapped[str | None] = mapped_column(String, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -35,6 +56,15 @@ class User(Base):
         DateTime, default=func.now()
     )
 
+    # Rating over all reviews of the user's items, maintained on review insert/delete
+    rating_avg: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    rating_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Booking emails are sent one by one, or collected into an hourly/daily digest
+    notification_frequency: Mapped[NotificationFrequency] = mapped_column(
+        SQLAlchemyEnum(NotificationFrequency), default=NotificationFrequency.immediate, server_default="immediate"
+    )
+
     items: Mapped[list["Item"]] = relationship("Item", back_populates="owner")
     bookings: Mapped[list["Booking"]] = relationship(
         "Booking", back_populates="renter"
@@ -57,6 +87,24 @@ class Category(Base):
 
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        # Catalog filters and sorts (see utilities/catalog.py)
+        Index("ix_items_category_price", "category_id", "price_per_day"),
+        Index("ix_items_category_created", "category_id", "created_at"),
+        # The city filter is case-insensitive
+        Index("ix_items_city_price", text("lower(city)"), "price_per_day"),
+        Index("ix_items_price", "price_per_day"),
+        Index("ix_items_created", "created_at"),
+        Index("ix_items_rating", "rating_avg", "rating_count"),
+        Index("ix_items_location", "latitude", "longitude"),
+        # Owner listings and the bookings of an owner's items
+        Index("ix_items_owner_id", "owner_id"),
+        # Only the few items waiting for a similarity refresh are indexed
+        Index(
+            "ix_items_similarity_stale", "id",
+            postgresql_where=text("similarity_stale"), sqlite_where=text("similarity_stale"),
+        ),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
     description: Mapped[str] = mapped_column(String)
@@ -69,6 +117,8 @@ class Item(Base):
     city: Mapped[str | None] = mapped_column(String, nullable=True)
     state: Mapped[str | None] = mapped_column(String, nullable=True)
     zip_code: Mapped[str | None] = mapped_column(String, nullable=True)
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     # Availability Date Fields
     available_from: Mapped[date | None] = mapped_column(Date, nullable=True)
@@ -78,6 +128,21 @@ class Item(Base):
     availability_rule: Mapped[str] = mapped_column(String, default="all_days")
     disabled_dates: Mapped[list[date] | None] = mapped_column(JSON, nullable=True)
 
+    # Pricing rules (see utilities/pricing.py)
+    weekend_price_per_day: Mapped[float | None] = mapped_column(Float, nullable=True)  # None = price_per_day
+    weekly_discount_pct: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    monthly_discount_pct: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    min_rental_days: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+    # Optimistic concurrency: every UPDATE checks and increments the version
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+    # Denormalized review aggregates, maintained on review insert/delete
+    rating_avg: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    rating_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Set when name, description or category change; cleared by utilities/similarity.py
+    similarity_stale: Mapped[bool] = mapped_column(Boolean, default=True, server_default=text("true"))
 
     owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     category_id: Mapped[int] = mapped_column(
@@ -96,9 +161,24 @@ class Item(Base):
         "Review", back_populates="item"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Booking(Base):
+    """
+    Hot bookings. On PostgreSQL the table is range partitioned by start_date
+    (monthly, see utilities/partitions.py), so its database primary key is
+    (id, start_date); ids stay unique through the shared sequence. Finished
+    bookings are moved to BookingArchive by the scheduler.
+    """
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_item_status_start", "item_id", "status", "start_date"),
+        Index("ix_bookings_renter_start", "renter_id", "start_date"),
+        # Scheduler scans: pending expiry, completion and archival
+        Index("ix_bookings_status_start", "status", "start_date"),
+        Index("ix_bookings_status_end", "status", "end_date"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     start_date: Mapped[DateTime] = mapped_column(DateTime)
     end_date: Mapped[DateTime] = mapped_column(DateTime)
@@ -106,6 +186,7 @@ class Booking(Base):
     status: Mapped[BookingStatus] = mapped_column(
         SQLAlchemyEnum(BookingStatus), default=BookingStatus.pending
     )
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
 
     item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"))
     renter_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -113,9 +194,39 @@ class Booking(Base):
     item: Mapped["Item"] = relationship("Item", back_populates="bookings")
     renter: Mapped["User"] = relationship("User", back_populates="bookings")
 
+    __mapper_args__ = {"version_id_col": version}
+
+
+class BookingArchive(Base):
+    """
+    Cold storage for completed and cancelled bookings older than
+    ARCHIVE_BOOKINGS_AFTER_MONTHS. Same columns as Booking, so hot queries
+    never scan them. Partitioned yearly by start_date on PostgreSQL.
+    """
+    __tablename__ = "bookings_archive"
+    __table_args__ = (
+        Index("ix_bookings_archive_renter_start", "renter_id", "start_date"),
+        Index("ix_bookings_archive_item_start", "item_id", "start_date"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    start_date: Mapped[DateTime] = mapped_column(DateTime)
+    end_date: Mapped[DateTime] = mapped_column(DateTime)
+    total_price: Mapped[float] = mapped_column(Float)
+    status: Mapped[BookingStatus] = mapped_column(SQLAlchemyEnum(BookingStatus))
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"))
+    renter_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    archived_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # One review per renter and item
+        UniqueConstraint("item_id", "user_id", name="uq_reviews_item_user"),
+        # Pages an item's reviews newest-first without sorting
+        Index("ix_reviews_item_created", "item_id", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     rating: Mapped[int] = mapped_column(Integer)
     comment: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -129,3 +240,120 @@ class Review(Base):
     item: Mapped["Item"] = relationship("Item", back_populates="reviews")
     user: Mapped["User"] = relationship("User", back_populates="reviews")
 
+
+class ItemDailyStats(Base):
+    """
+    Per-item, per-day rollup of booking activity for owner analytics.
+    Booking counts are attributed to the day a booking starts (by current
+    status); booked days and earnings are spread over every day of confirmed
+    and completed rentals. Maintained incrementally by utilities/analytics.py.
+    """
+    __tablename__ = "item_daily_stats"
+    __table_args__ = (
+        Index("ix_item_daily_stats_owner_day", "owner_id", "day"),
+    )
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    bookings_pending: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    bookings_confirmed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    bookings_cancelled: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    bookings_completed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    booked_days: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    earnings: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+
+
+class ItemVector(Base):
+    """Hashed, L2-normalized text vector of an item (float16), see utilities/similarity.py."""
+    __tablename__ = "item_vectors"
+    __table_args__ = (
+        Index("ix_item_vectors_category", "category_id"),
+    )
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"), primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer)
+    vector: Mapped[bytes] = mapped_column(LargeBinary)
+
+
+class ItemSimilarity(Base):
+    """Ranked top-K most similar items of an item; read with one primary key range scan."""
+    __tablename__ = "item_similarities"
+    __table_args__ = (
+        # Removing an item from every list it appears in
+        Index("ix_item_similarities_similar", "similar_item_id"),
+    )
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"), primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    similar_item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id"))
+    score: Mapped[float] = mapped_column(Float)
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key and the response it produced, so that
+    retried create requests return the original result instead of running again.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(String(255))
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    endpoint: Mapped[str] = mapped_column(String)
+    request_fingerprint: Mapped[str] = mapped_column(String(64))
+    # Both stay NULL while the original request is still in progress
+    response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, default=func.now()
+    )
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, index=True)
+
+
+class RefreshToken(Base):
+    """
+    One refresh token of a login session ("family"). Tokens are single-use:
+    refreshing marks the token used and issues the next one in the family,
+    and presenting a used token again revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # SHA-256 of the opaque token; the token itself is never stored
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    family_id: Mapped[str] = mapped_column(String(32), index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, default=func.now()
+    )
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, index=True)
+    used_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    revoked_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+
+
+class RevokedToken(Base):
+    """
+    A revoked access token `jti` or login session id. Rows only need to
+    outlive the access tokens they block; every worker holds the live ones
+    in memory (utilities/revocation.py).
+    """
+    __tablename__ = "revoked_tokens"
+    token_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, index=True)
+
+
+class PendingNotification(Base):
+    """
+    A notification waiting for its recipient's next digest email. `data`
+    holds everything the email shows, so a digest renders without joins.
+    """
+    __tablename__ = "pending_notifications"
+    __table_args__ = (
+        Index("ix_pending_notifications_user_id", "user_id", "id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    kind: Mapped[str] = mapped_column(String(50))
+    data: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, default=func.now()
+    )
@@ -1,13 +1,19 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
+from typing import Optional, List, Dict, Literal
 from datetime import datetime, date
-from .models import BookingStatus
+from .models import BookingStatus, NotificationFrequency
 
 
 # --- Token Schemas ---
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Seconds until the access token expires
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -34,6 +40,15 @@ class UserResponse(UserBase):
     id: int
     is_active: bool
     created_at: datetime
+    rating_avg: float
+    rating_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationPreferences(BaseModel):
+    # immediate: one email per booking event; hourly/daily: one digest email per period
+    notification_frequency: NotificationFrequency
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -66,6 +81,8 @@ class ItemBase(BaseModel):
     city: Optional[str] = None
     state: Optional[str] = None
     zip_code: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
     # Availability fields
     available_from: Optional[date] = None
@@ -73,6 +90,12 @@ class ItemBase(BaseModel):
     availability_rule: Optional[str] = "all_days"
     disabled_dates: Optional[List[date]] = []
 
+    # Pricing rules
+    weekend_price_per_day: Optional[float] = Field(None, ge=0)
+    weekly_discount_pct: float = Field(0, ge=0, le=100)
+    monthly_discount_pct: float = Field(0, ge=0, le=100)
+    min_rental_days: int = Field(1, ge=1)
+
 
 class ItemCreate(ItemBase):
     pass
@@ -95,6 +118,62 @@ class ItemUpdate(BaseModel):
     availability_rule: Optional[str] = None
     disabled_dates: Optional[List[date]] = None
 
+    weekend_price_per_day: Optional[float] = Field(None, ge=0)
+    weekly_discount_pct: Optional[float] = Field(None, ge=0, le=100)
+    monthly_discount_pct: Optional[float] = Field(None, ge=0, le=100)
+    min_rental_days: Optional[int] = Field(None, ge=1)
+
+
+class ItemImportRow(ItemBase):
+    """A single row of a bulk item import; the category may be given by id or by name."""
+    category_id: Optional[int] = None
+    category: Optional[str] = None
+    is_available: bool = True
+    image: Optional[str] = None  # File name inside the uploaded images zip
+
+
+class ItemImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ItemBulkImportResponse(BaseModel):
+    created: int
+    item_ids: List[int]
+    errors: List[ItemImportError]
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: Literal["item", "category", "city"]
+
+
+# --- Quote Schemas ---
+class QuoteLine(BaseModel):
+    item_id: int
+    start_date: datetime
+    end_date: datetime
+
+
+class QuoteRequest(BaseModel):
+    lines: List[QuoteLine] = Field(min_length=1, max_length=500)
+
+
+class Quote(QuoteLine):
+    # Price breakdown (absent for unknown items); `error` says why the line cannot be booked as requested
+    days: Optional[int] = None
+    weekday_days: Optional[int] = None
+    weekend_days: Optional[int] = None
+    subtotal: Optional[float] = None
+    discount_pct: Optional[float] = None
+    discount: Optional[float] = None
+    total_price: Optional[float] = None
+    error: Optional[str] = None
+
+
+class QuoteResponse(BaseModel):
+    quotes: List[Quote]
+
 
 # --- Booking Schemas (forward reference to ItemResponse) ---
 class BookingBase(BaseModel):
@@ -108,6 +187,8 @@ class BookingCreate(BookingBase):
 
 class BookingStatusUpdate(BaseModel):
     status: BookingStatus
+    # If given, the update only applies when the booking is still at this version
+    version: Optional[int] = None
 
 
 # Define BookingResponse first, referencing "ItemResponse" as a string
@@ -115,6 +196,7 @@ class BookingResponse(BookingBase):
     id: int
     total_price: float
     status: BookingStatus
+    version: int
     item_id: int
     renter_id: int
     item: Optional["ItemResponse"]  # <-- forward reference to ItemResponse
@@ -129,6 +211,9 @@ class ItemResponse(ItemBase):
     owner_id: int
     image_url: Optional[str] = None
     created_at: datetime
+    version: int
+    rating_avg: float
+    rating_count: int
     owner: Optional[UserResponse] = None
     category: Optional[CategoryResponse] = None
 
@@ -141,7 +226,7 @@ BookingResponse.model_rebuild()
 
 # --- Review Schemas ---
 class ReviewBase(BaseModel):
-    rating: int
+    rating: int = Field(ge=1, le=5)
     comment: Optional[str] = None
 
 
@@ -156,3 +241,90 @@ class ReviewResponse(ReviewBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FacetValue(BaseModel):
+    value: str
+    label: str
+    count: int
+
+
+class ItemFacetsResponse(BaseModel):
+    category: List[FacetValue]
+    city: List[FacetValue]
+    price: List[FacetValue]
+
+
+# --- Owner Analytics Schemas ---
+class BookingCounts(BaseModel):
+    pending: int
+    confirmed: int
+    cancelled: int
+    completed: int
+
+
+class ListingStats(BaseModel):
+    bookings: BookingCounts
+    booked_days: int
+    occupancy_rate: float  # booked days / days in range (0..1)
+    earnings: float  # confirmed and completed bookings, spread over their rental days
+
+
+class ItemListingStats(ListingStats):
+    item_id: int
+    name: str
+
+
+class OwnerStatsResponse(BaseModel):
+    start: date
+    end: date
+    days: int
+    totals: ListingStats
+    items: List[ItemListingStats]
+
+
+class ReviewPage(BaseModel):
+    reviews: List[ReviewResponse]
+    # Pass as `cursor` to fetch the next (older) page; null on the last page
+    next_cursor: Optional[str] = None
+
+
+# --- Dashboard Schemas ---
+# The dashboard payload is normalized: every item, booking, user and category
+# appears once in its id-keyed map and the section lists only hold ids.
+class ItemSummary(ItemBase):
+    id: int
+    is_available: bool
+    owner_id: int
+    image_url: Optional[str] = None
+    created_at: datetime
+    version: int
+    rating_avg: float
+    rating_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SimilarItem(ItemSummary):
+    score: float
+
+
+class BookingSummary(BookingBase):
+    id: int
+    total_price: float
+    status: BookingStatus
+    version: int
+    item_id: int
+    renter_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardResponse(BaseModel):
+    my_items: Optional[List[int]] = None
+    my_bookings: Optional[List[int]] = None
+    listing_bookings: Optional[List[int]] = None
+    items: Dict[int, ItemSummary] = {}
+    bookings: Dict[int, BookingSummary] = {}
+    users: Dict[int, UserResponse] = {}
+    categories: Dict[int, CategoryResponse] = {}
@@ -1,48 +1,118 @@
 # backend/main.py
 
+import time
+
+# Taken as the process start for the startup time measurement
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from typing import Optional
 import os
 
-from routes import authentication, user, item, booking, category
-
-# --- Application Lifespan ---
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    print("Application startup: Initializing...")
-    yield
-    print("Application shutdown: Cleaning up...")
-
-app = FastAPI(lifespan=lifespan)
-
-# --- Static File Serving ---
-os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-# --- CORS Middleware ---
-origins = [
-    "http://localhost",
-    "http://localhost:5173",
-]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# --- Include Routers ---
-# Note: The prefix for each router is set in its own file.
-# The `/api` prefix is added here for all routes.
-app.include_router(authentication.router, prefix="/api")
-app.include_router(user.router, prefix="/api")
-app.include_router(item.router, prefix="/api")
-app.include_router(category.router, prefix="/api")
-app.include_router(booking.router, prefix="/api")
-
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the Rentify API"}
\ No newline at end of file
+from utilities.settings import Settings
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Builds the application. Nothing here opens a database connection or
+    starts a thread, so it is safe to call in a gunicorn master with
+    --preload; engines, the LISTEN connection and the scheduler are created
+    per worker, on first use or in the lifespan hook.
+    """
+    build_started = time.perf_counter()
+    settings = settings or Settings.from_env()
+
+    # Imported here so that .env is loaded before modules read their configuration
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+
+    from databases import database
+    from routes import authentication, user, item, booking, category, me, review, health, events as events_routes
+    from utilities import events, revocation, scheduler, suggest
+    from utilities.compression import CompressionMiddleware
+    from utilities.read_your_writes import ReadYourWritesMiddleware
+    from utilities.admission import AdmissionMiddleware
+
+    database.configure(settings.database_url, settings.database_replica_url)
+
+    # --- Application Lifespan ---
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        print("Application startup: Initializing...")
+        await events.start()
+        # Loaded before serving: a revoked token must never be accepted, so the
+        # worker fails to start if the list cannot be loaded
+        await revocation.start()
+        # Loaded in the background; the worker serves requests meanwhile
+        await suggest.start()
+        if settings.scheduler_enabled:
+            # Only the worker that wins the advisory lock actually runs the jobs
+            await scheduler.start()
+        app.state.startup["ready_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+        print(f"--- STARTUP: app built in {app.state.startup['build_ms']} ms, "
+              f"ready {app.state.startup['ready_ms']} ms after import ---")
+        yield
+        print("Application shutdown: Cleaning up...")
+        await scheduler.stop()
+        await suggest.stop()
+        await revocation.stop()
+        await events.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+
+    # --- Static File Serving ---
+    os.makedirs("uploads", exist_ok=True)
+    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+    # --- Admission Control Middleware ---
+    # Rate limits and concurrency caps per route class (utilities/admission.py).
+    # Added before CORS so that 429/503 responses still carry CORS headers.
+    if settings.admission_enabled:
+        app.add_middleware(AdmissionMiddleware)
+
+    # --- CORS Middleware ---
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # --- Compression Middleware ---
+    # Negotiates brotli/gzip for large textual responses; /uploads is served as-is.
+    app.add_middleware(CompressionMiddleware)
+
+    # --- Read-Your-Writes Middleware ---
+    # Clients that just wrote read from the primary instead of the replica for a few seconds.
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # --- Include Routers ---
+    # Note: The prefix for each router is set in its own file.
+    # The `/api` prefix is added here for all routes.
+    app.include_router(authentication.router, prefix="/api")
+    app.include_router(user.router, prefix="/api")
+    app.include_router(item.router, prefix="/api")
+    app.include_router(category.router, prefix="/api")
+    app.include_router(booking.router, prefix="/api")
+    app.include_router(review.router, prefix="/api")
+    app.include_router(me.router, prefix="/api")
+    app.include_router(events_routes.router, prefix="/api")
+    app.include_router(health.router, prefix="/api")
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to the Rentify API"}
+
+    app.state.startup = {"build_ms": round((time.perf_counter() - build_started) * 1000, 1)}
+    return app
+
+
+def __getattr__(name: str):
+    # `main:app` (uvicorn/gunicorn import strings, older scripts) builds the app on first access
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -21,5 +21,19 @@ def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2Passw
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = security.create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    tokens = security.issue_tokens(db, user)
+    db.commit()
+    return tokens
+
+@router.post("/token/refresh", response_model=schemas.Token)
+def refresh_access_token(request: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchanges a refresh token for a new access token and a new refresh token
+    (the old one stops working), without checking the password again.
+    """
+    return security.rotate_refresh_token(db, request.refresh_token)
+
+@router.post("/logout")
+def logout(db: Session = Depends(get_db), token: str = Depends(security.oauth2_scheme)):
+    """Revokes the current session: its refresh token and every access token issued in it."""
+    return security.logout(db, token)
@@ -1,10 +1,12 @@
 # backend/routes/booking.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
+from datetime import date
 
-from utilities import crud, security
+from utilities import crud, security, export, fieldsets, idempotency, analytics
+from utilities.fieldsets import FieldSet
 from databases import database, models, schemas
 
 router = APIRouter(
@@ -16,23 +18,57 @@ def create_booking_route(
     item_id: int,
     booking: schemas.BookingCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user)
+    current_user: models.User = Depends(security.get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
 ):
-    return crud.create_booking(db=db, item_id=item_id, renter_id=current_user.id, booking=booking)
+    return idempotency.run_idempotent(
+        db=db,
+        idempotency_key=idempotency_key,
+        user_id=current_user.id,
+        endpoint=f"POST /items/{item_id}/bookings",
+        request_fingerprint=idempotency.fingerprint(item_id, booking.model_dump()),
+        status_code=status.HTTP_201_CREATED,
+        response_model=schemas.BookingResponse,
+        operation=lambda: crud.create_booking(db=db, item_id=item_id, renter_id=current_user.id, booking=booking),
+    )
 
 @router.get("/my-bookings", response_model=List[schemas.BookingResponse])
 def get_my_bookings_route(
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user)
+    current_user: models.User = Depends(security.get_current_active_user),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.booking_fields),
 ):
-    return crud.get_my_bookings(db, user_id=current_user.id)
+    return fieldsets.render(fieldset, crud.get_my_bookings(db, user_id=current_user.id, fieldset=fieldset))
 
 @router.get("/my-listings/bookings", response_model=List[schemas.BookingResponse])
 def get_my_listing_bookings_route(
     db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.booking_fields),
+):
+    return fieldsets.render(fieldset, crud.get_my_listing_bookings(db, owner_id=current_user.id, fieldset=fieldset))
+
+@router.get("/my-listings/stats", response_model=schemas.OwnerStatsResponse)
+def get_my_listing_stats_route(
+    start: Optional[date] = None,  # Defaults to 30 days before `end`
+    end: Optional[date] = None,  # Defaults to today
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user),
+):
+    """Booking counts, occupancy and earnings per listing, read from the daily rollup."""
+    return analytics.get_owner_stats(db, owner_id=current_user.id, start=start, end=end)
+
+@router.get("/my-listings/bookings/export")
+def export_my_listing_bookings_route(
+    format: Literal["ndjson", "csv"] = "ndjson",
     current_user: models.User = Depends(security.get_current_active_user)
 ):
-    return crud.get_my_listing_bookings(db, owner_id=current_user.id)
+    """
+    Streams every booking on the current user's items as NDJSON or CSV with constant memory use.
+    """
+    return export.streaming_export(
+        crud.listing_bookings_export_query(owner_id=current_user.id), format, "listing-bookings"
+    )
 
 @router.put("/bookings/{booking_id}", response_model=schemas.BookingResponse)
 def update_booking_status_route(
@@ -47,5 +83,6 @@ def update_booking_status_route(
         db=db,
         booking_id=booking_id,
         new_status=status_update.status.value, # Use .value to get the string "confirmed"
-        current_user_id=current_user.id
+        current_user_id=current_user.id,
+        expected_version=status_update.version,
     )
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from utilities import crud
-from databases.database import get_db
+from databases.database import get_db, get_read_db
 from databases import schemas
 
 router = APIRouter(
@@ -18,5 +18,5 @@ def create_category_route(category: schemas.CategoryCreate, db: Session = Depend
     return crud.create_category(db=db, category=category)
 
 @router.get("/", response_model=List[schemas.CategoryResponse])
-def read_categories_route(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_categories_route(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return crud.get_categories(db, skip=skip, limit=limit)
\ No newline at end of file
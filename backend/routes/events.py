@@ -0,0 +1,51 @@
+# backend/routes/events.py
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from utilities import events, security
+from databases import database, models
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+@router.get("/bookings")
+async def booking_events_route(
+    request: Request,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user_from_query),
+):
+    """
+    Server-Sent Events stream of booking changes for the current user, both as
+    renter and as item owner. Replaces polling /my-bookings and
+    /my-listings/bookings. Browsers can pass the token as ?access_token=.
+    """
+    # Release the pooled connection used for authentication; the stream may stay open for hours
+    db.close()
+    user_id = current_user.id
+    queue = events.booking_events.subscribe(user_id)
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event_data = await asyncio.wait_for(queue.get(), timeout=events.HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event_data['type']}\ndata: {json.dumps(event_data)}\n\n"
+        finally:
+            events.booking_events.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
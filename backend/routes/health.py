@@ -0,0 +1,39 @@
+# backend/routes/health.py
+
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from databases import database
+from utilities.admission import admission
+from utilities.scheduler import scheduler
+
+router = APIRouter(
+    tags=["Health"]
+)
+
+@router.get("/health")
+def health_route(request: Request, db: Session = Depends(database.get_db)):
+    """
+    Liveness plus this worker's startup timings, admission counters
+    (admitted, rate limited and shed requests per route class) and
+    scheduler job timings.
+    Exempt from admission control.
+    """
+    try:
+        db.execute(text("SELECT 1"))
+        database_status = "ok"
+    except Exception:
+        database_status = "unavailable"
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if database_status == "ok" else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ok" if database_status == "ok" else "degraded",
+            "database": database_status,
+            "startup": getattr(request.app.state, "startup", {}),
+            "admission": admission.stats(),
+            "scheduler": scheduler.stats,
+        },
+    )
@@ -1,12 +1,13 @@
 # backend/routes/item.py
 
-from fastapi import APIRouter, Depends, status, Form, UploadFile, File
+from fastapi import APIRouter, Depends, status, Form, UploadFile, File, Header, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 import json
 
-from utilities import crud, security
+from utilities import crud, security, item_import, fieldsets, idempotency, catalog, pricing, similarity, suggest
+from utilities.fieldsets import FieldSet
 from databases import database, models, schemas
 
 router = APIRouter(
@@ -26,33 +27,141 @@ def create_item_route(
     city: Optional[str] = Form(None),
     state: Optional[str] = Form(None),
     zip_code: Optional[str] = Form(None),
+    latitude: Optional[float] = Form(None, ge=-90, le=90),
+    longitude: Optional[float] = Form(None, ge=-180, le=180),
     available_from: Optional[date] = Form(None),
     available_to: Optional[date] = Form(None),
     availability_rule: str = Form('all_days'),
     disabled_dates: str = Form("[]"), # Receive as JSON string of dates
-    image: Optional[UploadFile] = File(None)
+    weekend_price_per_day: Optional[float] = Form(None, ge=0),
+    weekly_discount_pct: float = Form(0, ge=0, le=100),
+    monthly_discount_pct: float = Form(0, ge=0, le=100),
+    min_rental_days: int = Form(1, ge=1),
+    image: Optional[UploadFile] = File(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
 ):
     item_data = {
         "name": name, "description": description, "price_per_day": price_per_day,
         "category_id": category_id, "address": address, "city": city,
         "state": state, "zip_code": zip_code,
+        "latitude": latitude, "longitude": longitude,
         "available_from": available_from, "available_to": available_to,
         "availability_rule": availability_rule,
         "disabled_dates": json.loads(disabled_dates), # Parse the JSON string into a list
+        "weekend_price_per_day": weekend_price_per_day,
+        "weekly_discount_pct": weekly_discount_pct,
+        "monthly_discount_pct": monthly_discount_pct,
+        "min_rental_days": min_rental_days,
     }
-    return crud.create_item(db=db, owner_id=current_user.id, item_data=item_data, image=image)
+    return idempotency.run_idempotent(
+        db=db,
+        idempotency_key=idempotency_key,
+        user_id=current_user.id,
+        endpoint="POST /items/",
+        request_fingerprint=idempotency.fingerprint(
+            item_data, image.filename if image else None, idempotency.file_fingerprint(image)
+        ),
+        status_code=status.HTTP_201_CREATED,
+        response_model=schemas.ItemResponse,
+        operation=lambda: crud.create_item(db=db, owner_id=current_user.id, item_data=item_data, image=image),
+    )
+
+@router.post("/bulk", response_model=schemas.ItemBulkImportResponse)
+def bulk_import_items_route(
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user),
+    file: UploadFile = File(...),  # CSV or NDJSON, one item per row/line
+    images: Optional[UploadFile] = File(None),  # Optional zip of images referenced by the `image` column
+    atomic: bool = Form(False),  # If true, nothing is created when any row is invalid
+):
+    """
+    Creates many items in one request and one transaction.
+    Invalid rows are reported by row number instead of failing the upload.
+    """
+    rows, errors = item_import.parse_item_rows(file)
+    item_ids, errors = crud.bulk_create_items(
+        db=db, owner_id=current_user.id, rows=rows, errors=errors, images=images, atomic=atomic
+    )
+    return {"created": len(item_ids), "item_ids": item_ids, "errors": errors}
+
+@router.post("/quote", response_model=schemas.QuoteResponse)
+def quote_items_route(request: schemas.QuoteRequest, db: Session = Depends(database.get_read_db)):
+    """
+    Prices up to 500 (item, start, end) lines in one call, e.g. every result
+    of a search page for the selected dates. Lines that cannot be booked as
+    requested carry an `error` instead of failing the whole request.
+    """
+    return {"quotes": pricing.get_quotes(db, request.lines)}
 
 @router.get("/", response_model=List[schemas.ItemResponse])
-def read_items_route(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    return crud.get_items(db, skip=skip, limit=limit)
+def read_items_route(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[str] = Query(None, description="Comma-separated item ids to fetch in one call, e.g. `3,17,42`"),
+    db: Session = Depends(database.get_read_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.item_fields),
+    filters: catalog.ItemFilters = Depends(catalog.item_filters),
+):
+    """
+    Lists the catalog. With `ids`, returns exactly those items instead (in
+    the requested order, unknown ids omitted) with one query, so clients do
+    not need a `GET /items/{id}` per item; filters and paging then do not apply.
+    """
+    if ids is not None:
+        return fieldsets.render(fieldset, crud.get_items_by_ids(db, crud.parse_item_ids(ids), fieldset=fieldset))
+    return fieldsets.render(fieldset, crud.get_items(db, skip=skip, limit=limit, fieldset=fieldset, filters=filters))
+
+@router.get("/facets", response_model=schemas.ItemFacetsResponse)
+def read_item_facets_route(
+    db: Session = Depends(database.get_read_db),
+    filters: catalog.ItemFilters = Depends(catalog.item_filters),
+):
+    """Counts per category, city and price bucket for the same filters as `GET /items/`."""
+    return catalog.get_facets(db, filters)
 
 @router.get("/search", response_model=List[schemas.ItemResponse])
-def search_items_route(q: str = "", db: Session = Depends(database.get_db)):
-    return crud.search_items(db=db, q=q)
+def search_items_route(
+    q: str = "",
+    db: Session = Depends(database.get_read_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.item_fields),
+):
+    return fieldsets.render(fieldset, crud.search_items(db=db, q=q, fieldset=fieldset))
+
+@router.get("/suggest", response_model=List[schemas.Suggestion])
+def suggest_items_route(
+    prefix: str = Query(..., max_length=100),
+    limit: int = Query(8, ge=1, le=suggest.SUGGEST_MAX_LIMIT),
+):
+    """
+    Typeahead: item names, categories and cities starting with (a word
+    starting with) `prefix`, most popular first. Served from memory, no
+    database access; empty for a moment after a worker starts.
+    """
+    return suggest.index.suggest(prefix, limit)
 
 @router.get("/{item_id}", response_model=schemas.ItemResponse)
-def read_item_route(item_id: int, db: Session = Depends(database.get_db)):
-    return crud.get_item(db, item_id=item_id)
+def read_item_route(
+    item_id: int,
+    db: Session = Depends(database.get_read_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.item_fields),
+):
+    return fieldsets.render(fieldset, crud.get_item(db, item_id=item_id, fieldset=fieldset))
+
+@router.get("/{item_id}/similar", response_model=List[schemas.SimilarItem])
+def read_similar_items_route(
+    item_id: int,
+    limit: int = Query(6, ge=1, le=similarity.SIMILAR_ITEMS_K),
+    db: Session = Depends(database.get_read_db),
+):
+    """
+    Available items most similar to this one (same category, similar name and
+    description), best first, from the precomputed neighbor list. New or
+    edited items show up after the next scheduler refresh.
+    """
+    return [
+        {**schemas.ItemSummary.model_validate(item).model_dump(), "score": round(score, 4)}
+        for item, score in similarity.get_similar_items(db, item_id, limit)
+    ]
 
 @router.put("/{item_id}", response_model=schemas.ItemResponse)
 def update_item_route(
@@ -67,12 +176,19 @@ def update_item_route(
     city: Optional[str] = Form(None),
     state: Optional[str] = Form(None),
     zip_code: Optional[str] = Form(None),
+    latitude: Optional[float] = Form(None, ge=-90, le=90),
+    longitude: Optional[float] = Form(None, ge=-180, le=180),
     is_available: Optional[bool] = Form(None),
     available_from: Optional[date] = Form(None),
     available_to: Optional[date] = Form(None),
     availability_rule: Optional[str] = Form(None),
     disabled_dates: Optional[str] = Form(None), # Receive as JSON string
-    image: Optional[UploadFile] = File(None)
+    weekend_price_per_day: Optional[float] = Form(None, ge=0),
+    weekly_discount_pct: Optional[float] = Form(None, ge=0, le=100),
+    monthly_discount_pct: Optional[float] = Form(None, ge=0, le=100),
+    min_rental_days: Optional[int] = Form(None, ge=1),
+    image: Optional[UploadFile] = File(None),
+    version: Optional[int] = Form(None), # Version the client last read; 409 if it changed since
 ):
     update_data = {
         "name": name,
@@ -83,10 +199,16 @@ def update_item_route(
         "city": city,
         "state": state,
         "zip_code": zip_code,
+        "latitude": latitude,
+        "longitude": longitude,
         "is_available": is_available,
         "available_from": available_from,
         "available_to": available_to,
         "availability_rule": availability_rule,
+        "weekend_price_per_day": weekend_price_per_day,
+        "weekly_discount_pct": weekly_discount_pct,
+        "monthly_discount_pct": monthly_discount_pct,
+        "min_rental_days": min_rental_days,
     }
     
     # Parse disabled_dates if it's provided as a string
@@ -101,7 +223,8 @@ def update_item_route(
         item_id=item_id,
         current_user_id=current_user.id,
         update_data=update_data_filtered,
-        image=image
+        image=image,
+        expected_version=version,
     )
 
 @router.delete("/{item_id}", status_code=200)
@@ -113,10 +236,14 @@ def delete_item_route(
     return crud.delete_item(db, item_id, current_user)
 
 @router.get("/{item_id}/bookings", response_model=List[schemas.BookingResponse])
-def get_item_bookings_route(item_id: int, db: Session = Depends(database.get_db)):
+def get_item_bookings_route(
+    item_id: int,
+    db: Session = Depends(database.get_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.booking_fields),
+):
     """
     Get a list of confirmed bookings for a specific item.
     This is useful for disabling dates on the booking calendar.
     """
-    return crud.get_item_bookings(db=db, item_id=item_id)
+    return fieldsets.render(fieldset, crud.get_item_bookings(db=db, item_id=item_id, fieldset=fieldset))
 
@@ -0,0 +1,49 @@
+# backend/routes/me.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from utilities import crud, security
+from databases import database, models, schemas
+
+router = APIRouter(
+    prefix="/me",
+    tags=["Me"]
+)
+
+@router.get("/dashboard", response_model=schemas.DashboardResponse)
+def get_dashboard_route(
+    sections: str = ",".join(crud.DASHBOARD_SECTIONS),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user)
+):
+    """
+    Everything the profile page needs in one request: the user's items, their
+    rentals and the booking requests on their listings. Pass a comma-separated
+    `sections` list to load only part of it.
+    """
+    requested = [section.strip() for section in sections.split(",") if section.strip()]
+    unknown = set(requested) - set(crud.DASHBOARD_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown dashboard sections: {', '.join(sorted(unknown))}",
+        )
+    return crud.get_dashboard(db, user=current_user, sections=requested)
+
+
+@router.get("/preferences", response_model=schemas.NotificationPreferences)
+def get_preferences_route(current_user: models.User = Depends(security.get_current_active_user)):
+    return current_user
+
+@router.put("/preferences", response_model=schemas.NotificationPreferences)
+def update_preferences_route(
+    preferences: schemas.NotificationPreferences,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user)
+):
+    """
+    How booking emails are delivered: `immediate` (one per event) or
+    collected into an `hourly` or `daily` digest.
+    """
+    return crud.update_notification_preferences(db, user=current_user, preferences=preferences)
@@ -0,0 +1,38 @@
+# backend/routes/review.py
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from utilities import crud, security
+from databases import database, models, schemas
+
+router = APIRouter(
+    tags=["Reviews"]
+)
+
+@router.post("/items/{item_id}/reviews", response_model=schemas.ReviewResponse, status_code=status.HTTP_201_CREATED)
+def create_review_route(
+    item_id: int,
+    review: schemas.ReviewCreate,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user),
+):
+    return crud.create_review(db=db, item_id=item_id, user_id=current_user.id, review=review)
+
+@router.get("/items/{item_id}/reviews", response_model=schemas.ReviewPage)
+def read_item_reviews_route(
+    item_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    db: Session = Depends(database.get_read_db),
+):
+    return crud.get_item_reviews(db, item_id=item_id, limit=limit, cursor=cursor)
+
+@router.delete("/reviews/{review_id}")
+def delete_review_route(
+    review_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(security.get_current_active_user),
+):
+    return crud.delete_review(db, review_id=review_id, current_user_id=current_user.id)
@@ -1,10 +1,11 @@
 # backend/routes/user.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
-from utilities import crud, security
+from utilities import crud, security, export, fieldsets
+from utilities.fieldsets import FieldSet
 from databases import database, models, schemas
 
 router = APIRouter(
@@ -17,13 +18,38 @@ def create_user_route(user: schemas.UserCreate, db: Session = Depends(database.g
     return crud.create_user(db=db, user=user)
 
 @router.get("/me", response_model=schemas.UserResponse)
-def read_users_me(current_user: models.User = Depends(security.get_current_active_user)):
-    return current_user
+def read_users_me(
+    current_user: models.User = Depends(security.get_current_active_user),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.user_fields),
+):
+    return fieldsets.render(fieldset, current_user)
 
 @router.get("/", response_model=List[schemas.UserResponse])
-def read_users_route(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    return crud.get_users(db, skip=skip, limit=limit)
+def read_users_route(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(database.get_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.user_fields),
+):
+    return fieldsets.render(fieldset, crud.get_users(db, skip=skip, limit=limit, fieldset=fieldset))
 
 @router.get("/{user_id}/items", response_model=List[schemas.ItemResponse])
-def get_user_items_route(user_id: int, db: Session = Depends(database.get_db)):
-    return crud.get_user_items(db, user_id=user_id)
\ No newline at end of file
+def get_user_items_route(
+    user_id: int,
+    db: Session = Depends(database.get_read_db),
+    fieldset: Optional[FieldSet] = Depends(fieldsets.item_fields),
+):
+    return fieldsets.render(fieldset, crud.get_user_items(db, user_id=user_id, fieldset=fieldset))
+
+@router.get("/{user_id}/items/export")
+def export_user_items_route(
+    user_id: int,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: models.User = Depends(security.get_current_active_user),
+):
+    """
+    Streams all of the current user's items as NDJSON or CSV with constant memory use.
+    """
+    if current_user.id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only export your own items")
+    return export.streaming_export(crud.user_items_export_query(user_id), format, f"user-{user_id}-items")
@@ -0,0 +1,125 @@
+# backend/scripts/benchmark_queries.py
+"""
+Measures the per-call cost of the hot CRUD lookups.
+
+Each lookup runs once through the legacy `db.query(...)` form (rebuilt and
+re-processed on every call) and once through the current function in
+utilities/crud.py (statements built once at import). Both read the same rows
+from the same database, so the difference is the Python overhead per call.
+
+Usage (from the backend directory, against a seeded database):
+
+    python scripts/benchmark_queries.py --iterations 5000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Appended rather than inserted so that the stdlib `logging` module keeps
+# precedence over the (empty) backend/logging package.
+sys.path.append(os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, or_, select  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from databases import database, models  # noqa: E402
+from utilities import crud  # noqa: E402
+
+
+# --- The per-call implementations, for comparison ---
+def legacy_get_item(db, item_id):
+    return (
+        db.query(models.Item)
+        .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+        .filter(models.Item.id == item_id)
+        .first()
+    )
+
+
+def legacy_get_items(db, skip, limit):
+    return (
+        db.query(models.Item)
+        .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+        .order_by(models.Item.created_at.desc(), models.Item.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def legacy_get_user_by_identifier(db, identifier):
+    identifier = identifier.lower()
+    if "@" not in identifier:
+        return db.query(models.User).filter(func.lower(models.User.username) == identifier).first()
+    return db.query(models.User).filter(
+        or_(func.lower(models.User.username) == identifier, func.lower(models.User.email) == identifier)
+    ).first()
+
+
+def legacy_get_item_bookings(db, item_id):
+    return (
+        db.query(models.Booking)
+        .filter(models.Booking.item_id == item_id)
+        .filter(models.Booking.status == 'confirmed')
+        .all()
+    )
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    """Median microseconds per call over a few rounds (after one warm-up round)."""
+    rounds = []
+    for round_number in range(6):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        if round_number:
+            rounds.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot CRUD lookups.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "postgresql://rentify_user:your_secure_password@db/rentify_db"))
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per round (5 measured rounds).")
+    args = parser.parse_args()
+
+    database.configure(args.database_url)
+    db = database.SessionLocal()
+    try:
+        item_id = db.scalar(select(func.min(models.Item.id)))
+        user = db.scalars(select(models.User).order_by(models.User.id).limit(1)).first()
+        if item_id is None or user is None:
+            sys.exit("The database has no items or users; run scripts/seed_data.py first.")
+        booked_item_id = db.scalar(
+            select(models.Booking.item_id).where(models.Booking.status == models.BookingStatus.confirmed).limit(1)
+        ) or item_id
+
+        cases = [
+            ("get_item", lambda: legacy_get_item(db, item_id), lambda: crud.get_item(db, item_id)),
+            ("get_items (20)", lambda: legacy_get_items(db, 0, 20), lambda: crud.get_items(db, 0, 20)),
+            ("get_user_by_identifier (username)",
+             lambda: legacy_get_user_by_identifier(db, user.username),
+             lambda: crud.get_user_by_identifier(db, user.username)),
+            ("get_user_by_identifier (email)",
+             lambda: legacy_get_user_by_identifier(db, user.email),
+             lambda: crud.get_user_by_identifier(db, user.email)),
+            ("get_item_bookings",
+             lambda: legacy_get_item_bookings(db, booked_item_id),
+             lambda: crud.get_item_bookings(db, booked_item_id)),
+        ]
+
+        print(f"{'query':<36} {'before (us)':>12} {'after (us)':>12} {'saved':>8}")
+        for name, before, after in cases:
+            before_us = _time_per_call(before, args.iterations)
+            after_us = _time_per_call(after, args.iterations)
+            saved = (before_us - after_us) / before_us * 100
+            print(f"{name:<36} {before_us:>12.1f} {after_us:>12.1f} {saved:>7.0f}%")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
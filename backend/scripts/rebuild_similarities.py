@@ -0,0 +1,43 @@
+# backend/scripts/rebuild_similarities.py
+"""
+Recomputes every item vector and "similar items" list from scratch.
+
+The scheduler keeps the lists up to date incrementally; run this after bulk
+loads (e.g. scripts/seed_data.py), after changing SIMILARITY_DIMENSIONS, or
+nightly to correct lists that drifted through edits.
+
+Usage (from the backend directory):
+
+    python scripts/rebuild_similarities.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Appended rather than inserted so that the stdlib `logging` module keeps
+# precedence over the (empty) backend/logging package.
+sys.path.append(os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from utilities import similarity  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the similar items lists.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "postgresql://rentify_user:your_secure_password@db/rentify_db"))
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="Items vectorized and scored per step.")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = create_engine(args.database_url)
+    with engine.begin() as connection:
+        count = similarity.rebuild_all(connection, batch_size=args.batch_size)
+    print(f"Rebuilt similar items for {count} items in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+# backend/scripts/seed_data.py
+"""
+Generates synthetic users, items, bookings and reviews and bulk loads them.
+
+Rows are streamed in chunks and loaded with COPY on PostgreSQL and with
+executemany on every other database (e.g. SQLite), bypassing the ORM and the
+single-row CRUD helpers. Every generated user gets the same precomputed bcrypt
+hash, so no hashing happens at load time.
+
+Usage (from the backend directory):
+
+    python scripts/seed_data.py --users 100000 --items 300000 --bookings 1000000
+
+All generated accounts log in with the password "password".
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+# Appended rather than inserted so that the stdlib `logging` module keeps
+# precedence over the (empty) backend/logging package.
+sys.path.append(os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, func, select, text  # noqa: E402
+
+from databases import models  # noqa: E402
+from utilities import analytics, crud, partitions  # noqa: E402
+
+# bcrypt hash of "password"; computing one hash per user would take hours.
+PRECOMPUTED_PASSWORD_HASH = "$2b$12$6HuE.eNWTDqaVfdCstVtPOIUOOcmnyzPxNdJj85RrxOPKSQv89Jty"
+
+CATEGORIES = [
+    # (name, description, typical price per day, relative popularity)
+    ("Tools", "Power tools and hand tools", 15.0, 30),
+    ("Electronics", "Cameras, drones, consoles and audio gear", 35.0, 25),
+    ("Outdoor", "Camping, hiking and climbing equipment", 20.0, 15),
+    ("Vehicles", "Bikes, scooters and trailers", 45.0, 8),
+    ("Party", "Tents, speakers, lighting and decorations", 30.0, 10),
+    ("Sports", "Kayaks, skis, golf clubs and more", 25.0, 12),
+    ("Home", "Cleaning machines, ladders and furniture", 12.0, 18),
+    ("Music", "Instruments and studio equipment", 28.0, 7),
+]
+
+CITIES = [
+    # (city, state, latitude, longitude of the city centre)
+    ("New York", "NY", 40.71, -74.01), ("Los Angeles", "CA", 34.05, -118.24),
+    ("Chicago", "IL", 41.88, -87.63), ("Houston", "TX", 29.76, -95.37),
+    ("Phoenix", "AZ", 33.45, -112.07), ("Philadelphia", "PA", 39.95, -75.17),
+    ("San Antonio", "TX", 29.42, -98.49), ("San Diego", "CA", 32.72, -117.16),
+    ("Dallas", "TX", 32.78, -96.80), ("Austin", "TX", 30.27, -97.74),
+    ("Seattle", "WA", 47.61, -122.33), ("Denver", "CO", 39.74, -104.99),
+    ("Boston", "MA", 42.36, -71.06), ("Portland", "OR", 45.52, -122.68),
+    ("Atlanta", "GA", 33.75, -84.39), ("Miami", "FL", 25.76, -80.19),
+    ("Minneapolis", "MN", 44.98, -93.27), ("Nashville", "TN", 36.16, -86.78),
+    ("Columbus", "OH", 39.96, -83.00), ("Raleigh", "NC", 35.78, -78.64),
+]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie",
+               "Avery", "Quinn", "Charlie", "Drew", "Robin", "Skyler", "Reese", "Parker"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Brown", "Davis", "Miller", "Wilson",
+              "Moore", "Clark", "Lewis", "Walker", "Hall", "Young", "King", "Wright"]
+ADJECTIVES = ["Compact", "Heavy-duty", "Professional", "Lightweight", "Portable",
+              "Deluxe", "Classic", "Cordless", "Premium", "Vintage", "Family-size"]
+NOUNS = {
+    "Tools": ["Drill", "Circular Saw", "Pressure Washer", "Tile Cutter", "Sander"],
+    "Electronics": ["DSLR Camera", "Drone", "Projector", "Game Console", "PA System"],
+    "Outdoor": ["Tent", "Camping Stove", "Backpack", "Climbing Rope", "Hammock"],
+    "Vehicles": ["Mountain Bike", "E-Scooter", "Utility Trailer", "Cargo Bike", "Tandem Bike"],
+    "Party": ["Party Tent", "Speaker Set", "Fog Machine", "Folding Tables", "String Lights"],
+    "Sports": ["Kayak", "Ski Set", "Golf Clubs", "Paddle Board", "Tennis Racket"],
+    "Home": ["Carpet Cleaner", "Ladder", "Steam Mop", "Dehumidifier", "Sewing Machine"],
+    "Music": ["Electric Guitar", "Keyboard", "Drum Kit", "Microphone", "Amplifier"],
+}
+STREETS = ["Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Pine St", "Elm St", "Lake Rd", "Hill Ct"]
+REVIEW_COMMENTS = [
+    "Worked perfectly, would rent again.",
+    "Great condition and easy pickup.",
+    "Owner was very responsive.",
+    "Did the job, a bit worn.",
+    "Not as described.",
+    None,
+]
+
+USER_COLUMNS = ["id", "username", "email", "hashed_password", "full_name", "is_active", "created_at"]
+ITEM_COLUMNS = [
+    "id", "name", "description", "price_per_day", "is_available", "image_url",
+    "address", "city", "state", "zip_code", "available_from", "available_to",
+    "availability_rule", "disabled_dates", "owner_id", "category_id", "created_at",
+    "latitude", "longitude",
+]
+BOOKING_COLUMNS = ["id", "start_date", "end_date", "total_price", "status", "item_id", "renter_id"]
+REVIEW_COLUMNS = ["id", "rating", "comment", "created_at", "item_id", "user_id"]
+
+
+def _zipf_cum_weights(n: int, s: float):
+    """Cumulative weights for a Zipf-like popularity distribution over n ranks."""
+    total = 0.0
+    cum = []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** s
+        cum.append(total)
+    return cum
+
+
+# ===================================================================
+# GENERATORS
+# ===================================================================
+
+def generate_users(rng: random.Random, first_id: int, count: int, now: datetime):
+    for user_id in range(first_id, first_id + count):
+        yield (
+            user_id,
+            f"user{user_id}",
+            f"user{user_id}@example.com",
+            PRECOMPUTED_PASSWORD_HASH,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.random() > 0.02,
+            now - timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600)),
+        )
+
+
+def generate_items(rng, first_id, count, user_ids, categories, now, owners, prices):
+    """
+    Yields item rows. Owners follow a Zipf distribution so a small number of
+    "rental shops" own most of the catalog. The owner and price of every item
+    are recorded in `owners`/`prices` for the booking generator.
+    """
+    owner_cum = _zipf_cum_weights(len(user_ids), 1.1)
+    category_cum = []
+    total = 0
+    for _, _, _, popularity in categories:
+        total += popularity
+        category_cum.append(total)
+    city_cum = _zipf_cum_weights(len(CITIES), 0.8)
+    today = now.date()
+
+    for item_id in range(first_id, first_id + count):
+        owner_id = rng.choices(user_ids, cum_weights=owner_cum)[0]
+        category_id, category_name, base_price, _ = rng.choices(categories, cum_weights=category_cum)[0]
+        city, state, city_lat, city_lng = rng.choices(CITIES, cum_weights=city_cum)[0]
+        price = round(base_price * rng.lognormvariate(0, 0.5), 2)
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS[category_name])}"
+
+        available_from = available_to = None
+        if rng.random() < 0.3:
+            available_from = today + timedelta(days=rng.randrange(-60, 30))
+            available_to = available_from + timedelta(days=rng.randrange(30, 365))
+
+        disabled_dates = []
+        if rng.random() < 0.2:
+            disabled_dates = sorted({
+                (today + timedelta(days=rng.randrange(90))).isoformat()
+                for _ in range(rng.randint(1, 5))
+            })
+
+        owners.append(owner_id)
+        prices.append(price)
+        yield (
+            item_id,
+            name,
+            f"{name} available for rent in {city}. Well maintained and ready to go.",
+            price,
+            rng.random() > 0.05,
+            None,
+            f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            city,
+            state,
+            f"{rng.randint(10000, 99999)}",
+            available_from,
+            available_to,
+            rng.choices(["all_days", "weekdays_only", "weekends_only"], weights=[80, 12, 8])[0],
+            disabled_dates,
+            owner_id,
+            category_id,
+            now - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+            # Scattered roughly 10 km around the city centre
+            round(city_lat + rng.gauss(0, 0.05), 5),
+            round(city_lng + rng.gauss(0, 0.05), 5),
+        )
+
+
+def booking_window(now: datetime):
+    """Bookings start between 18 months ago and 3 months from now."""
+    return now - timedelta(days=540), now + timedelta(days=90)
+
+
+def generate_bookings(rng, first_id, count, first_item_id, owners, prices, user_ids, now, completed):
+    """
+    Yields booking rows. Item demand is Zipf distributed, rental lengths are
+    mostly short with a long tail, and the status depends on whether the
+    rental period lies in the past or the future. Completed bookings are
+    recorded in `completed` as (item_id, renter_id, end_date) for reviews.
+    """
+    item_cum = _zipf_cum_weights(len(owners), 0.9)
+    item_offsets = range(len(owners))
+    window_start, window_end = booking_window(now)
+    window_seconds = int((window_end - window_start).total_seconds())
+
+    for booking_id in range(first_id, first_id + count):
+        offset = rng.choices(item_offsets, cum_weights=item_cum)[0]
+        renter_id = rng.choice(user_ids)
+        if renter_id == owners[offset]:
+            # User ids are contiguous, so the next id (wrapping around) is a different user.
+            renter_id = user_ids[(renter_id - user_ids[0] + 1) % len(user_ids)]
+
+        start = (window_start + timedelta(seconds=rng.randrange(window_seconds))).replace(minute=0, second=0, microsecond=0)
+        days = min(1 + int(rng.expovariate(1 / 3)), 30)
+        end = start + timedelta(days=days)
+
+        if end < now:
+            status = rng.choices(["completed", "cancelled", "confirmed"], weights=[75, 20, 5])[0]
+        else:
+            status = rng.choices(["pending", "confirmed", "cancelled"], weights=[40, 50, 10])[0]
+
+        item_id = first_item_id + offset
+        if status == "completed":
+            completed.append((item_id, renter_id, end))
+        yield (booking_id, start, end, prices[offset] * days, status, item_id, renter_id)
+
+
+def generate_reviews(rng, first_id, completed, ratio):
+    review_id = first_id
+    reviewed = set()
+    for item_id, renter_id, end in completed:
+        # A renter reviews an item at most once, however often they rented it
+        if (item_id, renter_id) in reviewed or rng.random() >= ratio:
+            continue
+        reviewed.add((item_id, renter_id))
+        yield (
+            review_id,
+            rng.choices([1, 2, 3, 4, 5], weights=[3, 5, 12, 35, 45])[0],
+            rng.choice(REVIEW_COMMENTS),
+            end + timedelta(hours=rng.randrange(1, 24 * 14)),
+            item_id,
+            renter_id,
+        )
+        review_id += 1
+
+
+# ===================================================================
+# LOADERS
+# ===================================================================
+
+def _copy_value(value):
+    """Formats a Python value for COPY ... (FORMAT csv); empty fields are NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        return json.dumps(value)
+    return value
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_rows(connection, table, columns, rows, chunk_size):
+    """Loads an iterable of row tuples into `table`; returns the row count."""
+    loaded = 0
+    if connection.dialect.name == "postgresql":
+        cursor = connection.connection.driver_connection.cursor()
+        copy_sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        for chunk in _chunks(rows, chunk_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in chunk:
+                writer.writerow([_copy_value(value) for value in row])
+            if hasattr(cursor, "copy_expert"):
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+            else:
+                # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+            loaded += len(chunk)
+        cursor.close()
+    else:
+        insert = table.insert()
+        for chunk in _chunks(rows, chunk_size):
+            connection.execute(insert, [dict(zip(columns, row)) for row in chunk])
+            loaded += len(chunk)
+    return loaded
+
+
+def _next_id(connection, table):
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _reset_sequences(connection, tables):
+    if connection.dialect.name != "postgresql":
+        return
+    for table in tables:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+        ))
+
+
+def _ensure_categories(connection):
+    """Creates any missing seed categories and returns (id, name, base_price, popularity) tuples."""
+    table = models.Category.__table__
+    existing = dict(connection.execute(select(table.c.name, table.c.id)).all())
+    missing = [{"name": name, "description": description}
+               for name, description, _, _ in CATEGORIES if name not in existing]
+    if missing:
+        connection.execute(table.insert(), missing)
+        existing = dict(connection.execute(select(table.c.name, table.c.id)).all())
+    return [(existing[name], name, price, popularity) for name, _, price, popularity in CATEGORIES]
+
+
+def seed(database_url: str, users: int, items: int, bookings: int, review_ratio: float,
+         chunk_size: int, random_seed: int):
+    rng = random.Random(random_seed)
+    engine = create_engine(database_url)
+    now = datetime.now().replace(microsecond=0)
+    users_table = models.User.__table__
+    items_table = models.Item.__table__
+    bookings_table = models.Booking.__table__
+    reviews_table = models.Review.__table__
+
+    with engine.begin() as connection:
+        categories = _ensure_categories(connection)
+
+        started = time.perf_counter()
+        first_user_id = _next_id(connection, users_table)
+        count = load_rows(connection, users_table, USER_COLUMNS,
+                          generate_users(rng, first_user_id, users, now), chunk_size)
+        print(f"Loaded {count} users in {time.perf_counter() - started:.1f}s")
+        user_ids = list(range(first_user_id, first_user_id + users))
+
+        started = time.perf_counter()
+        first_item_id = _next_id(connection, items_table)
+        owners, prices = array("q"), array("d")
+        count = load_rows(connection, items_table, ITEM_COLUMNS,
+                          generate_items(rng, first_item_id, items, user_ids, categories, now, owners, prices),
+                          chunk_size)
+        print(f"Loaded {count} items in {time.perf_counter() - started:.1f}s")
+
+        # Past months get their own partitions too; rows COPYed into DEFAULT would
+        # keep those months from ever being partitioned (utilities/partitions.py)
+        window_start, window_end = booking_window(now)
+        partitions.ensure_partitions(connection, "bookings", window_start.date(), window_end.date())
+
+        started = time.perf_counter()
+        completed = []
+        count = load_rows(connection, bookings_table, BOOKING_COLUMNS,
+                          generate_bookings(rng, _next_id(connection, bookings_table), bookings,
+                                            first_item_id, owners, prices, user_ids, now, completed),
+                          chunk_size)
+        print(f"Loaded {count} bookings in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        count = load_rows(connection, reviews_table, REVIEW_COLUMNS,
+                          generate_reviews(rng, _next_id(connection, reviews_table), completed, review_ratio),
+                          chunk_size)
+        print(f"Loaded {count} reviews in {time.perf_counter() - started:.1f}s")
+
+        # COPY bypasses the API, so recompute the denormalized rating aggregates
+        started = time.perf_counter()
+        crud.refresh_rating_aggregates(connection)
+        print(f"Refreshed rating aggregates in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        analytics.rebuild_item_daily_stats(connection)
+        print(f"Rebuilt item daily stats in {time.perf_counter() - started:.1f}s")
+
+        _reset_sequences(connection, [users_table, items_table, bookings_table, reviews_table])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and bulk load synthetic Rentify data.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "postgresql://rentify_user:your_secure_password@db/rentify_db"))
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=30_000)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--review-ratio", type=float, default=0.4,
+                        help="Fraction of completed bookings that receive a review.")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data sets.")
+    args = parser.parse_args()
+
+    if args.users < 2 or args.items < 1:
+        parser.error("--users must be at least 2 and --items at least 1")
+
+    started = time.perf_counter()
+    seed(args.database_url, args.users, args.items, args.bookings, args.review_ratio,
+         args.chunk_size, args.seed)
+    print(f"Seeding finished in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# backend/utilities/admission.py
+"""
+Admission control: per-client rate limits and per-route-class concurrency caps.
+
+Every request is assigned a route class. Each (client, class) pair has a
+token bucket; an empty bucket is answered with 429 and a Retry-After header
+before any work is done. Each class also has a concurrency cap per worker:
+when it is full a request may wait briefly in a short queue, otherwise it is
+shed immediately with 503 + Retry-After, so expensive or abusive traffic
+cannot take the workers away from normal browsing.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# --- Configuration ---
+# Use the first X-Forwarded-For address as the client (only behind a trusted proxy)
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() in ("1", "true", "yes")
+# How long a request may wait for a concurrency slot before it is shed
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 0.5))
+# Idle buckets are forgotten once there are more than this many
+MAX_TRACKED_CLIENTS = int(os.getenv("MAX_TRACKED_CLIENTS", 50000))
+
+
+class RouteClass:
+    def __init__(self, name: str, rate: float, burst: int, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.rate = rate  # tokens per second and client
+        self.burst = burst  # bucket size
+        self.max_concurrency = max_concurrency  # per worker; 0 = unlimited
+        self.max_queue = max_queue
+
+
+def _route_class(name: str, rate: float, burst: int, max_concurrency: int, max_queue: int) -> RouteClass:
+    prefix = f"ADMISSION_{name.upper()}_"
+    return RouteClass(
+        name,
+        rate=float(os.getenv(prefix + "RATE", rate)),
+        burst=int(os.getenv(prefix + "BURST", burst)),
+        max_concurrency=int(os.getenv(prefix + "CONCURRENCY", max_concurrency)),
+        max_queue=int(os.getenv(prefix + "QUEUE", max_queue)),
+    )
+
+
+ROUTE_CLASSES = {
+    # bcrypt on every attempt: a handful per minute is plenty for real users
+    "auth": _route_class("auth", rate=0.2, burst=5, max_concurrency=4, max_queue=4),
+    # Unindexed search, facets, exports and imports
+    "expensive": _route_class("expensive", rate=1, burst=10, max_concurrency=8, max_queue=8),
+    "default": _route_class("default", rate=20, burst=60, max_concurrency=64, max_queue=64),
+    # Long-lived event streams: rate limited on connect, never counted as in flight
+    "stream": _route_class("stream", rate=0.5, burst=5, max_concurrency=0, max_queue=0),
+}
+
+# (method or None for any, path prefix or exact path, class); first match wins
+ROUTE_RULES = [
+    ("POST", "/api/login", "auth"),
+    ("POST", "/api/users/", "auth"),
+    ("GET", "/api/events/", "stream"),
+    (None, "/api/items/search", "expensive"),
+    (None, "/api/items/facets", "expensive"),
+    (None, "/api/items/bulk", "expensive"),
+    ("GET", "/api/users/*/items/export", "expensive"),
+    ("GET", "/api/my-listings/bookings/export", "expensive"),
+]
+
+EXEMPT_PATHS = ("/api/health",)
+
+
+def classify(method: str, path: str) -> RouteClass:
+    for rule_method, pattern, name in ROUTE_RULES:
+        if rule_method is not None and rule_method != method:
+            continue
+        if "*" in pattern:
+            head, tail = pattern.split("*", 1)
+            if path.startswith(head) and path.endswith(tail):
+                return ROUTE_CLASSES[name]
+        elif path.startswith(pattern):
+            return ROUTE_CLASSES[name]
+    return ROUTE_CLASSES["default"]
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: int, now: float):
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, route_class: RouteClass, now: float) -> float:
+        """Takes one token; returns 0 on success or the seconds until one is available."""
+        self.tokens = min(route_class.burst, self.tokens + (now - self.updated) * route_class.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / route_class.rate
+
+
+class ConcurrencyLimiter:
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+        self.in_flight = 0
+        self.waiting = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    async def acquire(self) -> bool:
+        limit = self.route_class.max_concurrency
+        if limit <= 0:
+            return True
+        if self.in_flight < limit:
+            self.in_flight += 1
+            return True
+        if self.waiting >= self.route_class.max_queue:
+            return False
+
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        self.waiting += 1
+        try:
+            async with self._condition:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.in_flight < limit),
+                    timeout=ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                )
+                self.in_flight += 1
+                return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    async def release(self):
+        if self.route_class.max_concurrency <= 0:
+            return
+        self.in_flight -= 1
+        if self._condition is not None and self.waiting:
+            async with self._condition:
+                self._condition.notify()
+
+
+class AdmissionController:
+    def __init__(self, route_classes: Dict[str, RouteClass] = ROUTE_CLASSES):
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.limiters = {name: ConcurrencyLimiter(rc) for name, rc in route_classes.items()}
+        self.counters: Dict[str, Dict[str, int]] = {
+            name: {"admitted": 0, "rate_limited": 0, "shed": 0} for name in route_classes
+        }
+
+    def check_rate(self, client: str, route_class: RouteClass) -> float:
+        now = time.monotonic()
+        key = (client, route_class.name)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= MAX_TRACKED_CLIENTS:
+                self._forget_idle(now)
+            bucket = self.buckets[key] = TokenBucket(route_class.burst, now)
+        return bucket.take(route_class, now)
+
+    def _forget_idle(self, now: float):
+        # A bucket that would have refilled completely carries no state
+        for key, bucket in list(self.buckets.items()):
+            route_class = ROUTE_CLASSES[key[1]]
+            if bucket.tokens + (now - bucket.updated) * route_class.rate >= route_class.burst:
+                del self.buckets[key]
+
+    def stats(self) -> dict:
+        return {
+            name: {**counts, "in_flight": self.limiters[name].in_flight, "waiting": self.limiters[name].waiting}
+            for name, counts in self.counters.items()
+        }
+
+
+admission = AdmissionController()
+
+
+def _client_id(scope: Scope) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        counters = self.controller.counters[route_class.name]
+
+        retry_after = self.controller.check_rate(_client_id(scope), route_class)
+        if retry_after:
+            counters["rate_limited"] += 1
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        limiter = self.controller.limiters[route_class.name]
+        if not await limiter.acquire():
+            counters["shed"] += 1
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        counters["admitted"] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await limiter.release()
@@ -0,0 +1,201 @@
+# backend/utilities/analytics.py
+"""
+Owner analytics backed by the item_daily_stats rollup.
+
+Every booking status change is turned into per-(item, day) deltas that are
+upserted in the same transaction as the change itself, so reading an owner's
+stats only sums a handful of rollup rows per item and day, independent of
+how many bookings the items have had.
+"""
+
+import math
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from databases import models
+
+# Statuses whose rental days count as booked (occupancy and earnings)
+OCCUPYING_STATUSES = {models.BookingStatus.confirmed, models.BookingStatus.completed}
+COUNTER_COLUMNS = [
+    "bookings_pending",
+    "bookings_confirmed",
+    "bookings_cancelled",
+    "bookings_completed",
+    "booked_days",
+    "earnings",
+]
+DEFAULT_RANGE_DAYS = 30
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def rental_days(start_date, end_date) -> int:
+    """Billed days of a booking; the same ceiling rule utilities/pricing.py charges for."""
+    return max(math.ceil((end_date - start_date).total_seconds() / 86400), 1)
+
+
+def _status(value) -> models.BookingStatus:
+    return value if isinstance(value, models.BookingStatus) else models.BookingStatus(value)
+
+
+def _add_booking(
+    deltas: Dict[Tuple[int, date, int], Dict[str, float]],
+    booking,
+    owner_id: int,
+    booking_status: models.BookingStatus,
+    sign: int,
+):
+    """Adds (sign=1) or removes (sign=-1) one booking's contribution in `booking_status`."""
+    start = booking.start_date.date()
+    counters = deltas[(booking.item_id, start, owner_id)]
+    counters[f"bookings_{booking_status.value}"] += sign
+
+    if booking_status in OCCUPYING_STATUSES:
+        days = rental_days(booking.start_date, booking.end_date)
+        earnings_per_day = booking.total_price / days
+        for offset in range(days):
+            counters = deltas[(booking.item_id, start + timedelta(days=offset), owner_id)]
+            counters["booked_days"] += sign
+            counters["earnings"] += sign * earnings_per_day
+
+
+def record_status_change(
+    db: Session,
+    changes: Iterable[Tuple[object, int]],
+    old_status: Optional[models.BookingStatus],
+    new_status: models.BookingStatus,
+):
+    """
+    Applies the rollup deltas for bookings that moved from `old_status`
+    (None for new bookings) to `new_status`. `changes` holds
+    (booking, owner_id) pairs; a booking only needs item_id, start_date,
+    end_date and total_price. Runs in the caller's transaction.
+    """
+    new_status = _status(new_status)
+    deltas: Dict[Tuple[int, date, int], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+    for booking, owner_id in changes:
+        if old_status is not None:
+            _add_booking(deltas, booking, owner_id, _status(old_status), -1)
+        _add_booking(deltas, booking, owner_id, new_status, 1)
+    if not deltas:
+        return
+
+    values = [
+        {"item_id": item_id, "day": day, "owner_id": owner_id, **counters}
+        for (item_id, day, owner_id), counters in deltas.items()
+    ]
+    table = models.ItemDailyStats.__table__
+    stmt = _INSERTS[db.get_bind().dialect.name](table).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.item_id, table.c.day],
+        set_={column: table.c[column] + stmt.excluded[column] for column in COUNTER_COLUMNS},
+    )
+    db.execute(stmt)
+
+
+def rebuild_item_daily_stats(connection):
+    """
+    Recomputes the whole rollup from the bookings table. Only needed after
+    bookings were written outside the API (e.g. scripts/seed_data.py).
+    """
+    table = models.ItemDailyStats.__table__
+    connection.execute(table.delete())
+
+    stmt = (
+        select(
+            models.Booking.item_id,
+            models.Booking.start_date,
+            models.Booking.end_date,
+            models.Booking.total_price,
+            models.Booking.status,
+            models.Item.owner_id,
+        )
+        .join(models.Item, models.Item.id == models.Booking.item_id)
+        .order_by(models.Booking.item_id)
+    )
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+    current_item = None
+    for row in connection.execute(stmt.execution_options(yield_per=10000)):
+        # Rows come grouped by item, so each item's rows can be flushed as soon as it is done
+        if row.item_id != current_item and deltas:
+            _insert_rows(connection, table, deltas)
+            deltas.clear()
+        current_item = row.item_id
+        _add_booking(deltas, row, row.owner_id, _status(row.status), 1)
+    if deltas:
+        _insert_rows(connection, table, deltas)
+
+
+def _insert_rows(connection, table, deltas):
+    connection.execute(
+        table.insert(),
+        [
+            {"item_id": item_id, "day": day, "owner_id": owner_id, **counters}
+            for (item_id, day, owner_id), counters in deltas.items()
+        ],
+    )
+
+
+# ===================================================================
+# OWNER STATS
+# ===================================================================
+
+def get_owner_stats(db: Session, owner_id: int, start: Optional[date], end: Optional[date]):
+    """
+    Per-item and total booking counts, booked days, occupancy rate and
+    earnings of an owner's items between `start` and `end` (inclusive).
+    Defaults to the last DEFAULT_RANGE_DAYS days.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must not be before start")
+    range_days = (end - start).days + 1
+
+    stats = models.ItemDailyStats
+    sums = [func.coalesce(func.sum(getattr(stats, column)), 0).label(column) for column in COUNTER_COLUMNS]
+    rows = db.execute(
+        select(models.Item.id, models.Item.name, *sums)
+        .outerjoin(stats, and_(stats.item_id == models.Item.id, stats.day.between(start, end)))
+        .where(models.Item.owner_id == owner_id)
+        .group_by(models.Item.id, models.Item.name)
+        .order_by(models.Item.id)
+    ).all()
+
+    items = []
+    totals = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for row in rows:
+        counters = {column: row._mapping[column] for column in COUNTER_COLUMNS}
+        items.append(_stats_entry(counters, range_days, item_id=row.id, name=row.name))
+        for column in COUNTER_COLUMNS:
+            totals[column] += counters[column]
+
+    return {
+        "start": start,
+        "end": end,
+        "days": range_days,
+        "totals": _stats_entry(totals, range_days * max(len(rows), 1)),
+        "items": items,
+    }
+
+
+def _stats_entry(counters: dict, available_days: int, **extra) -> dict:
+    return {
+        **extra,
+        "bookings": {
+            "pending": counters["bookings_pending"],
+            "confirmed": counters["bookings_confirmed"],
+            "cancelled": counters["bookings_cancelled"],
+            "completed": counters["bookings_completed"],
+        },
+        "booked_days": counters["booked_days"],
+        # Overlapping bookings can book a day twice; occupancy never exceeds 100%
+        "occupancy_rate": round(min(counters["booked_days"] / available_days, 1.0), 4),
+        "earnings": round(counters["earnings"], 2),
+    }
@@ -0,0 +1,234 @@
+# backend/utilities/catalog.py
+"""
+Filtering, sorting and facet counts for the item catalog.
+
+Filters are turned into SQL conditions once and shared by the item listing
+and the facet query. Facets follow the usual convention that a facet ignores
+its own filter: with `category_id=3` selected, the category facet still
+counts every category so the client can switch, while the city and price
+facets only count items in category 3.
+"""
+
+import math
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Literal, Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import String, case, cast, exists, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from databases import models
+
+# Upper bounds of the price-per-day facet buckets; the last bucket is open-ended
+PRICE_BUCKET_EDGES = [float(edge) for edge in os.getenv("PRICE_BUCKET_EDGES", "10,25,50,100,250").split(",")]
+
+SortOption = Literal["newest", "price_asc", "price_desc", "rating", "distance"]
+
+KM_PER_DEGREE = 111.32
+
+
+class ItemFilters:
+    def __init__(
+        self,
+        category_id: Optional[List[int]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        city: Optional[str] = None,
+        available_start: Optional[date] = None,
+        available_end: Optional[date] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius_km: Optional[float] = None,
+        sort: str = "newest",
+    ):
+        self.category_id = category_id or []
+        self.min_price = min_price
+        self.max_price = max_price
+        self.city = city
+        self.available_start = available_start
+        self.available_end = available_end
+        self.lat = lat
+        self.lng = lng
+        self.radius_km = radius_km
+        self.sort = sort
+
+    def conditions(self, exclude: Optional[str] = None) -> list:
+        """SQL conditions for every filter except the facet named in `exclude`."""
+        conditions = []
+        if self.category_id and exclude != "category":
+            conditions.append(models.Item.category_id.in_(self.category_id))
+        if exclude != "price":
+            if self.min_price is not None:
+                conditions.append(models.Item.price_per_day >= self.min_price)
+            if self.max_price is not None:
+                conditions.append(models.Item.price_per_day <= self.max_price)
+        if self.city and exclude != "city":
+            conditions.append(func.lower(models.Item.city) == self.city.lower())
+        if self.available_start or self.available_end:
+            conditions.extend(self._availability_conditions())
+        if self.radius_km is not None:
+            conditions.extend(self._radius_conditions())
+        return conditions
+
+    def _availability_conditions(self) -> list:
+        """
+        Items that are listed and not booked (confirmed) at any point in the
+        requested range. Weekday rules and individually disabled dates are
+        checked when booking, not here.
+        """
+        start = self.available_start or self.available_end
+        end = self.available_end or self.available_start
+        range_start = datetime.combine(start, time.min)
+        range_end = datetime.combine(end + timedelta(days=1), time.min)
+        return [
+            models.Item.is_available.is_(True),
+            or_(models.Item.available_from.is_(None), models.Item.available_from <= start),
+            or_(models.Item.available_to.is_(None), models.Item.available_to >= end),
+            ~exists().where(
+                models.Booking.item_id == models.Item.id,
+                models.Booking.status == models.BookingStatus.confirmed,
+                models.Booking.start_date < range_end,
+                models.Booking.end_date > range_start,
+            ),
+        ]
+
+    def _radius_conditions(self) -> list:
+        # Bounding box first (served by the latitude/longitude index), then the exact distance
+        lat_delta = self.radius_km / KM_PER_DEGREE
+        lng_delta = self.radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(self.lat)), 0.01))
+        return [
+            models.Item.latitude.between(self.lat - lat_delta, self.lat + lat_delta),
+            models.Item.longitude.between(self.lng - lng_delta, self.lng + lng_delta),
+            self.distance_squared() <= (self.radius_km / KM_PER_DEGREE) ** 2,
+        ]
+
+    def distance_squared(self):
+        """
+        Squared equirectangular distance in degrees of latitude. Accurate
+        enough to rank items within a city or region, and needs no
+        trigonometric SQL functions (SQLite has none by default).
+        """
+        lng_scale = math.cos(math.radians(self.lat))
+        dlat = models.Item.latitude - self.lat
+        dlng = (models.Item.longitude - self.lng) * lng_scale
+        return dlat * dlat + dlng * dlng
+
+    def order_by(self) -> list:
+        if self.sort == "price_asc":
+            return [models.Item.price_per_day.asc(), models.Item.id.asc()]
+        if self.sort == "price_desc":
+            return [models.Item.price_per_day.desc(), models.Item.id.desc()]
+        if self.sort == "rating":
+            return [models.Item.rating_avg.desc(), models.Item.rating_count.desc(), models.Item.id.desc()]
+        if self.sort == "distance":
+            # Items without coordinates go last
+            return [models.Item.latitude.is_(None), self.distance_squared(), models.Item.id.asc()]
+        return [models.Item.created_at.desc(), models.Item.id.desc()]
+
+
+def item_filters(
+    category_id: Optional[List[int]] = Query(None, description="Repeat to select several categories"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    city: Optional[str] = Query(None),
+    available_start: Optional[date] = Query(None, description="Only items free from this date..."),
+    available_end: Optional[date] = Query(None, description="...up to and including this date"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    sort: SortOption = Query("newest"),
+) -> ItemFilters:
+    if (sort == "distance" or radius_km is not None) and (lat is None or lng is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat and lng are required to sort or filter by distance",
+        )
+    if available_start and available_end and available_end < available_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="available_end must not be before available_start",
+        )
+    return ItemFilters(
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        city=city,
+        available_start=available_start,
+        available_end=available_end,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        sort=sort,
+    )
+
+
+# ===================================================================
+# FACETS
+# ===================================================================
+
+def _price_bucket_labels() -> List[str]:
+    labels = []
+    lower = 0.0
+    for edge in PRICE_BUCKET_EDGES:
+        labels.append(f"{lower:g}-{edge:g}")
+        lower = edge
+    labels.append(f"{lower:g}+")
+    return labels
+
+
+def _price_bucket():
+    labels = _price_bucket_labels()
+    whens = [(models.Item.price_per_day < edge, labels[i]) for i, edge in enumerate(PRICE_BUCKET_EDGES)]
+    return case(*whens, else_=labels[-1])
+
+
+def get_facets(db: Session, filters: ItemFilters) -> Dict[str, list]:
+    """
+    Counts per category, city and price bucket for the filtered catalog,
+    computed in one UNION ALL of three grouped selects (one round trip).
+    """
+    category = (
+        select(
+            literal("category").label("facet"),
+            cast(models.Item.category_id, String).label("value"),
+            models.Category.name.label("label"),
+            func.count().label("count"),
+        )
+        .join(models.Category, models.Category.id == models.Item.category_id)
+        .where(*filters.conditions(exclude="category"))
+        .group_by(models.Item.category_id, models.Category.name)
+    )
+    # Grouped like the (case-insensitive) city filter matches
+    city_key = func.lower(models.Item.city)
+    city = (
+        select(
+            literal("city").label("facet"),
+            city_key.label("value"),
+            func.min(models.Item.city).label("label"),
+            func.count().label("count"),
+        )
+        .where(models.Item.city.is_not(None), *filters.conditions(exclude="city"))
+        .group_by(city_key)
+    )
+    bucket = _price_bucket()
+    price = (
+        select(
+            literal("price").label("facet"),
+            bucket.label("value"),
+            bucket.label("label"),
+            func.count().label("count"),
+        )
+        .where(*filters.conditions(exclude="price"))
+        .group_by(bucket)
+    )
+
+    facets = {"category": [], "city": [], "price": []}
+    for row in db.execute(union_all(category, city, price)):
+        facets[row.facet].append({"value": row.value, "label": row.label, "count": row.count})
+
+    facets["category"].sort(key=lambda f: -f["count"])
+    facets["city"].sort(key=lambda f: -f["count"])
+    order = {label: i for i, label in enumerate(_price_bucket_labels())}
+    facets["price"].sort(key=lambda f: order[f["value"]])
+    return facets
@@ -1,85 +1,189 @@
 # backend/utilities/crud.py
 
+import base64
 import os
 import shutil
 import traceback
-from sqlalchemy.orm import Session, joinedload, contains_eager
-from sqlalchemy import or_
+import uuid
+import zipfile
+from sqlalchemy.orm import Session, joinedload, contains_eager, aliased
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, func, insert, select, update, exists, case, tuple_, bindparam
 from fastapi import HTTPException, UploadFile, status
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 from databases import models, schemas
 from utilities.security import verify_item_ownership
-from utilities import passwords, email_sender
+from utilities import passwords, email_sender, events, analytics, pricing, similarity, suggest, notifications
+from utilities.fieldsets import FieldSet
+from utilities.catalog import ItemFilters
 
 # --- Helper for saving images ---
+# Uploaded item images live in their own subdirectory of uploads/, so that
+# the orphan cleanup (utilities/scheduler.py) only ever touches files the app wrote.
+ITEM_IMAGE_DIRECTORY = os.path.join("uploads", "items")
+ITEM_IMAGE_URL_PREFIX = "/uploads/items/"
+
+def save_image_file(filename: str, fileobj) -> str:
+    # Sanitize filename to prevent directory traversal attacks
+    filename = os.path.basename(filename)
+    os.makedirs(ITEM_IMAGE_DIRECTORY, exist_ok=True)
+    file_path = os.path.join(ITEM_IMAGE_DIRECTORY, filename)
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(fileobj, buffer)
+    return f"{ITEM_IMAGE_URL_PREFIX}{filename}"
+
 def save_upload_file(upload_file: UploadFile) -> Optional[str]:
     if upload_file:
-        # Sanitize filename to prevent directory traversal attacks
-        filename = os.path.basename(upload_file.filename)
-        file_path = os.path.join("uploads", filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-        return f"/uploads/{filename}"
+        return save_image_file(upload_file.filename, upload_file.file)
     return None
 
+# ===================================================================
+# PREBUILT STATEMENTS
+# ===================================================================
+# The hottest lookups are built once, with bound parameters, instead of on
+# every call: constructing an ORM statement (and computing its cache key)
+# costs more Python time than the indexed query itself takes to run.
+# scripts/benchmark_queries.py compares them with the per-call versions.
+
+_USER_BY_USERNAME = select(models.User).where(func.lower(models.User.username) == bindparam("username")).limit(1)
+_USER_BY_EMAIL = select(models.User).where(func.lower(models.User.email) == bindparam("email")).limit(1)
+_USER_BY_IDENTIFIER = select(models.User).where(
+    or_(func.lower(models.User.username) == bindparam("identifier"), func.lower(models.User.email) == bindparam("identifier"))
+).limit(1)
+
+_ITEM_BY_ID = (
+    select(models.Item)
+    .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+    .where(models.Item.id == bindparam("item_id"))
+)
+
+# Unfiltered item listings, one per sort order (distance needs coordinates)
+_ITEM_LISTINGS = {
+    sort: select(models.Item)
+    .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+    .order_by(*ItemFilters(sort=sort).order_by())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+    for sort in ("newest", "price_asc", "price_desc", "rating")
+}
+
+_CONFIRMED_ITEM_BOOKINGS = select(models.Booking).where(
+    models.Booking.item_id == bindparam("item_id"), models.Booking.status == models.BookingStatus.confirmed
+)
+
 # ===================================================================
 # USER
 # ===================================================================
 
+# Usernames and emails are case-insensitive; every lookup compares lower()
+# so it is served by the uq_users_*_lower expression indexes.
+
 def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+    return db.scalars(_USER_BY_EMAIL, {"email": email.lower()}).first()
 
 def get_user_by_username(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+    return db.scalars(_USER_BY_USERNAME, {"username": username.lower()}).first()
 
 def get_user_by_identifier(db: Session, identifier: str):
     """
     Fetches a user by either their username or their email address.
+    Only an identifier containing "@" can be an email, so plain usernames
+    are a single index lookup; otherwise both indexes are probed (BitmapOr).
     """
-    return db.query(models.User).filter(
-        or_(models.User.username == identifier, models.User.email == identifier)
-    ).first()
+    identifier = identifier.lower()
+    if "@" not in identifier:
+        return db.scalars(_USER_BY_USERNAME, {"username": identifier}).first()
+    return db.scalars(_USER_BY_IDENTIFIER, {"identifier": identifier}).first()
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None):
+    query = db.query(models.User)
+    if fieldset:
+        query = query.options(*fieldset.load_options())
+    return query.offset(skip).limit(limit).all()
+
+def update_notification_preferences(db: Session, user: models.User, preferences: schemas.NotificationPreferences):
+    """
+    Switching to immediate emails leaves already queued notifications to
+    the next digest run, which then sends them right away.
+    """
+    user.notification_frequency = preferences.notification_frequency
+    db.commit()
+    return user
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def _violated_constraint(error: IntegrityError) -> str:
+    """Name of the violated constraint/index (PostgreSQL), or the driver message (SQLite)."""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) or str(error.orig)
 
 def create_user(db: Session, user: schemas.UserCreate):
-    if get_user_by_email(db, email=user.email):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    if get_user_by_username(db, username=user.username):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
-    
+    """
+    Inserts the user in a single INSERT ... RETURNING; the unique indexes
+    decide about duplicates, so there is no check-then-insert race.
+    """
     hashed_password = passwords.get_password_hash(user.password)
-    db_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password,
-        full_name=user.full_name,
-        is_active=True
+    stmt = (
+        insert(models.User)
+        .values(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password,
+            full_name=user.full_name,
+            is_active=True,
+        )
+        .returning(models.User)
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        db_user = db.scalars(stmt).one()
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if "uq_users_email_lower" in _violated_constraint(e):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+        if "uq_users_username_lower" in _violated_constraint(e):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
+        raise
     return db_user
 
-def get_user_items(db: Session, user_id: int):
-    user = (
-        db.query(models.User)
-        .options(
-            joinedload(models.User.items)
-            .joinedload(models.Item.category)
-        )
-        .options(
-            joinedload(models.User.items)
-            .joinedload(models.Item.owner)
+def get_user_items(db: Session, user_id: int, fieldset: Optional[FieldSet] = None):
+    """
+    Fetches a user's items; the owner is only looked up separately when the
+    user has no items, to tell "no items" apart from "no such user".
+    """
+    options = fieldset.load_options() if fieldset else [joinedload(models.Item.category), joinedload(models.Item.owner)]
+    items = db.query(models.Item).options(*options).filter(models.Item.owner_id == user_id).all()
+    if not items and db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return items
+
+def user_items_export_query(user_id: int):
+    """
+    Flat column projection of a user's items for streaming exports.
+    Only plain columns are selected so rows never become ORM objects.
+    """
+    return (
+        select(
+            models.Item.id,
+            models.Item.name,
+            models.Item.description,
+            models.Item.price_per_day,
+            models.Item.is_available,
+            models.Category.name.label("category"),
+            models.Item.address,
+            models.Item.city,
+            models.Item.state,
+            models.Item.zip_code,
+            models.Item.available_from,
+            models.Item.available_to,
+            models.Item.availability_rule,
+            models.Item.image_url,
+            models.Item.created_at,
         )
-        .filter(models.User.id == user_id)
-        .first()
+        .outerjoin(models.Item.category)
+        .filter(models.Item.owner_id == user_id)
+        .order_by(models.Item.id)
     )
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user.items
 
 # ===================================================================
 # CATEGORY
@@ -112,62 +216,246 @@ def create_item(db: Session, owner_id: int, item_data: Dict[str, Any], image: Op
         image_url=image_url
     )
     db.add(db_item)
+    db.flush()
+    if db_item.is_available:
+        suggest.publish_changes(db, upserts=[
+            suggest.item_entry(db_item.id, db_item.name, db_item.city, category.name, 0)
+        ])
     db.commit()
     db.refresh(db_item)
     return db_item
 
-def get_items(db: Session, skip: int = 0, limit: int = 100):
+def bulk_create_items(
+    db: Session,
+    owner_id: int,
+    rows: List[Tuple[int, schemas.ItemImportRow]],
+    errors: List[schemas.ItemImportError],
+    images: Optional[UploadFile] = None,
+    atomic: bool = False,
+):
     """
-    Fetches all items, eagerly loading owner and category data.
+    Creates many items for one owner in a single transaction.
+    Categories are resolved with one query, images are taken from an optional
+    zip archive, and all valid rows are written with one multi-row INSERT.
+    Rows that fail are reported in `errors`; with `atomic`, any error aborts
+    the whole import.
     """
-    return (
-        db.query(models.Item)
-        .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+    errors = list(errors)
+
+    # Resolve every referenced category (by id or case-insensitive name) at once
+    category_ids = {row.category_id for _, row in rows if row.category_id is not None}
+    category_names = {row.category.lower() for _, row in rows if row.category_id is None}
+    categories = db.query(models.Category.id, models.Category.name).filter(
+        or_(models.Category.id.in_(category_ids), func.lower(models.Category.name).in_(category_names))
+    ).all()
+    known_ids = {c.id for c in categories}
+    ids_by_name = {c.name.lower(): c.id for c in categories}
+
+    archive = None
+    archive_members = {}
+    if images:
+        try:
+            archive = zipfile.ZipFile(images.file)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Images must be uploaded as a zip archive")
+        archive_members = {os.path.basename(info.filename): info for info in archive.infolist() if not info.is_dir()}
+
+    values = []
+    # Archive member name -> unique file name under uploads/items, so an import
+    # never overwrites (or, on failure, deletes) another item's image
+    stored_names = {}
+    for row_number, row in rows:
+        row_errors = []
+        category_id = row.category_id if row.category_id is not None else ids_by_name.get(row.category.lower())
+        if category_id not in known_ids:
+            row_errors.append("category: Category not found")
+        image_name = os.path.basename(row.image) if row.image else None
+        if image_name and image_name not in archive_members:
+            row_errors.append(f"image: '{row.image}' not found in images archive")
+        if row_errors:
+            errors.append(schemas.ItemImportError(row=row_number, errors=row_errors))
+            continue
+
+        image_url = None
+        if image_name:
+            stored_name = stored_names.setdefault(image_name, f"{uuid.uuid4().hex}_{image_name}")
+            image_url = f"{ITEM_IMAGE_URL_PREFIX}{stored_name}"
+
+        item_data = row.model_dump(exclude={"category", "image", "disabled_dates"})
+        item_data.update(
+            category_id=category_id,
+            owner_id=owner_id,
+            availability_rule=row.availability_rule or "all_days",
+            disabled_dates=[d.isoformat() for d in row.disabled_dates or []],
+            image_url=image_url,
+        )
+        values.append(item_data)
+
+    errors.sort(key=lambda e: e.row)
+    if not values or (atomic and errors):
+        return [], errors
+
+    # Write each referenced image once; remove them again if the insert fails
+    written = []
+    try:
+        for image_name, stored_name in stored_names.items():
+            with archive.open(archive_members[image_name]) as source:
+                save_image_file(stored_name, source)
+            written.append(os.path.join(ITEM_IMAGE_DIRECTORY, stored_name))
+
+        item_ids = db.scalars(
+            insert(models.Item).returning(models.Item.id, sort_by_parameter_order=True),
+            values,
+        ).all()
+        category_names = {c.id: c.name for c in categories}
+        suggest.publish_changes(db, upserts=[
+            suggest.item_entry(item_id, v["name"], v["city"], category_names[v["category_id"]], 0)
+            for item_id, v in zip(item_ids, values)
+            if v["is_available"]
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return item_ids, errors
+
+def _item_options(fieldset: Optional[FieldSet]):
+    if fieldset:
+        return fieldset.load_options()
+    return [joinedload(models.Item.owner), joinedload(models.Item.category)]
+
+def get_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    fieldset: Optional[FieldSet] = None,
+    filters: Optional[ItemFilters] = None,
+):
+    """
+    Fetches items matching the catalog filters in the requested order,
+    eagerly loading owner and category data (or only what the requested
+    fieldset needs).
+    """
+    filters = filters or ItemFilters()
+    conditions = filters.conditions()
+    if fieldset is None and not conditions and filters.sort in _ITEM_LISTINGS:
+        # The unfiltered listing (home page)
+        return db.scalars(_ITEM_LISTINGS[filters.sort], {"skip": skip, "limit": limit}).all()
+    stmt = (
+        select(models.Item)
+        .options(*_item_options(fieldset))
+        .where(*conditions)
+        .order_by(*filters.order_by())
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    return db.scalars(stmt).all()
 
-def search_items(db: Session, q: str):
+def search_items(db: Session, q: str, fieldset: Optional[FieldSet] = None):
     """
     Searches for items, eagerly loading owner and category data.
     """
     return (
         db.query(models.Item)
-        .options(joinedload(models.Item.owner), joinedload(models.Item.category))
+        .options(*_item_options(fieldset))
         .filter(or_(models.Item.name.ilike(f"%{q}%"), models.Item.description.ilike(f"%{q}%")))
         .all()
     )
 
-def get_item(db: Session, item_id: int):
+# --- Configuration ---
+# Most ids accepted by `GET /items/?ids=...`
+MAX_BATCH_IDS = int(os.getenv("MAX_BATCH_IDS", 100))
+
+def parse_item_ids(ids: str) -> List[int]:
+    """Parses a comma-separated id list (duplicates dropped, order kept)."""
+    try:
+        parsed = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        )
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids can be requested at once",
+        )
+    return parsed
+
+def get_items_by_ids(db: Session, item_ids: List[int], fieldset: Optional[FieldSet] = None) -> List[models.Item]:
+    """
+    Fetches several items by ID in one `WHERE id IN (...)` query, in the
+    order of `item_ids`; ids that do not exist are left out.
+    """
+    if not item_ids:
+        return []
+    items = db.scalars(
+        select(models.Item).options(*_item_options(fieldset)).where(models.Item.id.in_(item_ids))
+    ).all()
+    found = {item.id: item for item in items}
+    return [found[item_id] for item_id in item_ids if item_id in found]
+
+def get_item(db: Session, item_id: int, fieldset: Optional[FieldSet] = None):
     """
     Fetches a single item by its ID, eagerly loading owner and category data.
     """
-    item = (
-        db.query(models.Item)
-        .options(joinedload(models.Item.owner), joinedload(models.Item.category))
-        .filter(models.Item.id == item_id)
-        .first()
-    )
+    if fieldset:
+        item = db.scalars(
+            select(models.Item).options(*fieldset.load_options()).where(models.Item.id == item_id)
+        ).first()
+    else:
+        item = db.scalars(_ITEM_BY_ID, {"item_id": item_id}).first()
     if item is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
     return item
 
-def update_item(db: Session, item_id: int, current_user_id: int, update_data: Dict[str, Any], image: Optional[UploadFile]):
+def update_item(
+    db: Session,
+    item_id: int,
+    current_user_id: int,
+    update_data: Dict[str, Any],
+    image: Optional[UploadFile],
+    expected_version: Optional[int] = None,
+):
+    """
+    Updates an item owned by the current user. The UPDATE is conditional on
+    the version that was read (and on `expected_version` when the client
+    sends one), so concurrent edits fail with 409 instead of overwriting.
+    """
     db_item = get_item(db, item_id)
     if db_item.owner_id != current_user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this item")
+    if expected_version is not None and db_item.version != expected_version:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Item was modified by another request")
 
     for key, value in update_data.items():
         if value is not None:
             setattr(db_item, key, value)
+    if {"name", "description", "category_id"} & set(update_data):
+        db_item.similarity_stale = True
+    if {"name", "city", "category_id", "is_available"} & set(update_data):
+        if db_item.is_available:
+            category = db.get(models.Category, db_item.category_id)
+            suggest.publish_changes(db, upserts=[suggest.item_entry(
+                db_item.id, db_item.name, db_item.city, category.name if category else None, db_item.rating_count
+            )])
+        else:
+            suggest.publish_changes(db, removed=[db_item.id])
             
     if image:
         db_item.image_url = save_upload_file(image)
 
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Item was modified by another request")
+    # Owner and category were loaded by get_item and survive the commit, so no refresh is needed
     return db_item
 
 def delete_item(db: Session, item_id: int, current_user: models.User):
@@ -178,6 +466,8 @@ def delete_item(db: Session, item_id: int, current_user: models.User):
     if db_item.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this item")
 
+    similarity.forget_item(db, item_id)
+    suggest.publish_changes(db, removed=[item_id])
     db.delete(db_item)
     db.commit()
     return {"detail": "Item deleted successfully"}
@@ -186,39 +476,42 @@ def delete_item(db: Session, item_id: int, current_user: models.User):
 # BOOKING
 # ===================================================================
 
-def get_item_bookings(db: Session, item_id: int):
+def get_item_bookings(db: Session, item_id: int, fieldset: Optional[FieldSet] = None):
     """
     Fetches all confirmed bookings for a specific item.
     This is used to disable dates on the booking calendar.
     """
-    return (
-        db.query(models.Booking)
-        .filter(models.Booking.item_id == item_id)
-        .filter(models.Booking.status == 'confirmed')
-        .all()
-    )
+    if fieldset:
+        return db.scalars(
+            _CONFIRMED_ITEM_BOOKINGS.options(*fieldset.load_options()), {"item_id": item_id}
+        ).all()
+    return db.scalars(_CONFIRMED_ITEM_BOOKINGS, {"item_id": item_id}).all()
 
 def create_booking(db: Session, item_id: int, renter_id: int, booking: schemas.BookingCreate):
     item = get_item(db, item_id)
     if item.owner_id == renter_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot book your own item")
 
-    # Use ceiling of hours / 24 to calculate days, ensuring minimum 1 day rental
-    hours = (booking.end_date - booking.start_date).total_seconds() / 3600
-    days = (hours + 23) // 24 # Ceiling division
-    if days <= 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="End date and time must be after start date and time.")
+    # Same pricing as POST /items/quote, so the stored total matches the quote
+    quote = pricing.quote_booking(item, booking.start_date, booking.end_date)
 
     db_booking = models.Booking(
         **booking.model_dump(),
         renter_id=renter_id,
         item_id=item_id,
-        total_price=item.price_per_day * days,
+        total_price=quote["total_price"],
         status="pending"
     )
     db.add(db_booking)
+    db.flush()
+    analytics.record_status_change(db, [(db_booking, item.owner_id)], None, models.BookingStatus.pending)
+    events.publish_booking_event(db, "booking.created", db_booking, owner_id=item.owner_id)
+    # Owners on a digest get it with their next digest email instead
+    queued = notifications.queue_booking_request(db, db_booking, item, db.get(models.User, renter_id))
     db.commit()
-    
+    if queued:
+        return db_booking
+
     try:
         # Must refresh to load relationships for the email template
         db.refresh(db_booking, ["item", "renter"])
@@ -231,31 +524,40 @@ def create_booking(db: Session, item_id: int, renter_id: int, booking: schemas.B
 
     return db_booking
 
-def get_my_bookings(db: Session, user_id: int):
+def get_my_bookings(db: Session, user_id: int, fieldset: Optional[FieldSet] = None):
     """
     Fetches all bookings made by a specific user, ensuring all related
     item, owner, and category data is pre-loaded for efficient serialization.
     """
+    if fieldset:
+        options = fieldset.load_options()
+    else:
+        options = [
+            joinedload(models.Booking.item).joinedload(models.Item.owner),
+            joinedload(models.Booking.item).joinedload(models.Item.category),
+        ]
     return (
         db.query(models.Booking)
         .filter(models.Booking.renter_id == user_id)
-        .options(
-            joinedload(models.Booking.item)
-            .joinedload(models.Item.owner)
-        )
-        .options(
-            joinedload(models.Booking.item)
-            .joinedload(models.Item.category)
-        )
+        .options(*options)
         .all()
     )
 
 
-def get_my_listing_bookings(db: Session, owner_id: int):
+def get_my_listing_bookings(db: Session, owner_id: int, fieldset: Optional[FieldSet] = None):
     """
     Fetches all booking requests for items owned by a specific user,
     ensuring all related item, renter, and category data is pre-loaded.
     """
+    if fieldset:
+        return (
+            db.query(models.Booking)
+            .join(models.Booking.item)
+            .filter(models.Item.owner_id == owner_id)
+            .options(*fieldset.load_options(contains_eager_for=("item",)))
+            .all()
+        )
+
     # ** THE FIX IS HERE: A more robust query to guarantee all nested data is loaded. **
     return (
         db.query(models.Booking)
@@ -273,29 +575,101 @@ def get_my_listing_bookings(db: Session, owner_id: int):
         .all()
     )
 
-def update_booking_status(db: Session, booking_id: int, new_status: str, current_user_id: int):
-    # Eagerly load all relationships needed for both auth check and emails
+def listing_bookings_export_query(owner_id: int):
+    """
+    Flat column projection of the bookings on a user's items for streaming exports.
+    """
+    return (
+        select(
+            models.Booking.id,
+            models.Booking.item_id,
+            models.Item.name.label("item_name"),
+            models.Booking.renter_id,
+            models.User.username.label("renter_username"),
+            models.Booking.start_date,
+            models.Booking.end_date,
+            models.Booking.total_price,
+            models.Booking.status,
+        )
+        .join(models.Booking.item)
+        .join(models.Booking.renter)
+        .filter(models.Item.owner_id == owner_id)
+        .order_by(models.Booking.id)
+    )
+
+def _booking_update_conflict(db: Session, booking_id: int, new_status: models.BookingStatus, current_user_id: int, expected_version: Optional[int]):
+    """
+    Explains why a conditional booking update matched no row.
+    Only runs on the failure path.
+    """
+    row = (
+        db.query(models.Booking.status, models.Booking.version, models.Item.owner_id)
+        .join(models.Booking.item)
+        .filter(models.Booking.id == booking_id)
+        .first()
+    )
+    if row is None:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    if row.owner_id != current_user_id:
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this booking")
+    if expected_version is not None and row.version != expected_version:
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Booking was modified by another request")
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Cannot change a {row.status.value} booking to {new_status.value}",
+    )
+
+def update_booking_status(db: Session, booking_id: int, new_status: str, current_user_id: int, expected_version: Optional[int] = None):
+    """
+    Moves a booking to `new_status` with a conditional UPDATE that checks
+    ownership, the allowed transition (models.BOOKING_TRANSITIONS) and, if
+    given, the expected version. Racing updates cannot both succeed.
+    """
+    new_status = models.BookingStatus(new_status)
+    allowed_from = [old for old, targets in models.BOOKING_TRANSITIONS.items() if new_status in targets]
+
+    # One UPDATE per possible source status, so the analytics rollup knows
+    # which status the booking left (at most two, and only for cancellations)
+    old_status = None
+    for candidate in allowed_from:
+        stmt = (
+            update(models.Booking)
+            .where(
+                models.Booking.id == booking_id,
+                models.Booking.status == candidate,
+                exists().where(models.Item.id == models.Booking.item_id, models.Item.owner_id == current_user_id),
+            )
+            .values(status=new_status, version=models.Booking.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            stmt = stmt.where(models.Booking.version == expected_version)
+        if db.execute(stmt).rowcount == 1:
+            old_status = candidate
+            break
+
+    if old_status is None:
+        db.rollback()
+        raise _booking_update_conflict(db, booking_id, new_status, current_user_id, expected_version)
+
+    # Load everything the response, the event and the emails need in one query
     db_booking = (
         db.query(models.Booking)
         .options(
-            joinedload(models.Booking.item)
-            .joinedload(models.Item.owner)
+            joinedload(models.Booking.item).joinedload(models.Item.owner),
+            joinedload(models.Booking.item).joinedload(models.Item.category),
+            joinedload(models.Booking.renter),
         )
-        .options(joinedload(models.Booking.renter))
         .filter(models.Booking.id == booking_id)
-        .first()
+        .populate_existing()
+        .one()
     )
-    
-    if not db_booking:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
-    
-    if db_booking.item.owner_id != current_user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this booking")
-    
-    db_booking.status = new_status
+    analytics.record_status_change(db, [(db_booking, db_booking.item.owner_id)], old_status, new_status)
+    events.publish_booking_event(db, "booking.status_changed", db_booking, owner_id=db_booking.item.owner_id)
+    queued = new_status == models.BookingStatus.confirmed and notifications.queue_booking_approved(db, db_booking)
     db.commit()
     
-    if new_status == "confirmed":
+    if new_status == models.BookingStatus.confirmed and not queued:
         try:
             # Eagerly loaded relationships persist after commit
             email_sender.send_booking_approval_email(booking=db_booking)
@@ -306,6 +680,217 @@ def update_booking_status(db: Session, booking_id: int, new_status: str, current
             traceback.print_exc()
             print(f"-------------------------------------------------")
 
-    db.refresh(db_booking)
     return db_booking
 
+# ===================================================================
+# REVIEW
+# ===================================================================
+
+def _rating_change(model, rating: int, added: bool) -> dict:
+    """
+    SET clause that folds one rating into (or out of) a row's running average.
+    All expressions read the old values, so the UPDATE is a single atomic step.
+    """
+    if added:
+        return {
+            "rating_avg": (model.rating_avg * model.rating_count + rating) / (model.rating_count + 1),
+            "rating_count": model.rating_count + 1,
+        }
+    return {
+        "rating_avg": case(
+            (model.rating_count <= 1, 0.0),
+            else_=(model.rating_avg * model.rating_count - rating) / (model.rating_count - 1),
+        ),
+        "rating_count": model.rating_count - 1,
+    }
+
+def _apply_rating(db: Session, item_id: int, owner_id: int, rating: int, added: bool):
+    """Updates the item's and its owner's rating aggregates in the current transaction."""
+    db.execute(
+        update(models.Item)
+        .where(models.Item.id == item_id)
+        .values(**_rating_change(models.Item, rating, added))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(models.User)
+        .where(models.User.id == owner_id)
+        .values(**_rating_change(models.User, rating, added))
+        .execution_options(synchronize_session=False)
+    )
+
+def refresh_rating_aggregates(connection):
+    """
+    Recomputes all rating aggregates from the reviews table. Only needed after
+    loading reviews outside the API (e.g. scripts/seed_data.py).
+    """
+    item_reviews = select().where(models.Review.item_id == models.Item.id)
+    connection.execute(update(models.Item).values(
+        rating_count=item_reviews.add_columns(func.count(models.Review.id)).scalar_subquery(),
+        rating_avg=item_reviews.add_columns(func.coalesce(func.avg(models.Review.rating), 0)).scalar_subquery(),
+    ))
+    owner_reviews = (
+        select()
+        .select_from(models.Review)
+        .join(models.Item, models.Item.id == models.Review.item_id)
+        .where(models.Item.owner_id == models.User.id)
+    )
+    connection.execute(update(models.User).values(
+        rating_count=owner_reviews.add_columns(func.count(models.Review.id)).scalar_subquery(),
+        rating_avg=owner_reviews.add_columns(func.coalesce(func.avg(models.Review.rating), 0)).scalar_subquery(),
+    ))
+
+def create_review(db: Session, item_id: int, user_id: int, review: schemas.ReviewCreate):
+    """
+    Adds a review by a renter with a completed booking of the item and folds
+    the rating into the item's and owner's aggregates.
+    """
+    db_item = db.get(models.Item, item_id)
+    if not db_item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    if db_item.owner_id == user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot review your own item")
+
+    has_completed_booking = db.query(
+        exists().where(
+            models.Booking.item_id == item_id,
+            models.Booking.renter_id == user_id,
+            models.Booking.status == models.BookingStatus.completed,
+        )
+    ).scalar()
+    if not has_completed_booking:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only renters with a completed booking can review this item")
+
+    db_review = models.Review(**review.model_dump(), item_id=item_id, user_id=user_id)
+    db.add(db_review)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="You have already reviewed this item")
+
+    _apply_rating(db, item_id, db_item.owner_id, review.rating, added=True)
+    db.commit()
+    db.refresh(db_review)
+    return db_review
+
+def _encode_review_cursor(review: models.Review) -> str:
+    return base64.urlsafe_b64encode(str(review.id).encode()).decode()
+
+def _decode_review_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def get_item_reviews(db: Session, item_id: int, limit: int = 20, cursor: Optional[str] = None):
+    """
+    Returns one page of an item's reviews, newest first. Paging is keyset
+    based on (created_at, id), which ix_reviews_item_created serves directly.
+    The cursor is the last review's id; its created_at is read in the same
+    query so the comparison always uses the stored value.
+    """
+    query = db.query(models.Review).filter(models.Review.item_id == item_id)
+    if cursor:
+        review_id = _decode_review_cursor(cursor)
+        last = aliased(models.Review)
+        last_created_at = select(last.created_at).where(last.id == review_id).scalar_subquery()
+        query = query.filter(tuple_(models.Review.created_at, models.Review.id) < tuple_(last_created_at, review_id))
+    reviews = (
+        query.order_by(models.Review.created_at.desc(), models.Review.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    if not reviews and not cursor and not db.get(models.Item, item_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    next_cursor = _encode_review_cursor(reviews[limit - 1]) if len(reviews) > limit else None
+    return {"reviews": reviews[:limit], "next_cursor": next_cursor}
+
+def delete_review(db: Session, review_id: int, current_user_id: int):
+    """Deletes the current user's review and removes it from the aggregates."""
+    db_review = (
+        db.query(models.Review)
+        .options(joinedload(models.Review.item))
+        .filter(models.Review.id == review_id)
+        .first()
+    )
+    if not db_review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    if db_review.user_id != current_user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this review")
+
+    _apply_rating(db, db_review.item_id, db_review.item.owner_id, db_review.rating, added=False)
+    db.delete(db_review)
+    db.commit()
+    return {"detail": "Review deleted successfully"}
+
+# ===================================================================
+# DASHBOARD
+# ===================================================================
+
+DASHBOARD_SECTIONS = ("my_items", "my_bookings", "listing_bookings")
+
+def get_dashboard(db: Session, user: models.User, sections: List[str]):
+    """
+    Loads the requested profile dashboard sections in one session and returns
+    them normalized: each section is a list of ids and every item, booking,
+    user and category is loaded by a single IN query and returned once.
+    """
+    items: Dict[int, models.Item] = {}
+    bookings: Dict[int, models.Booking] = {}
+    dashboard: Dict[str, Any] = {}
+
+    if "my_items" in sections:
+        my_items = db.query(models.Item).filter(models.Item.owner_id == user.id).order_by(models.Item.id).all()
+        items.update((item.id, item) for item in my_items)
+        dashboard["my_items"] = [item.id for item in my_items]
+
+    if "my_bookings" in sections:
+        my_bookings = db.query(models.Booking).filter(models.Booking.renter_id == user.id).order_by(models.Booking.id).all()
+        bookings.update((booking.id, booking) for booking in my_bookings)
+        dashboard["my_bookings"] = [booking.id for booking in my_bookings]
+
+    if "listing_bookings" in sections:
+        listing_bookings = (
+            db.query(models.Booking)
+            .join(models.Booking.item)
+            .filter(models.Item.owner_id == user.id)
+            .order_by(models.Booking.id)
+            .all()
+        )
+        bookings.update((booking.id, booking) for booking in listing_bookings)
+        dashboard["listing_bookings"] = [booking.id for booking in listing_bookings]
+
+    # Items referenced by bookings that were not already loaded
+    missing_item_ids = {b.item_id for b in bookings.values()} - items.keys()
+    if missing_item_ids:
+        items.update(
+            (item.id, item)
+            for item in db.query(models.Item).filter(models.Item.id.in_(missing_item_ids))
+        )
+
+    # Owners and renters, skipping the current user who is already loaded
+    users = {user.id: user}
+    user_ids = {i.owner_id for i in items.values()} | {b.renter_id for b in bookings.values()}
+    if user_ids - users.keys():
+        users.update(
+            (u.id, u)
+            for u in db.query(models.User).filter(models.User.id.in_(user_ids - users.keys()))
+        )
+
+    category_ids = {i.category_id for i in items.values()}
+    categories = {}
+    if category_ids:
+        categories = {
+            c.id: c for c in db.query(models.Category).filter(models.Category.id.in_(category_ids))
+        }
+
+    dashboard.update(
+        items=items,
+        bookings=bookings,
+        users=users,
+        categories=categories,
+    )
+    return dashboard
@@ -1,21 +1,28 @@
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
+from typing import List, Tuple
 
 from databases import models
 
-# Load environment variables from .env file
-load_dotenv()
-
 # --- Email Configuration ---
+# The .env file is loaded by Settings.from_env() before this module is imported
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 EMAILS_FROM_EMAIL = os.getenv("EMAILS_FROM_EMAIL")
 
+def _build_message(to: str, subject: str, html_content: str):
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    message = MIMEMultipart("alternative")
+    message["From"] = EMAILS_FROM_EMAIL
+    message["To"] = to
+    message["Subject"] = subject
+    message.attach(MIMEText(html_content, "html"))
+    return message
+
+
 def send_email(to: str, subject: str, html_content: str):
     """
     Connects to the SMTP server and sends an email.
@@ -24,11 +31,10 @@ def send_email(to: str, subject: str, html_content: str):
         print("--- EMAIL SKIPPED: SMTP settings not configured in .env file. ---")
         return
 
-    message = MIMEMultipart("alternative")
-    message["From"] = EMAILS_FROM_EMAIL
-    message["To"] = to
-    message["Subject"] = subject
-    message.attach(MIMEText(html_content, "html"))
+    # smtplib and the email package are only needed once a mail is actually sent
+    import smtplib
+
+    message = _build_message(to, subject, html_content)
 
     try:
         with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
@@ -46,6 +52,38 @@ def send_email(to: str, subject: str, html_content: str):
         print(f"-------------------------------------")
 
 
+def send_emails(messages: List[Tuple[str, str, str]]) -> List[bool]:
+    """
+    Sends (to, subject, html_content) messages over a single SMTP connection.
+    Returns, per message, whether it is done with (sent, or skipped because
+    SMTP is not configured); failed messages can be retried later.
+    """
+    if not messages:
+        return []
+    if not all([SMTP_SERVER, SMTP_PORT, EMAILS_FROM_EMAIL]):
+        print(f"--- {len(messages)} EMAILS SKIPPED: SMTP settings not configured in .env file. ---")
+        return [True] * len(messages)
+
+    import smtplib
+
+    sent = [False] * len(messages)
+    try:
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+            # if SMTP_USERNAME and SMTP_PASSWORD:
+            #     server.starttls()
+            #     server.login(SMTP_USERNAME, SMTP_PASSWORD)
+            for index, (to, subject, html_content) in enumerate(messages):
+                try:
+                    server.sendmail(EMAILS_FROM_EMAIL, to, _build_message(to, subject, html_content).as_string())
+                    sent[index] = True
+                except smtplib.SMTPRecipientsRefused as e:
+                    print(f"--- FAILED TO SEND EMAIL to {to}: {e} ---")
+    except Exception as e:
+        print(f"--- SMTP BATCH FAILED after {sum(sent)} of {len(messages)} emails: {e} ---")
+    print(f"--- {sum(sent)} of {len(messages)} emails sent in one SMTP session ---")
+    return sent
+
+
 def send_booking_request_email(booking: models.Booking):
     """
     Formats and sends an email notification to the item owner about a new booking request.
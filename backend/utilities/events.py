@@ -0,0 +1,226 @@
+# backend/utilities/events.py
+"""
+Booking event push.
+
+Booking changes are published inside the writing transaction. On PostgreSQL
+they go out through NOTIFY, so they are only delivered once the transaction
+commits and every gunicorn worker receives them through its own LISTEN
+connection. On other databases (local SQLite setups) events are delivered to
+the current worker after commit. Each worker fans events out to the
+Server-Sent Events streams of the users involved. Other modules broadcast
+their own channels the same way through `publish` and `listener.add_handler`.
+"""
+
+import asyncio
+import enum
+import json
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from databases import database, models
+
+BOOKING_EVENTS_CHANNEL = "booking_events"
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+LISTEN_RECONNECT_SECONDS = 5
+
+_PENDING_EVENTS_KEY = "pending_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+def _is_postgres() -> bool:
+    return database.engine.dialect.name == "postgresql"
+
+
+# ===================================================================
+# LISTEN / NOTIFY
+# ===================================================================
+
+class NotificationListener:
+    """
+    Holds one dedicated LISTEN connection per worker in a background thread
+    and hands each notification payload to the handler of its channel.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_handler(self, channel: str, handler: Callable[[str], None]):
+        self._handlers[channel] = handler
+
+    def start(self):
+        if self._thread is None and self._handlers and _is_postgres():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=LISTEN_RECONNECT_SECONDS + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            connection = None
+            try:
+                # Detached from the pool: this connection lives as long as the worker
+                connection = database.engine.raw_connection()
+                connection.detach()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                cursor = driver_connection.cursor()
+                for channel in self._handlers:
+                    cursor.execute(f'LISTEN "{channel}"')
+                self._poll(driver_connection)
+            except Exception as e:
+                print(f"--- NOTIFICATION LISTENER ERROR: {e} (reconnecting) ---")
+                self._stop.wait(LISTEN_RECONNECT_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _poll(self, driver_connection):
+        if hasattr(driver_connection, "poll"):
+            # psycopg2
+            while not self._stop.is_set():
+                if select.select([driver_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    notification = driver_connection.notifies.pop(0)
+                    self._handle(notification.channel, notification.payload)
+        else:
+            # psycopg 3
+            while not self._stop.is_set():
+                for notification in driver_connection.notifies(timeout=1.0):
+                    self._handle(notification.channel, notification.payload)
+
+    def deliver_local(self, channel: str, payload: str):
+        """Delivers a payload to this worker only (databases without NOTIFY)."""
+        self._handle(channel, payload)
+
+    def _handle(self, channel: str, payload: str):
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            handler(payload)
+        except Exception as e:
+            print(f"--- FAILED TO HANDLE NOTIFICATION on {channel}: {e} ---")
+
+
+listener = NotificationListener()
+
+
+# ===================================================================
+# BOOKING EVENTS
+# ===================================================================
+
+class BookingEventBroker:
+    """Fans booking events out to the SSE subscribers of this worker."""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def dispatch(self, event_data: dict):
+        """Thread-safe: may be called from request threads or the listener thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, event_data)
+
+    def dispatch_payload(self, payload: str):
+        self.dispatch(json.loads(payload))
+
+    def _deliver(self, event_data: dict):
+        for user_id in {event_data["renter_id"], event_data["owner_id"]}:
+            for queue in self._subscribers.get(user_id, ()):
+                if queue.full():
+                    # A stalled client only loses its own oldest event
+                    queue.get_nowait()
+                queue.put_nowait(event_data)
+
+
+booking_events = BookingEventBroker()
+listener.add_handler(BOOKING_EVENTS_CHANNEL, booking_events.dispatch_payload)
+
+
+def publish_booking_event(db: Session, event_type: str, booking: models.Booking, owner_id: int):
+    """
+    Queues a booking event in the current transaction. It reaches subscribers
+    only if the transaction commits.
+    """
+    status = booking.status.value if isinstance(booking.status, enum.Enum) else booking.status
+    event_data = {
+        "type": event_type,
+        "booking_id": booking.id,
+        "item_id": booking.item_id,
+        "renter_id": booking.renter_id,
+        "owner_id": owner_id,
+        "status": status,
+        # Enough for clients to show a new booking without refetching it
+        "start_date": booking.start_date.isoformat(),
+        "end_date": booking.end_date.isoformat(),
+        "total_price": booking.total_price,
+        "timestamp": time.time(),
+    }
+    publish(db, BOOKING_EVENTS_CHANNEL, event_data)
+
+
+def publish(db: Session, channel: str, data: dict):
+    """
+    Queues `data` for the handlers of `channel` in every worker; it is only
+    delivered if the current transaction commits.
+    """
+    payload = json.dumps(data)
+    if _is_postgres():
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+    else:
+        db.info.setdefault(_PENDING_EVENTS_KEY, []).append((channel, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed_events(session: Session):
+    for channel, payload in session.info.pop(_PENDING_EVENTS_KEY, ()):
+        listener.deliver_local(channel, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_events(session: Session):
+    session.info.pop(_PENDING_EVENTS_KEY, None)
+
+
+async def start():
+    booking_events.bind(asyncio.get_running_loop())
+    listener.start()
+
+
+async def stop():
+    await asyncio.to_thread(listener.stop)
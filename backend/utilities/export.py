@@ -0,0 +1,73 @@
+# backend/utilities/export.py
+
+import csv
+import enum
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from databases import database
+
+# Number of rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    """Converts a column value into something json/csv can write."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _stream_rows(stmt: Select, format: str) -> Iterator[str]:
+    """
+    Executes `stmt` with a server-side cursor and yields the rows encoded as
+    NDJSON or CSV, one batch at a time, so memory stays constant regardless of
+    the result size. The generator owns its session because it outlives the
+    request's dependencies.
+    """
+    db = database.SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        if format == "csv":
+            writer.writerow(columns)
+
+        for batch in result.partitions():
+            for row in batch:
+                if format == "csv":
+                    writer.writerow([_plain(value) for value in row])
+                else:
+                    buffer.write(json.dumps({c: _plain(v) for c, v in zip(columns, row)}))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if format == "csv" and buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def streaming_export(stmt: Select, format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_rows(stmt, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -0,0 +1,141 @@
+# backend/utilities/fieldsets.py
+"""
+Sparse fieldsets for read endpoints.
+
+`fields=name,price_per_day` limits the columns of the returned resource and
+`include=owner,category` (dotted paths such as `item.owner` for bookings)
+selects which relationships are embedded. The same selection drives both the
+SQL (load_only / joinedload) and the serialized output, so unrequested columns
+and relationships are never loaded. Without either parameter endpoints keep
+their full response.
+"""
+
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import contains_eager, joinedload, load_only
+
+from databases import models, schemas
+
+
+class Resource:
+    """A model together with the columns and relationships clients may select."""
+
+    def __init__(self, model, schema, relationships: Optional[Dict[str, "Resource"]] = None):
+        self.model = model
+        table_columns = model.__table__.columns
+        self.columns = [name for name in schema.model_fields if name in table_columns]
+        self.relationships = relationships or {}
+
+
+USER = Resource(models.User, schemas.UserResponse)
+CATEGORY = Resource(models.Category, schemas.CategoryResponse)
+ITEM = Resource(models.Item, schemas.ItemResponse, {"owner": USER, "category": CATEGORY})
+BOOKING = Resource(models.Booking, schemas.BookingResponse, {"item": ITEM})
+
+
+class FieldSet:
+    def __init__(self, resource: Resource, columns: List[str], includes: Dict[str, "FieldSet"]):
+        self.resource = resource
+        self.columns = columns
+        self.includes = includes
+
+    def load_options(self, contains_eager_for=(), _loader=None) -> list:
+        """
+        Loader options that load only the selected columns and relationships.
+        Relationships named in `contains_eager_for` are already joined by the
+        caller's query and are populated from that join.
+        """
+        model = self.resource.model
+        columns = [getattr(model, name) for name in self.columns]
+        options = [_loader.load_only(*columns) if _loader is not None else load_only(*columns)]
+        for name, child in self.includes.items():
+            attribute = getattr(model, name)
+            if _loader is not None:
+                child_loader = _loader.joinedload(attribute)
+            elif name in contains_eager_for:
+                child_loader = contains_eager(attribute)
+            else:
+                child_loader = joinedload(attribute)
+            options.extend(child.load_options(_loader=child_loader))
+        return options
+
+    def serialize(self, obj) -> Optional[dict]:
+        if obj is None:
+            return None
+        data = {name: getattr(obj, name) for name in self.columns}
+        for name, child in self.includes.items():
+            data[name] = child.serialize(getattr(obj, name))
+        return data
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _build(resource: Resource, columns: List[str], include_tree: dict) -> FieldSet:
+    includes = {
+        name: _build(resource.relationships[name], resource.relationships[name].columns, subtree)
+        for name, subtree in include_tree.items()
+    }
+    return FieldSet(resource, columns, includes)
+
+
+def parse_fieldset(resource: Resource, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+    if fields is None and include is None:
+        return None
+
+    columns = resource.columns
+    if fields is not None:
+        requested = _split(fields)
+        unknown = [name for name in requested if name not in resource.columns]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(resource.columns)}",
+            )
+        # The id is always returned so clients can reference the resource
+        columns = ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+    include_tree: dict = {}
+    for path in _split(include or ""):
+        current, node = resource, include_tree
+        for name in path.split("."):
+            if name not in current.relationships:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown include: {path}",
+                )
+            current, node = current.relationships[name], node.setdefault(name, {})
+
+    return _build(resource, columns, include_tree)
+
+
+def render(fieldset: Optional[FieldSet], result):
+    """
+    Returns `result` untouched when no fieldset was requested (so the route's
+    response_model applies), otherwise the pruned JSON response.
+    """
+    if fieldset is None:
+        return result
+    if isinstance(result, list):
+        content = [fieldset.serialize(obj) for obj in result]
+    else:
+        content = fieldset.serialize(result)
+    return JSONResponse(content=jsonable_encoder(content))
+
+
+def _dependency(resource: Resource):
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. `id,name`"),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. `owner,category`"),
+    ) -> Optional[FieldSet]:
+        return parse_fieldset(resource, fields, include)
+    return dependency
+
+
+item_fields = _dependency(ITEM)
+booking_fields = _dependency(BOOKING)
+user_fields = _dependency(USER)
@@ -0,0 +1,153 @@
+# backend/utilities/idempotency.py
+"""
+Idempotency-Key support for create endpoints.
+
+The first request with a key claims it (a row in idempotency_keys) before the
+operation runs and stores the response afterwards. A retry with the same key
+and the same request replays the stored response without running the
+operation again; a retry while the first request is still running gets a 409,
+and reusing a key for a different request gets a 422. Keys expire after
+IDEMPOTENCY_KEY_TTL_HOURS.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Type
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from databases import models
+
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", 24))
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def fingerprint(*parts: Any) -> str:
+    """A stable hash of everything that makes up a request."""
+    encoded = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def file_fingerprint(upload) -> Optional[str]:
+    """Hashes an uploaded file's content and rewinds it for the real handler."""
+    if upload is None:
+        return None
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: upload.file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    upload.file.seek(0)
+    return digest.hexdigest()
+
+
+def _get_record(db: Session, user_id: int, key: str) -> Optional[models.IdempotencyKey]:
+    return (
+        db.query(models.IdempotencyKey)
+        .filter(models.IdempotencyKey.user_id == user_id, models.IdempotencyKey.key == key)
+        .first()
+    )
+
+
+def _replay_or_reject(record: models.IdempotencyKey, endpoint: str, request_fingerprint: str) -> JSONResponse:
+    if record.endpoint != endpoint or record.request_fingerprint != request_fingerprint:
+        raise HTTPException(
+            status_code=422,  # Unprocessable Content
+            detail="Idempotency-Key was already used for a different request",
+        )
+    if record.response_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+    return JSONResponse(
+        status_code=record.response_status,
+        content=record.response_body,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _claim(db: Session, user_id: int, key: str, endpoint: str, request_fingerprint: str):
+    """
+    Claims the key for this request. Returns (record, None) when the caller
+    should run the operation, or (None, response) when a stored response
+    should be replayed instead.
+    """
+    now = datetime.now()
+    record = _get_record(db, user_id, key)
+    if record is not None and record.expires_at <= now:
+        db.delete(record)
+        db.commit()
+        record = None
+    if record is not None:
+        return None, _replay_or_reject(record, endpoint, request_fingerprint)
+
+    record = models.IdempotencyKey(
+        key=key,
+        user_id=user_id,
+        endpoint=endpoint,
+        request_fingerprint=request_fingerprint,
+        expires_at=now + timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    db.add(record)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request claimed the same key first
+        db.rollback()
+        existing = _get_record(db, user_id, key)
+        if existing is None:
+            raise
+        return None, _replay_or_reject(existing, endpoint, request_fingerprint)
+    return record, None
+
+
+def run_idempotent(
+    db: Session,
+    idempotency_key: Optional[str],
+    user_id: int,
+    endpoint: str,
+    request_fingerprint: str,
+    status_code: int,
+    response_model: Type[BaseModel],
+    operation: Callable[[], Any],
+):
+    """
+    Runs `operation` at most once per (user, Idempotency-Key). Without a key
+    the operation simply runs.
+    """
+    if not idempotency_key:
+        return operation()
+
+    record, replay = _claim(db, user_id, idempotency_key, endpoint, request_fingerprint)
+    if replay is not None:
+        return replay
+
+    try:
+        result = operation()
+    except Exception:
+        # Failed requests may be retried with the same key
+        db.rollback()
+        db.execute(delete(models.IdempotencyKey).where(models.IdempotencyKey.id == record.id))
+        db.commit()
+        raise
+
+    body = jsonable_encoder(response_model.model_validate(result))
+    record.response_status = status_code
+    record.response_body = body
+    db.add(record)
+    db.commit()
+    return JSONResponse(status_code=status_code, content=body)
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Deletes all expired keys; returns the number of rows removed."""
+    result = db.execute(delete(models.IdempotencyKey).where(models.IdempotencyKey.expires_at <= datetime.now()))
+    db.commit()
+    return result.rowcount
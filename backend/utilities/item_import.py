@@ -0,0 +1,98 @@
+# backend/utilities/item_import.py
+
+import csv
+import io
+import json
+import os
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+
+from databases import schemas
+
+MAX_BULK_IMPORT_ROWS = int(os.getenv("MAX_BULK_IMPORT_ROWS", 1000))
+
+
+def _detect_format(upload: UploadFile) -> str:
+    filename = (upload.filename or "").lower()
+    content_type = (upload.content_type or "").lower()
+    if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    if filename.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Import file must be CSV (.csv) or NDJSON (.ndjson/.jsonl)",
+    )
+
+
+def _csv_rows(upload: UploadFile):
+    reader = csv.DictReader(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+    for row_number, row in enumerate(reader, start=1):
+        # Empty cells mean "not provided" so that schema defaults apply
+        data = {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+        dates = data.get("disabled_dates")
+        if dates is not None:
+            # Accept either a JSON array or a ';'-separated list of dates
+            dates = dates.strip()
+            try:
+                data["disabled_dates"] = json.loads(dates) if dates.startswith("[") else [d.strip() for d in dates.split(";") if d.strip()]
+            except ValueError as e:
+                yield row_number, e
+                continue
+        yield row_number, data
+
+
+def _ndjson_rows(upload: UploadFile):
+    for row_number, line in enumerate(io.TextIOWrapper(upload.file, encoding="utf-8-sig"), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, e
+
+
+def _format_validation_error(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()]
+
+
+def parse_item_rows(upload: UploadFile) -> Tuple[List[Tuple[int, schemas.ItemImportRow]], List[schemas.ItemImportError]]:
+    """
+    Parses and validates a CSV or NDJSON item import file.
+    Returns the valid rows (with their 1-based row numbers) and per-row errors.
+    """
+    rows = _ndjson_rows(upload) if _detect_format(upload) == "ndjson" else _csv_rows(upload)
+
+    valid, errors = [], []
+    try:
+        for row_number, data in rows:
+            if row_number > MAX_BULK_IMPORT_ROWS:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Bulk import is limited to {MAX_BULK_IMPORT_ROWS} rows per upload",
+                )
+            row, error = _validate_row(row_number, data)
+            if error:
+                errors.append(error)
+            else:
+                valid.append((row_number, row))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Import file must be UTF-8 encoded")
+
+    return valid, errors
+
+
+def _validate_row(row_number: int, data) -> Tuple[Optional[schemas.ItemImportRow], Optional[schemas.ItemImportError]]:
+    if isinstance(data, ValueError):
+        return None, schemas.ItemImportError(row=row_number, errors=[f"row: could not be parsed ({data})"])
+    if not isinstance(data, dict):
+        return None, schemas.ItemImportError(row=row_number, errors=["row: must be an object"])
+    try:
+        row = schemas.ItemImportRow.model_validate(data)
+    except ValidationError as e:
+        return None, schemas.ItemImportError(row=row_number, errors=_format_validation_error(e))
+    if row.category_id is None and not row.category:
+        return None, schemas.ItemImportError(row=row_number, errors=["category_id: either category_id or category is required"])
+    return row, None
@@ -0,0 +1,203 @@
+# backend/utilities/notifications.py
+"""
+Booking notifications by user preference.
+
+Users choose how booking emails reach them (`notification_frequency`): one
+email per event, sent right away (utilities/email_sender.py), or an hourly
+or daily digest. Digest notifications are queued in pending_notifications in
+the same transaction as the booking change. The `send_notification_digests`
+scheduler job picks every recipient whose oldest queued notification has
+waited a full period, renders one email per recipient and sends the whole
+batch over a single SMTP connection.
+
+Templates are compiled once at import (string.Template); rendering a digest
+only substitutes the escaped values.
+"""
+
+import html
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from string import Template
+from typing import Dict, List
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from databases import database, models
+from utilities import email_sender
+
+# --- Configuration ---
+# Recipients rendered and sent per SMTP session
+DIGEST_BATCH_RECIPIENTS = int(os.getenv("DIGEST_BATCH_RECIPIENTS", 200))
+
+# How long a recipient's oldest notification waits before their digest goes out
+DIGEST_PERIODS = {
+    # Left over when a user switches back to immediate emails; sent on the next run
+    models.NotificationFrequency.immediate: timedelta(0),
+    models.NotificationFrequency.hourly: timedelta(hours=1),
+    models.NotificationFrequency.daily: timedelta(days=1),
+}
+
+BOOKING_REQUEST = "booking_request"
+BOOKING_APPROVED = "booking_approved"
+
+# ===================================================================
+# TEMPLATES
+# ===================================================================
+
+_SECTIONS = {
+    BOOKING_REQUEST: (
+        "New rental requests",
+        Template("<li><b>$renter_name</b> ($renter_email) wants to rent <b>'$item_name'</b> "
+                 "from $start_date to $end_date for $$$total_price.</li>"),
+    ),
+    BOOKING_APPROVED: (
+        "Approved rentals",
+        Template("<li><b>'$item_name'</b> from $start_date to $end_date, approved by $owner_name "
+                 "($owner_email). Pickup address: $pickup_address</li>"),
+    ),
+}
+_SECTION_TEMPLATE = Template("<h3>$title ($count)</h3><ul>$lines</ul>")
+_DIGEST_TEMPLATE = Template("""
+    <html>
+    <body>
+        <h2>Hello $name,</h2>
+        <p>Here is what happened on Rentify since your last update.</p>
+        $sections
+        <p>Please log in to your Rentify account to approve or deny pending requests.</p>
+        <p>Thank you,<br>The Rentify Team</p>
+    </body>
+    </html>
+""")
+
+
+def _escaped(data: dict) -> Dict[str, str]:
+    return {key: html.escape(str(value)) for key, value in data.items()}
+
+
+def render_digest(name: str, notifications: List[models.PendingNotification]) -> str:
+    lines = defaultdict(list)
+    for notification in notifications:
+        if notification.kind in _SECTIONS:
+            lines[notification.kind].append(_SECTIONS[notification.kind][1].substitute(_escaped(notification.data)))
+    sections = "".join(
+        _SECTION_TEMPLATE.substitute(title=title, count=len(lines[kind]), lines="".join(lines[kind]))
+        for kind, (title, _) in _SECTIONS.items() if lines[kind]
+    )
+    return _DIGEST_TEMPLATE.substitute(name=html.escape(name), sections=sections)
+
+
+# ===================================================================
+# QUEUEING
+# ===================================================================
+
+def _format_date(value) -> str:
+    return value.strftime("%B %d, %Y")
+
+
+def _display_name(user: models.User) -> str:
+    return user.full_name or user.username
+
+
+def queue_booking_request(db: Session, booking: models.Booking, item: models.Item, renter: models.User) -> bool:
+    """
+    Queues the owner's "new request" notification if they get digests.
+    Returns False when the email should be sent right away instead.
+    """
+    owner = item.owner
+    if owner.notification_frequency == models.NotificationFrequency.immediate:
+        return False
+    db.add(models.PendingNotification(user_id=owner.id, kind=BOOKING_REQUEST, data={
+        "booking_id": booking.id,
+        "item_name": item.name,
+        "renter_name": _display_name(renter),
+        "renter_email": renter.email,
+        "start_date": _format_date(booking.start_date),
+        "end_date": _format_date(booking.end_date),
+        "total_price": f"{booking.total_price:.2f}",
+    }))
+    return True
+
+
+def queue_booking_approved(db: Session, booking: models.Booking) -> bool:
+    """Like queue_booking_request, for the renter's "approved" notification."""
+    renter, item = booking.renter, booking.item
+    if renter.notification_frequency == models.NotificationFrequency.immediate:
+        return False
+    address_parts = [item.address, item.city, item.state, item.zip_code]
+    db.add(models.PendingNotification(user_id=renter.id, kind=BOOKING_APPROVED, data={
+        "booking_id": booking.id,
+        "item_name": item.name,
+        "owner_name": _display_name(item.owner),
+        "owner_email": item.owner.email,
+        "start_date": _format_date(booking.start_date),
+        "end_date": _format_date(booking.end_date),
+        "pickup_address": ", ".join(part for part in address_parts if part),
+    }))
+    return True
+
+
+# ===================================================================
+# DIGEST JOB
+# ===================================================================
+
+def _due_recipients(db: Session, now: datetime, exclude: List[int]):
+    oldest = func.min(models.PendingNotification.created_at)
+    due = or_(*[
+        and_(models.User.notification_frequency == frequency, oldest <= now - period)
+        for frequency, period in DIGEST_PERIODS.items()
+    ])
+    stmt = (
+        select(models.User.id, models.User.email, models.User.full_name, models.User.username)
+        .join(models.PendingNotification, models.PendingNotification.user_id == models.User.id)
+        .group_by(models.User.id)
+        .having(due)
+        .order_by(models.User.id)
+        .limit(DIGEST_BATCH_RECIPIENTS)
+    )
+    if exclude:
+        stmt = stmt.where(models.User.id.not_in(exclude))
+    return db.execute(stmt).all()
+
+
+def send_due_digests() -> int:
+    """Sends every digest that is due, in batches; returns the number of emails sent."""
+    now = datetime.now()
+    sent_count = 0
+    failed: List[int] = []
+    while True:
+        db = database.SessionLocal()
+        try:
+            recipients = _due_recipients(db, now, failed)
+            if not recipients:
+                return sent_count
+            by_user = defaultdict(list)
+            for notification in db.scalars(
+                select(models.PendingNotification)
+                .where(models.PendingNotification.user_id.in_([r.id for r in recipients]))
+                .order_by(models.PendingNotification.user_id, models.PendingNotification.id)
+            ):
+                by_user[notification.user_id].append(notification)
+
+            messages = [
+                (
+                    r.email,
+                    f"Your Rentify digest: {len(by_user[r.id])} update{'s' if len(by_user[r.id]) != 1 else ''}",
+                    render_digest(r.full_name or r.username, by_user[r.id]),
+                )
+                for r in recipients
+            ]
+            results = email_sender.send_emails(messages)
+
+            # Only the notifications that went out; newer ones wait for the next digest
+            done_ids = [n.id for r, ok in zip(recipients, results) if ok for n in by_user[r.id]]
+            failed.extend(r.id for r, ok in zip(recipients, results) if not ok)
+            if done_ids:
+                db.execute(delete(models.PendingNotification).where(models.PendingNotification.id.in_(done_ids)))
+            db.commit()
+            sent_count += sum(results)
+        finally:
+            db.close()
+        if len(recipients) < DIGEST_BATCH_RECIPIENTS:
+            return sent_count
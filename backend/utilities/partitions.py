@@ -0,0 +1,106 @@
+# backend/utilities/partitions.py
+"""
+PostgreSQL range partitions for bookings and bookings_archive.
+
+`bookings` is partitioned by month of start_date and `bookings_archive` by
+year; both have a DEFAULT partition so an insert never fails when a
+partition is missing. Partitions are named <table>_pYYYYMM / <table>_pYYYY,
+which is how their bounds are recovered here. On other databases (SQLite in
+local setups) the tables are plain and every function is a no-op.
+"""
+
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+
+# table -> months covered by one partition
+PARTITIONED_TABLES = {"bookings": 1, "bookings_archive": 12}
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_start(table: str, day: date) -> date:
+    if PARTITIONED_TABLES[table] == 12:
+        return date(day.year, 1, 1)
+    return date(day.year, day.month, 1)
+
+
+def _partition_name(table: str, start: date) -> str:
+    if PARTITIONED_TABLES[table] == 12:
+        return f"{table}_p{start:%Y}"
+    return f"{table}_p{start:%Y%m}"
+
+
+def is_partitioned(connection, table: str) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar())
+
+
+def list_partitions(connection, table: str) -> List[str]:
+    return list(connection.execute(
+        text("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:table)
+            ORDER BY c.relname
+        """),
+        {"table": table},
+    ).scalars())
+
+
+def ensure_partitions(connection, table: str, first_day: date, last_day: date) -> int:
+    """Creates the missing partitions covering first_day..last_day; returns how many were created."""
+    if not is_partitioned(connection, table):
+        return 0
+    existing = set(list_partitions(connection, table))
+    months = PARTITIONED_TABLES[table]
+    created = 0
+    start = _partition_start(table, first_day)
+    while start <= last_day:
+        end = add_months(start, months)
+        name = _partition_name(table, start)
+        if name not in existing:
+            # Fails if the DEFAULT partition already holds rows of this range; those stay in DEFAULT
+            connection.execute(text("SAVEPOINT create_partition"))
+            try:
+                connection.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+                connection.execute(text("RELEASE SAVEPOINT create_partition"))
+                created += 1
+            except Exception as e:
+                connection.execute(text("ROLLBACK TO SAVEPOINT create_partition"))
+                print(f"--- COULD NOT CREATE PARTITION {name}: {e} ---")
+        start = end
+    return created
+
+
+def drop_empty_partitions(connection, table: str, before: date) -> int:
+    """Drops partitions that end on or before `before` and hold no rows (e.g. fully archived months)."""
+    if not is_partitioned(connection, table):
+        return 0
+    months = PARTITIONED_TABLES[table]
+    pattern = re.compile(rf"^{table}_p(\d{{4}})(\d{{2}})?$")
+    dropped = 0
+    for name in list_partitions(connection, table):
+        match = pattern.match(name)
+        if not match:
+            continue
+        start = date(int(match.group(1)), int(match.group(2) or 1), 1)
+        if add_months(start, months) > before:
+            continue
+        if connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            continue
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped += 1
+    return dropped
@@ -1,12 +1,19 @@
-from passlib.context import CryptContext
+from functools import lru_cache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib (and bcrypt behind it) is only imported on the first hash/verify,
+# which keeps it out of the startup path of every worker
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    # Password hashing context
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain-text password."""
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
@@ -0,0 +1,43 @@
+# backend/utilities/read_your_writes.py
+"""
+Marks clients that just wrote, so their next reads go to the primary.
+
+Every successful unsafe request (POST/PUT/PATCH/DELETE) sets a short-lived
+cookie holding the time until which `database.get_read_db` must use the
+primary instead of a possibly lagging replica. Clients that cannot send
+cookies can ask for the same with an `X-Read-Consistency: strong` header.
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from databases.database import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_SECONDS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# POST endpoints that only read
+READ_ONLY_PATHS = ("/api/items/quote",)
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, window_seconds: int = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or scope["path"] in READ_ONLY_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(raw=message["headers"])
+                until = time.time() + self.window_seconds
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={self.window_seconds}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
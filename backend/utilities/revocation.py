@@ -0,0 +1,136 @@
+# backend/utilities/revocation.py
+"""
+Access token revocation without a query per request.
+
+A revoked id is either the `jti` of one access token or the `sid` of a
+login session (revoking every access token issued in it). Revocations are
+written to the revoked_tokens table and broadcast on the `token_revocations`
+channel in the same transaction; every worker keeps the live ids in a dict
+in memory and checks tokens against it. Entries only have to outlive the
+access tokens they block (ACCESS_TOKEN_EXPIRE_MINUTES), so the set stays
+small. Each worker loads the table at startup and re-reads it every
+REVOCATION_RESYNC_SECONDS in case notifications were missed while its LISTEN
+connection was reconnecting.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from databases import database, models
+from utilities import events
+
+# --- Configuration ---
+REVOCATION_RESYNC_SECONDS = int(os.getenv("REVOCATION_RESYNC_SECONDS", 60))
+# Startup load attempts (1s, 2s, 4s, ... apart) before the worker gives up
+REVOCATION_STARTUP_ATTEMPTS = int(os.getenv("REVOCATION_STARTUP_ATTEMPTS", 5))
+
+TOKEN_REVOCATIONS_CHANNEL = "token_revocations"
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class RevocationList:
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}  # id -> unix time after which it can be forgotten
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def is_revoked(self, *token_ids: Optional[str]) -> bool:
+        revoked = self._revoked
+        return any(token_id in revoked for token_id in token_ids if token_id)
+
+    def add(self, entries: Dict[str, float]):
+        now = time.time()
+        with self._lock:
+            self._revoked.update(entries)
+            if now >= self._next_prune:
+                self._revoked = {token_id: until for token_id, until in self._revoked.items() if until > now}
+                self._next_prune = now + 60
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revoked = RevocationList()
+events.listener.add_handler(TOKEN_REVOCATIONS_CHANNEL, lambda payload: revoked.add(json.loads(payload)))
+
+
+def revoke(db: Session, token_ids: Iterable[str], expires_at: datetime):
+    """
+    Revokes access token ids / session ids until `expires_at` (when the last
+    access token they could block has expired). Takes effect in every worker
+    once the current transaction commits.
+    """
+    rows = [{"token_id": token_id, "expires_at": expires_at} for token_id in dict.fromkeys(token_ids)]
+    if not rows:
+        return
+    stmt = _INSERTS[db.get_bind().dialect.name](models.RevokedToken).values(rows)
+    db.execute(stmt.on_conflict_do_update(index_elements=["token_id"], set_={"expires_at": stmt.excluded.expires_at}))
+    events.publish(db, TOKEN_REVOCATIONS_CHANNEL, {row["token_id"]: expires_at.timestamp() for row in rows})
+
+
+def load():
+    """Adds every live revocation from the database to this worker's list."""
+    db = database.SessionLocal()
+    try:
+        rows = db.execute(
+            select(models.RevokedToken.token_id, models.RevokedToken.expires_at)
+            .where(models.RevokedToken.expires_at > datetime.now())
+        )
+        revoked.add({token_id: expires_at.timestamp() for token_id, expires_at in rows})
+    finally:
+        db.close()
+
+
+def purge_expired(db: Session) -> int:
+    """Deletes revocations that no live token can match any more."""
+    result = db.execute(delete(models.RevokedToken).where(models.RevokedToken.expires_at <= datetime.now()))
+    db.commit()
+    return result.rowcount
+
+
+_resync_task: Optional[asyncio.Task] = None
+
+
+async def start():
+    """
+    Loads the list before the worker serves requests (a revoked token must
+    never be accepted), then re-reads it periodically in the background.
+    If the list cannot be loaded after REVOCATION_STARTUP_ATTEMPTS tries,
+    the error is raised and the worker fails to start.
+    """
+    global _resync_task
+    for attempt in range(1, REVOCATION_STARTUP_ATTEMPTS + 1):
+        try:
+            await asyncio.to_thread(load)
+            break
+        except Exception as e:
+            if attempt == REVOCATION_STARTUP_ATTEMPTS:
+                print(f"--- FAILED TO LOAD REVOKED TOKENS, NOT STARTING: {e} ---")
+                raise
+            print(f"--- FAILED TO LOAD REVOKED TOKENS (attempt {attempt}): {e} ---")
+            await asyncio.sleep(2 ** (attempt - 1))
+
+    async def _resync():
+        while True:
+            await asyncio.sleep(REVOCATION_RESYNC_SECONDS)
+            try:
+                await asyncio.to_thread(load)
+            except Exception as e:
+                print(f"--- FAILED TO RESYNC REVOKED TOKENS: {e} ---")
+
+    _resync_task = asyncio.get_running_loop().create_task(_resync())
+
+
+async def stop():
+    if _resync_task is not None:
+        _resync_task.cancel()
@@ -0,0 +1,397 @@
+# backend/utilities/scheduler.py
+"""
+In-app scheduler for periodic maintenance jobs.
+
+Every gunicorn worker starts the scheduler from the lifespan hook, but only
+the worker holding a PostgreSQL advisory lock (on a dedicated connection)
+actually runs the jobs; if that worker dies its connection closes, the lock
+is released and another worker takes over on its next tick. On other
+databases (local SQLite setups) the single process is always the leader.
+
+Jobs run in a thread so they never block the event loop. Timings of the last
+run of each job are kept in `stats` and printed.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, text, update
+
+from databases import database, models
+from utilities import analytics, events, notifications, partitions, revocation, similarity
+from utilities.crud import ITEM_IMAGE_DIRECTORY, ITEM_IMAGE_URL_PREFIX
+from utilities.idempotency import purge_expired_keys
+
+# --- Configuration ---
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", 30))
+# Rows changed per transaction by the batch transitions
+SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", 1000))
+# Uploads younger than this are kept even if unreferenced (the item may not be committed yet)
+UPLOAD_ORPHAN_GRACE_HOURS = int(os.getenv("UPLOAD_ORPHAN_GRACE_HOURS", 24))
+# Completed/cancelled bookings that ended longer ago than this move to bookings_archive
+ARCHIVE_BOOKINGS_AFTER_MONTHS = int(os.getenv("ARCHIVE_BOOKINGS_AFTER_MONTHS", 6))
+# Monthly booking partitions are created this far ahead
+BOOKING_PARTITIONS_AHEAD_MONTHS = int(os.getenv("BOOKING_PARTITIONS_AHEAD_MONTHS", 3))
+
+# Arbitrary application-wide key for pg_try_advisory_lock
+SCHEDULER_LOCK_KEY = 727_001
+
+
+class Job:
+    def __init__(self, name: str, interval_seconds: int, func: Callable[[], int]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.next_run = 0.0
+
+
+# ===================================================================
+# JOBS
+# ===================================================================
+
+def _transition_bookings(from_status: models.BookingStatus, to_status: models.BookingStatus, condition) -> int:
+    """
+    Moves every booking in `from_status` that matches `condition` to
+    `to_status`, in batches of SCHEDULER_BATCH_SIZE rows per UPDATE, and
+    publishes an event for each changed booking. The analytics rollup is
+    updated in the same transaction. Returns the number changed.
+    """
+    changed = 0
+    while True:
+        db = database.SessionLocal()
+        try:
+            batch = (
+                select(models.Booking.id)
+                .where(models.Booking.status == from_status, condition)
+                .limit(SCHEDULER_BATCH_SIZE)
+            )
+            stmt = (
+                update(models.Booking)
+                .where(models.Booking.id.in_(batch), models.Booking.status == from_status)
+                .values(status=to_status, version=models.Booking.version + 1)
+                .returning(
+                    models.Booking.id,
+                    models.Booking.item_id,
+                    models.Booking.renter_id,
+                    models.Booking.status,
+                    models.Booking.start_date,
+                    models.Booking.end_date,
+                    models.Booking.total_price,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            rows = db.execute(stmt).all()
+            if rows:
+                item_ids = {row.item_id for row in rows}
+                owners = dict(
+                    db.query(models.Item.id, models.Item.owner_id).filter(models.Item.id.in_(item_ids)).all()
+                )
+                analytics.record_status_change(db, [(row, owners[row.item_id]) for row in rows], from_status, to_status)
+                for row in rows:
+                    events.publish_booking_event(db, "booking.status_changed", row, owner_id=owners[row.item_id])
+            db.commit()
+        finally:
+            db.close()
+
+        changed += len(rows)
+        if len(rows) < SCHEDULER_BATCH_SIZE:
+            return changed
+
+
+def complete_finished_bookings() -> int:
+    """confirmed -> completed once the rental period has ended."""
+    return _transition_bookings(
+        models.BookingStatus.confirmed,
+        models.BookingStatus.completed,
+        models.Booking.end_date < datetime.now(),
+    )
+
+
+def expire_stale_pending_bookings() -> int:
+    """pending -> cancelled when the owner never answered before the start date."""
+    return _transition_bookings(
+        models.BookingStatus.pending,
+        models.BookingStatus.cancelled,
+        models.Booking.start_date < datetime.now(),
+    )
+
+
+def remove_orphaned_uploads() -> int:
+    """
+    Deletes uploaded item images that no item references any more. Only
+    uploads/items/ is scanned: that is where the app saves uploads, while
+    files directly in uploads/ (e.g. the sample images in the repository)
+    are never touched.
+    """
+    if not os.path.isdir(ITEM_IMAGE_DIRECTORY):
+        return 0
+
+    db = database.SessionLocal()
+    try:
+        referenced = {
+            url[len(ITEM_IMAGE_URL_PREFIX):]
+            for url in db.scalars(
+                select(models.Item.image_url).where(models.Item.image_url.startswith(ITEM_IMAGE_URL_PREFIX))
+            )
+        }
+    finally:
+        db.close()
+
+    cutoff = time.time() - UPLOAD_ORPHAN_GRACE_HOURS * 3600
+    removed = 0
+    with os.scandir(ITEM_IMAGE_DIRECTORY) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name in referenced or entry.name.startswith("."):
+                continue
+            if entry.stat().st_mtime > cutoff:
+                continue
+            try:
+                os.remove(entry.path)
+                removed += 1
+                print(f"--- REMOVED ORPHANED UPLOAD: {entry.path} ---")
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def _archive_cutoff() -> date:
+    return partitions.add_months(date.today().replace(day=1), -ARCHIVE_BOOKINGS_AFTER_MONTHS)
+
+
+def archive_old_bookings() -> int:
+    """
+    Moves finished bookings that ended before the archive cutoff from
+    bookings to bookings_archive, one batch (DELETE ... RETURNING + INSERT)
+    per transaction.
+    """
+    cutoff = datetime.combine(_archive_cutoff(), datetime.min.time())
+    columns = [models.Booking.__table__.c[column.name] for column in models.BookingArchive.__table__.c if column.name != "archived_at"]
+    moved = 0
+    while True:
+        db = database.SessionLocal()
+        try:
+            batch = (
+                select(models.Booking.id)
+                .where(
+                    models.Booking.status.in_([models.BookingStatus.completed, models.BookingStatus.cancelled]),
+                    models.Booking.end_date < cutoff,
+                )
+                .limit(SCHEDULER_BATCH_SIZE)
+            )
+            rows = db.execute(
+                delete(models.Booking.__table__).where(models.Booking.id.in_(batch)).returning(*columns)
+            ).all()
+            if rows:
+                db.execute(insert(models.BookingArchive.__table__), [dict(row._mapping) for row in rows])
+            db.commit()
+        finally:
+            db.close()
+
+        moved += len(rows)
+        if len(rows) < SCHEDULER_BATCH_SIZE:
+            return moved
+
+
+def maintain_booking_partitions() -> int:
+    """
+    Creates upcoming booking/archive partitions and drops hot partitions the
+    archive job has emptied. Returns the number of partitions changed.
+    """
+    today = date.today()
+    with database.engine.begin() as connection:
+        changed = partitions.ensure_partitions(
+            connection, "bookings", today, partitions.add_months(today, BOOKING_PARTITIONS_AHEAD_MONTHS)
+        )
+        changed += partitions.ensure_partitions(
+            connection, "bookings_archive", today, partitions.add_months(today, 12)
+        )
+        changed += partitions.drop_empty_partitions(connection, "bookings", _archive_cutoff())
+    return changed
+
+
+def refresh_item_similarities() -> int:
+    """Recomputes the neighbor lists of new and edited items (one batch per run)."""
+    with database.engine.begin() as connection:
+        return similarity.refresh_stale_items(connection)
+
+
+def purge_idempotency_keys() -> int:
+    db = database.SessionLocal()
+    try:
+        return purge_expired_keys(db)
+    finally:
+        db.close()
+
+
+def purge_expired_tokens() -> int:
+    """Deletes expired refresh tokens and revocations no live access token can match."""
+    db = database.SessionLocal()
+    try:
+        result = db.execute(delete(models.RefreshToken).where(models.RefreshToken.expires_at <= datetime.now()))
+        db.commit()
+        return result.rowcount + revocation.purge_expired(db)
+    finally:
+        db.close()
+
+
+def send_notification_digests() -> int:
+    return notifications.send_due_digests()
+
+
+JOBS: List[Job] = [
+    Job("complete_finished_bookings", int(os.getenv("COMPLETE_BOOKINGS_INTERVAL_SECONDS", 300)), complete_finished_bookings),
+    Job("expire_stale_pending_bookings", int(os.getenv("EXPIRE_PENDING_INTERVAL_SECONDS", 300)), expire_stale_pending_bookings),
+    Job("remove_orphaned_uploads", int(os.getenv("ORPHANED_UPLOADS_INTERVAL_SECONDS", 3600)), remove_orphaned_uploads),
+    Job("archive_old_bookings", int(os.getenv("ARCHIVE_BOOKINGS_INTERVAL_SECONDS", 3600)), archive_old_bookings),
+    Job("maintain_booking_partitions", int(os.getenv("BOOKING_PARTITIONS_INTERVAL_SECONDS", 24 * 3600)), maintain_booking_partitions),
+    Job("refresh_item_similarities", int(os.getenv("SIMILARITY_INTERVAL_SECONDS", 120)), refresh_item_similarities),
+    Job("purge_idempotency_keys", int(os.getenv("PURGE_IDEMPOTENCY_KEYS_INTERVAL_SECONDS", 3600)), purge_idempotency_keys),
+    Job("send_notification_digests", int(os.getenv("DIGEST_INTERVAL_SECONDS", 300)), send_notification_digests),
+    Job("purge_expired_tokens", int(os.getenv("PURGE_TOKENS_INTERVAL_SECONDS", 3600)), purge_expired_tokens),
+]
+
+
+# ===================================================================
+# LEADER ELECTION
+# ===================================================================
+
+class LeaderLock:
+    """
+    A session-level advisory lock held on a dedicated connection. Whoever
+    holds it is the leader until the connection (or the process) goes away.
+    """
+
+    def __init__(self, key: int = SCHEDULER_LOCK_KEY):
+        self.key = key
+        self._connection = None
+
+    def acquire(self) -> bool:
+        """Returns True if this worker is (still) the leader."""
+        if database.engine.dialect.name != "postgresql":
+            return True
+
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT 1"))
+                self._connection.commit()
+                return True
+            except Exception as e:
+                print(f"--- SCHEDULER LOST LEADER CONNECTION: {e} ---")
+                self._close()
+
+        connection = database.engine.connect()
+        try:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            # Keep the connection out of any transaction so it never holds other locks
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        print("--- SCHEDULER: this worker is the leader ---")
+        return True
+
+    def release(self):
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+                self._connection.commit()
+            except Exception:
+                pass
+            self._close()
+
+    def _close(self):
+        try:
+            self._connection.invalidate()
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+# ===================================================================
+# SCHEDULER
+# ===================================================================
+
+class Scheduler:
+    def __init__(self, jobs: List[Job], tick_seconds: int = SCHEDULER_TICK_SECONDS):
+        self.jobs = jobs
+        self.tick_seconds = tick_seconds
+        self.lock = LeaderLock()
+        self.stats: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Serializes lock and job work across the worker thread and shutdown
+        self._mutex = threading.Lock()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self._release)
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                print(f"--- SCHEDULER ERROR: {e} ---")
+            await asyncio.sleep(self.tick_seconds)
+
+    def tick(self):
+        """Runs every job that is due, if this worker is the leader."""
+        with self._mutex:
+            if not self.lock.acquire():
+                return
+            now = time.monotonic()
+            for job in self.jobs:
+                if job.next_run <= now:
+                    self.run_job(job)
+                    job.next_run = time.monotonic() + job.interval_seconds
+
+    def run_job(self, job: Job):
+        started = time.perf_counter()
+        stats = self.stats.setdefault(job.name, {"runs": 0, "failures": 0})
+        try:
+            result = job.func()
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = str(e)
+            print(f"--- SCHEDULER JOB {job.name} FAILED: {e} ---")
+            result = None
+        duration_ms = (time.perf_counter() - started) * 1000
+        stats["runs"] += 1
+        stats["last_run"] = datetime.now().isoformat()
+        stats["last_duration_ms"] = round(duration_ms, 1)
+        stats["last_result"] = result
+        if result is not None:
+            print(f"--- SCHEDULER JOB {job.name}: {result} rows/files in {duration_ms:.1f} ms ---")
+
+    def _release(self):
+        with self._mutex:
+            self.lock.release()
+
+
+scheduler = Scheduler(JOBS)
+
+
+async def start():
+    scheduler.start()
+
+
+async def stop():
+    await scheduler.stop()
@@ -1,29 +1,38 @@
+import hashlib
 import os
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from . import crud
+from . import crud, revocation
 from databases import database, models, schemas
 
 # --- Configuration ---
 # It's highly recommended to load these from environment variables
 SECRET_KEY = os.getenv("SECRET_KEY", "a_very_secret_key_for_development_and_should_be_changed")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+# Refresh tokens let clients get new access tokens without logging in again
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 30))
 
 # OAuth2 scheme setup
 # tokenUrl should point to your login endpoint, including the /api prefix
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+# Same scheme without the automatic 401, for endpoints that also accept ?access_token=
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/login", auto_error=False)
 
 
 # --- JWT Token Utilities ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a new JWT access token."""
+    from jose import jwt  # imported on first use to keep worker startup fast
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -31,36 +40,137 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    # Unique id, so that a single token can be revoked (utilities/revocation.py)
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-# --- User Dependency ---
-def get_current_user(
-    db: Session = Depends(database.get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+def decode_access_token(token: Optional[str]) -> dict:
     """
-    Decodes the JWT token to get the current user.
-    Raises HTTPException if the token is invalid or the user is not found.
+    Returns the claims of a valid, unexpired and unrevoked access token.
+    Revocation is checked against the in-memory list, without a query.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
-        
-    # Use the flexible crud function to find the user by username OR email
-    user = crud.get_user_by_identifier(db, identifier=token_data.username)
-    if user is None:
+    if payload.get("sub") is None or revocation.revoked.is_revoked(payload.get("jti"), payload.get("sid")):
         raise credentials_exception
+    return payload
+
+
+# --- Refresh Tokens ---
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_tokens(db: Session, user: models.User, family_id: Optional[str] = None) -> dict:
+    """
+    Creates an access token and the next refresh token of the login session
+    `family_id` (a new session when omitted). The caller commits.
+    """
+    family_id = family_id or uuid.uuid4().hex
+    refresh_token = secrets.token_urlsafe(32)
+    db.add(models.RefreshToken(
+        token_hash=_hash_token(refresh_token),
+        family_id=family_id,
+        user_id=user.id,
+        expires_at=datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return {
+        # `sid` ties the access token to its session so that logging out revokes it too
+        "access_token": create_access_token(data={"sub": user.username, "sid": family_id}),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+def rotate_refresh_token(db: Session, refresh_token: str) -> dict:
+    """
+    Exchanges a refresh token for a new access/refresh token pair. Each
+    refresh token works once: presenting one that was already used means
+    a copy of it leaked, so the whole session is revoked.
+    """
+    invalid = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    record = db.scalars(
+        select(models.RefreshToken)
+        .where(models.RefreshToken.token_hash == _hash_token(refresh_token))
+        .with_for_update()
+    ).first()
+    if record is None or record.expires_at <= datetime.now() or record.revoked_at is not None:
+        raise invalid
+    if record.used_at is not None:
+        print(f"--- REFRESH TOKEN REUSED: revoking session {record.family_id} of user {record.user_id} ---")
+        revoke_session(db, record.family_id)
+        db.commit()
+        raise invalid
+
+    user = db.get(models.User, record.user_id)
+    if user is None or not user.is_active:
+        raise invalid
+    record.used_at = datetime.now()
+    tokens = issue_tokens(db, user, family_id=record.family_id)
+    db.commit()
+    return tokens
+
+
+def revoke_session(db: Session, family_id: str):
+    """Revokes the session's refresh tokens and, in every worker, its access tokens."""
+    now = datetime.now()
+    db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.family_id == family_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    revocation.revoke(db, [family_id], now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+
+def logout(db: Session, token: Optional[str]) -> dict:
+    """Ends the session of an access token (or just the token, if it has none)."""
+    payload = decode_access_token(token)
+    if payload.get("sid"):
+        revoke_session(db, payload["sid"])
+    elif payload.get("jti"):
+        expires_at = datetime.fromtimestamp(payload["exp"])
+        revocation.revoke(db, [payload["jti"]], expires_at)
+    db.commit()
+    return {"detail": "Logged out"}
+
+
+# --- User Dependency ---
+def get_current_user(
+    db: Session = Depends(database.get_db), token: str = Depends(oauth2_scheme)
+) -> models.User:
+    """
+    Decodes the JWT token to get the current user.
+    Raises HTTPException if the token is invalid or the user is not found.
+    """
+    return get_user_from_token(db, token)
+
+
+def get_user_from_token(db: Session, token: Optional[str]) -> models.User:
+    payload = decode_access_token(token)
+    token_data = schemas.TokenData(username=payload["sub"])
+
+    # Tokens always carry the username (see routes/authentication.py): one index lookup
+    user = crud.get_user_by_username(db, username=token_data.username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -76,6 +186,19 @@ def get_current_active_user(
     return current_user
 
 
+def get_current_active_user_from_query(
+    db: Session = Depends(database.get_db),
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = Query(None),
+) -> models.User:
+    """
+    Like get_current_active_user, but also accepts the token as an
+    `access_token` query parameter for clients that cannot set headers
+    (e.g. the browser EventSource API).
+    """
+    return get_current_active_user(get_user_from_token(db, token or access_token))
+
+
 def verify_item_ownership(item: models.Item, current_user: models.User):
     """
     Ensures that the given user is the owner of the provided item.
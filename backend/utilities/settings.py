@@ -0,0 +1,46 @@
+# backend/utilities/settings.py
+"""
+Application settings passed to `main.create_app`.
+
+Only what the factory itself needs lives here (database URLs, CORS origins
+and which background services run); modules keep reading their own tuning
+knobs with os.getenv. `Settings.from_env()` loads the .env file first, and
+create_app imports the routers only afterwards, so those module-level reads
+see it too.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+DEFAULT_DATABASE_URL = "postgresql://rentify_user:your_secure_password@db/rentify_db"
+DEFAULT_CORS_ORIGINS = ["http://localhost", "http://localhost:5173"]
+
+
+def _flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Settings:
+    database_url: str = DEFAULT_DATABASE_URL
+    # Optional streaming replica for read-only routes (see databases/database.py)
+    database_replica_url: Optional[str] = None
+    cors_origins: List[str] = field(default_factory=lambda: list(DEFAULT_CORS_ORIGINS))
+    # Tests and one-off processes usually turn these off
+    scheduler_enabled: bool = True
+    admission_enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        origins = os.getenv("CORS_ORIGINS")
+        return cls(
+            database_url=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL),
+            database_replica_url=os.getenv("DATABASE_REPLICA_URL") or None,
+            cors_origins=[o.strip() for o in origins.split(",") if o.strip()] if origins else list(DEFAULT_CORS_ORIGINS),
+            scheduler_enabled=_flag("SCHEDULER_ENABLED"),
+            admission_enabled=_flag("ADMISSION_ENABLED"),
+        )
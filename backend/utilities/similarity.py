@@ -0,0 +1,299 @@
+# backend/utilities/similarity.py
+"""
+"Similar items" from precomputed neighbor lists.
+
+Every item gets a hashed bag-of-words vector over its name (weighted
+double) and description, stored L2-normalized as float16 in item_vectors.
+Neighbors are the SIMILAR_ITEMS_K items with the highest cosine similarity
+in the same category (the category is the blocking key, so a drill never
+recommends a tent), computed with NumPy matrix products over chunks of
+candidate vectors and stored as ranked rows in item_similarities. Reading
+the neighbors of an item is a single primary-key range scan.
+
+Items whose text or category changed are flagged `similarity_stale`; the
+scheduler refreshes them in batches and also inserts each refreshed item
+into the lists of its own neighbors. Neighbors that only drifted apart are
+corrected by the full rebuild (scripts/rebuild_similarities.py).
+"""
+
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Iterator, List, Sequence, Tuple
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from databases import models
+
+# --- Configuration ---
+SIMILARITY_DIMENSIONS = int(os.getenv("SIMILARITY_DIMENSIONS", 512))  # power of two
+SIMILAR_ITEMS_K = int(os.getenv("SIMILAR_ITEMS_K", 12))
+# Stale items refreshed per scheduler run
+SIMILARITY_BATCH_SIZE = int(os.getenv("SIMILARITY_BATCH_SIZE", 500))
+# Candidate vectors multiplied at once (memory: chunk x batch floats)
+SIMILARITY_CHUNK_SIZE = int(os.getenv("SIMILARITY_CHUNK_SIZE", 20000))
+# Pairs below this cosine similarity are not worth recommending
+SIMILARITY_MIN_SCORE = float(os.getenv("SIMILARITY_MIN_SCORE", 0.05))
+NAME_WEIGHT = 2.0
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was with "
+    "you your our we will can all very great good new used like just also one rent rental".split()
+)
+
+
+# ===================================================================
+# VECTORS
+# ===================================================================
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+@lru_cache(maxsize=200_000)
+def _feature(token: str) -> Tuple[int, float]:
+    # crc32 is stable across processes (hash() is salted); the sign bit halves collision bias
+    h = zlib.crc32(token.encode())
+    return h & (SIMILARITY_DIMENSIONS - 1), (1.0 if h & 0x80000000 else -1.0)
+
+
+def vectorize(rows: Sequence) -> "np.ndarray":
+    """L2-normalized float32 vectors (one row per item) from rows with name and description."""
+    import numpy as np
+
+    matrix = np.zeros((len(rows), SIMILARITY_DIMENSIONS), dtype=np.float32)
+    row_index, columns, values = [], [], []
+    for i, row in enumerate(rows):
+        for text, weight in ((row.name or "", NAME_WEIGHT), (row.description or "", 1.0)):
+            for token in _tokens(text):
+                column, sign = _feature(token)
+                row_index.append(i)
+                columns.append(column)
+                values.append(sign * weight)
+    np.add.at(matrix, (np.array(row_index, dtype=np.int64), np.array(columns, dtype=np.int64)), values)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _to_blob(vector) -> bytes:
+    import numpy as np
+
+    return vector.astype(np.float16).tobytes()
+
+
+def _from_blobs(blobs: Sequence[bytes]) -> "np.ndarray":
+    import numpy as np
+
+    matrix = np.frombuffer(b"".join(blobs), dtype=np.float16)
+    if matrix.size != len(blobs) * SIMILARITY_DIMENSIONS:
+        raise RuntimeError(
+            "Stored item vectors do not match SIMILARITY_DIMENSIONS; run scripts/rebuild_similarities.py"
+        )
+    return matrix.reshape(len(blobs), SIMILARITY_DIMENSIONS).astype(np.float32)
+
+
+def _category_vectors(connection, category_id: int) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """(ids, vectors) of every vectorized item in a category, SIMILARITY_CHUNK_SIZE at a time."""
+    import numpy as np
+
+    table = models.ItemVector.__table__
+    result = connection.execute(
+        select(table.c.item_id, table.c.vector)
+        .where(table.c.category_id == category_id)
+        .execution_options(yield_per=SIMILARITY_CHUNK_SIZE)
+    )
+    for rows in result.partitions():
+        yield np.array([row.item_id for row in rows], dtype=np.int64), _from_blobs([row.vector for row in rows])
+
+
+def _top_k(query_ids, query_vectors, chunks) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Ids and scores of the SIMILAR_ITEMS_K best candidates per query row, best first."""
+    import numpy as np
+
+    k = SIMILAR_ITEMS_K
+    best_scores = np.full((len(query_ids), k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(query_ids), k), dtype=np.int64)
+    for ids, vectors in chunks:
+        scores = query_vectors @ vectors.T
+        scores[query_ids[:, None] == ids[None, :]] = -np.inf  # an item is not similar to itself
+        scores = np.concatenate([best_scores, scores], axis=1)
+        candidates = np.concatenate([best_ids, np.broadcast_to(ids, (len(query_ids), len(ids)))], axis=1)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(candidates, top, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_ids, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+# ===================================================================
+# NEIGHBOR LISTS
+# ===================================================================
+
+def _neighbor_rows(item_ids, neighbor_ids, scores) -> List[dict]:
+    rows = []
+    for item_id, neighbors, item_scores in zip(item_ids.tolist(), neighbor_ids.tolist(), scores.tolist()):
+        rank = 0
+        for neighbor_id, score in zip(neighbors, item_scores):
+            if score < SIMILARITY_MIN_SCORE:
+                break
+            rows.append({"item_id": item_id, "rank": rank, "similar_item_id": neighbor_id, "score": score})
+            rank += 1
+    return rows
+
+
+def _replace_lists(connection, item_ids: List[int], rows: List[dict]):
+    table = models.ItemSimilarity.__table__
+    connection.execute(delete(table).where(table.c.item_id.in_(item_ids)))
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+def _merge_into_neighbors(connection, rows: List[dict]):
+    """
+    Offers each refreshed item to the lists of its neighbors (similarity is
+    symmetric), keeping the SIMILAR_ITEMS_K best entries of each list.
+    """
+    table = models.ItemSimilarity.__table__
+    offers = {}
+    for row in rows:
+        offers.setdefault(row["similar_item_id"], []).append((row["score"], row["item_id"]))
+    if not offers:
+        return
+
+    current = {}
+    for row in connection.execute(select(table).where(table.c.item_id.in_(list(offers)))):
+        current.setdefault(row.item_id, []).append((row.score, row.similar_item_id))
+
+    changed, new_rows = [], []
+    for neighbor_id, offered in offers.items():
+        entries = current.get(neighbor_id, [])
+        offered_ids = {item_id for _, item_id in offered}
+        merged = sorted(
+            [entry for entry in entries if entry[1] not in offered_ids] + offered,
+            key=lambda entry: (-entry[0], entry[1]),
+        )[:SIMILAR_ITEMS_K]
+        if merged != sorted(entries, key=lambda entry: (-entry[0], entry[1])):
+            changed.append(neighbor_id)
+            new_rows.extend(
+                {"item_id": neighbor_id, "rank": rank, "similar_item_id": similar_id, "score": score}
+                for rank, (score, similar_id) in enumerate(merged)
+            )
+    if changed:
+        _replace_lists(connection, changed, new_rows)
+
+
+def refresh_stale_items(connection) -> int:
+    """
+    Re-vectorizes up to SIMILARITY_BATCH_SIZE stale items, recomputes their
+    neighbor lists and merges them into their neighbors' lists. Returns the
+    number of items refreshed.
+    """
+    import numpy as np
+
+    stale = connection.execute(
+        select(models.Item.id, models.Item.version, models.Item.category_id, models.Item.name, models.Item.description)
+        .where(models.Item.similarity_stale.is_(True))
+        .order_by(models.Item.id)
+        .limit(SIMILARITY_BATCH_SIZE)
+    ).all()
+    if not stale:
+        return 0
+
+    vectors = vectorize(stale)
+    vector_table = models.ItemVector.__table__
+    ids = [row.id for row in stale]
+    connection.execute(delete(vector_table).where(vector_table.c.item_id.in_(ids)))
+    connection.execute(vector_table.insert(), [
+        {"item_id": row.id, "category_id": row.category_id, "vector": _to_blob(vectors[i])}
+        for i, row in enumerate(stale)
+    ])
+
+    rows = []
+    for category_id in {row.category_id for row in stale}:
+        positions = [i for i, row in enumerate(stale) if row.category_id == category_id]
+        query_ids = np.array([stale[i].id for i in positions], dtype=np.int64)
+        neighbor_ids, scores = _top_k(query_ids, vectors[positions], _category_vectors(connection, category_id))
+        rows.extend(_neighbor_rows(query_ids, neighbor_ids, scores))
+
+    # A moved or rewritten item must leave the lists it no longer belongs to
+    similarity_table = models.ItemSimilarity.__table__
+    connection.execute(delete(similarity_table).where(similarity_table.c.similar_item_id.in_(ids)))
+    _replace_lists(connection, ids, rows)
+    _merge_into_neighbors(connection, rows)
+
+    # Items edited meanwhile have a new version and stay stale for the next run
+    connection.execute(
+        update(models.Item.__table__)
+        .where(tuple_(models.Item.id, models.Item.version).in_([(row.id, row.version) for row in stale]))
+        .values(similarity_stale=False)
+    )
+    return len(stale)
+
+
+def rebuild_all(connection, batch_size: int = 5000) -> int:
+    """
+    Recomputes every vector and every neighbor list from scratch, one
+    category at a time (the category's vectors are held in memory).
+    Returns the number of items processed.
+    """
+    import numpy as np
+
+    vector_table = models.ItemVector.__table__
+    similarity_table = models.ItemSimilarity.__table__
+    connection.execute(delete(similarity_table))
+    connection.execute(delete(vector_table))
+
+    result = connection.execute(
+        select(models.Item.id, models.Item.category_id, models.Item.name, models.Item.description)
+        .execution_options(yield_per=batch_size)
+    )
+    total = 0
+    for rows in result.partitions():
+        vectors = vectorize(rows)
+        connection.execute(vector_table.insert(), [
+            {"item_id": row.id, "category_id": row.category_id, "vector": _to_blob(vectors[i])}
+            for i, row in enumerate(rows)
+        ])
+        total += len(rows)
+
+    category_ids = connection.execute(select(vector_table.c.category_id).distinct()).scalars().all()
+    for category_id in category_ids:
+        chunks = list(_category_vectors(connection, category_id))
+        for ids, vectors in chunks:
+            for start in range(0, len(ids), batch_size):
+                query_ids = ids[start:start + batch_size]
+                neighbor_ids, scores = _top_k(query_ids, vectors[start:start + batch_size], chunks)
+                rows = _neighbor_rows(query_ids, neighbor_ids, scores)
+                if rows:
+                    connection.execute(similarity_table.insert(), rows)
+
+    connection.execute(update(models.Item.__table__).values(similarity_stale=False))
+    return total
+
+
+def forget_item(db: Session, item_id: int):
+    """Removes a deleted item's vector and every list it appears in."""
+    similarity_table = models.ItemSimilarity.__table__
+    db.execute(delete(similarity_table).where(
+        (similarity_table.c.item_id == item_id) | (similarity_table.c.similar_item_id == item_id)
+    ))
+    db.execute(delete(models.ItemVector.__table__).where(models.ItemVector.item_id == item_id))
+
+
+# ===================================================================
+# READS
+# ===================================================================
+
+def get_similar_items(db: Session, item_id: int, limit: int):
+    """Available neighbors of an item, best first, from its precomputed list."""
+    return db.execute(
+        select(models.Item, models.ItemSimilarity.score)
+        .join(models.ItemSimilarity, models.ItemSimilarity.similar_item_id == models.Item.id)
+        .where(models.ItemSimilarity.item_id == item_id, models.Item.is_available.is_(True))
+        .order_by(models.ItemSimilarity.rank)
+        .limit(limit)
+    ).all()
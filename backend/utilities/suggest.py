@@ -0,0 +1,279 @@
+# backend/utilities/suggest.py
+"""
+Typeahead suggestions from an in-memory prefix index.
+
+Every worker keeps a sorted list of lowercase keys for item names (one key
+per word start, so "dri" finds "Cordless drill"), category names and
+cities. A prefix is answered by bisecting to the range of keys starting with
+it and picking the highest-weighted distinct suggestions. Short prefixes,
+whose ranges are large, are not scanned: each keeps its terms ranked by
+weight, updated in place by every write. An item name weighs 1 + its review
+count (as of its last write or the last load), categories and cities the
+number of items they have.
+
+The index is loaded in the background at startup and kept current through
+the `item_suggestions` channel: item writes publish the changed items in
+their transaction and every worker applies them after commit.
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from databases import database, models
+from utilities import events
+
+# --- Configuration ---
+SUGGEST_MAX_LIMIT = 10
+# Prefixes up to this length keep their terms ranked (exact, no scan)
+SUGGEST_RANKED_PREFIX_LENGTH = int(os.getenv("SUGGEST_RANKED_PREFIX_LENGTH", 3))
+# Longer prefixes look at no more than this many keys (their ranges are short anyway)
+SUGGEST_MAX_SCAN = int(os.getenv("SUGGEST_MAX_SCAN", 5000))
+# Only the first few words of a name start a key
+MAX_WORD_STARTS = 4
+# Retry delays when the index cannot be loaded
+SUGGEST_LOAD_RETRY_SECONDS = 5
+SUGGEST_LOAD_RETRY_MAX_SECONDS = 300
+
+ITEM_SUGGESTIONS_CHANNEL = "item_suggestions"
+
+# (name, city, category name, weight) of an item
+ItemEntry = Tuple[str, Optional[str], Optional[str], float]
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []  # sorted (key, kind, term)
+        self._terms: Dict[Tuple[str, str], list] = {}  # (kind, term) -> [display text, weight, item count]
+        self._items: Dict[int, ItemEntry] = {}
+        # short prefix -> its terms as sorted (weight, term, kind), best last
+        self._ranked: Dict[str, List[Tuple[float, str, str]]] = {}
+        self._lock = threading.Lock()
+        self._pending: Optional[List[dict]] = None  # changes received while loading
+        self.ready = False
+
+    # --- Reads ---
+    def suggest(self, prefix: str, limit: int = SUGGEST_MAX_LIMIT) -> List[dict]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            if len(prefix) <= SUGGEST_RANKED_PREFIX_LENGTH:
+                best = [(kind, term) for _, term, kind in reversed(self._ranked.get(prefix, [])[-limit:])]
+            else:
+                lo = bisect_left(self._keys, (prefix,))
+                hi = min(bisect_left(self._keys, (prefix + "\uffff",)), lo + SUGGEST_MAX_SCAN)
+                candidates = {(kind, term) for _, kind, term in self._keys[lo:hi]}
+                best = heapq.nlargest(limit, candidates, key=lambda t: (self._terms[t][1], t[1]))
+            return [{"text": self._terms[t][0], "kind": t[0]} for t in best]
+
+    # --- Writes ---
+    def load(self, entries: Iterable[Tuple[int, ItemEntry]]):
+        """Replaces the whole index; changes that arrive meanwhile are applied afterwards."""
+        with self._lock:
+            self._pending = []
+        try:
+            items = dict(entries)
+            terms: Dict[Tuple[str, str], list] = {}
+            for entry in items.values():
+                for kind, text, weight in self._contributions(entry):
+                    term = terms.setdefault((kind, _normalize(text)), [text, 0.0, 0])
+                    term[1] += weight
+                    term[2] += 1
+            keys = sorted((key, kind, term) for kind, term in terms for key in self._key_starts(term))
+            ranked: Dict[str, List[Tuple[float, str, str]]] = defaultdict(list)
+            for (kind, term), (_, weight, _) in terms.items():
+                for prefix in self._ranked_prefixes(term):
+                    ranked[prefix].append((weight, term, kind))
+            for ranking in ranked.values():
+                ranking.sort()
+        except BaseException:
+            # Changes go straight to the current index again until the next attempt
+            with self._lock:
+                pending, self._pending = self._pending, None
+                for change in pending:
+                    self._apply(change)
+            raise
+
+        with self._lock:
+            self._items, self._terms, self._keys, self._ranked = items, terms, keys, dict(ranked)
+            pending, self._pending = self._pending, None
+            for change in pending:
+                self._apply(change)
+            self.ready = True
+
+    def apply(self, change: dict):
+        """Applies {"upsert": [[item_id, name, city, category, weight], ...], "remove": [item_id, ...]}."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(change)
+            else:
+                self._apply(change)
+
+    def _apply(self, change: dict):
+        for item_id in change.get("remove", ()):
+            self._remove_item(item_id)
+        for item_id, name, city, category, weight in change.get("upsert", ()):
+            self._remove_item(item_id)
+            entry = (name, city, category, weight)
+            self._items[item_id] = entry
+            for kind, text, term_weight in self._contributions(entry):
+                self._add_term(kind, text, term_weight)
+
+    def _remove_item(self, item_id: int):
+        entry = self._items.pop(item_id, None)
+        if entry is not None:
+            for kind, text, weight in self._contributions(entry):
+                self._remove_term(kind, text, weight)
+
+    @staticmethod
+    def _contributions(entry: ItemEntry):
+        name, city, category, weight = entry
+        yield "item", name, weight
+        if city:
+            yield "city", city, 1.0
+        if category:
+            yield "category", category, 1.0
+
+    @staticmethod
+    def _key_starts(term: str) -> List[str]:
+        words = term.split(" ")
+        return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_STARTS))]
+
+    @classmethod
+    def _ranked_prefixes(cls, term: str) -> set:
+        return {
+            key[:length]
+            for key in cls._key_starts(term)
+            for length in range(1, min(len(key), SUGGEST_RANKED_PREFIX_LENGTH) + 1)
+        }
+
+    def _rank(self, kind: str, term: str, weight: float):
+        for prefix in self._ranked_prefixes(term):
+            insort(self._ranked.setdefault(prefix, []), (weight, term, kind))
+
+    def _unrank(self, kind: str, term: str, weight: float):
+        for prefix in self._ranked_prefixes(term):
+            ranking = self._ranked.get(prefix)
+            if not ranking:
+                continue
+            position = bisect_left(ranking, (weight, term, kind))
+            if position < len(ranking) and ranking[position] == (weight, term, kind):
+                del ranking[position]
+            if not ranking:
+                del self._ranked[prefix]
+
+    def _add_term(self, kind: str, text: str, weight: float):
+        term = _normalize(text)
+        if not term:
+            return
+        entry = self._terms.get((kind, term))
+        if entry is None:
+            self._terms[(kind, term)] = [text, weight, 1]
+            for key in self._key_starts(term):
+                insort(self._keys, (key, kind, term))
+        else:
+            self._unrank(kind, term, entry[1])
+            entry[1] += weight
+            entry[2] += 1
+        self._rank(kind, term, self._terms[(kind, term)][1])
+
+    def _remove_term(self, kind: str, text: str, weight: float):
+        term = _normalize(text)
+        entry = self._terms.get((kind, term))
+        if entry is None:
+            return
+        self._unrank(kind, term, entry[1])
+        entry[1] -= weight
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del self._terms[(kind, term)]
+            for key in self._key_starts(term):
+                position = bisect_left(self._keys, (key, kind, term))
+                if position < len(self._keys) and self._keys[position] == (key, kind, term):
+                    del self._keys[position]
+        else:
+            self._rank(kind, term, entry[1])
+
+
+index = PrefixIndex()
+events.listener.add_handler(ITEM_SUGGESTIONS_CHANNEL, lambda payload: index.apply(json.loads(payload)))
+
+
+# ===================================================================
+# PUBLISHING AND LOADING
+# ===================================================================
+
+def item_entry(item_id: int, name: str, city: Optional[str], category: Optional[str], rating_count: int) -> list:
+    return [item_id, name, city, category, 1.0 + (rating_count or 0)]
+
+
+def publish_changes(db: Session, upserts: List[list] = (), removed: List[int] = ()):
+    """
+    Broadcasts changed items (see `item_entry`) and removed item ids in the
+    current transaction, split into payloads NOTIFY accepts.
+    """
+    change = {"upsert": [], "remove": list(removed)}
+    size = len(json.dumps(change))
+    for entry in upserts:
+        entry_size = len(json.dumps(entry)) + 1
+        if change["upsert"] and size + entry_size > events.MAX_PAYLOAD_BYTES:
+            events.publish(db, ITEM_SUGGESTIONS_CHANNEL, change)
+            change = {"upsert": [], "remove": []}
+            size = len(json.dumps(change))
+        change["upsert"].append(entry)
+        size += entry_size
+    if change["upsert"] or change["remove"]:
+        events.publish(db, ITEM_SUGGESTIONS_CHANNEL, change)
+
+
+def load_index():
+    db = database.SessionLocal()
+    try:
+        rows = db.execute(
+            select(models.Item.id, models.Item.name, models.Item.city, models.Category.name, models.Item.rating_count)
+            .outerjoin(models.Category, models.Category.id == models.Item.category_id)
+            .where(models.Item.is_available.is_(True))
+            .execution_options(yield_per=10000)
+        )
+        index.load((row[0], tuple(item_entry(*row)[1:])) for row in rows)
+    finally:
+        db.close()
+
+
+_load_task: Optional[asyncio.Task] = None
+
+
+async def start():
+    """Loads the index in a thread without delaying startup; until then suggestions are empty."""
+    global _load_task
+
+    async def _load():
+        delay = SUGGEST_LOAD_RETRY_SECONDS
+        while True:
+            try:
+                await asyncio.to_thread(load_index)
+                return
+            except Exception as e:
+                print(f"--- FAILED TO LOAD SUGGESTION INDEX (retrying in {delay}s): {e} ---")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SUGGEST_LOAD_RETRY_MAX_SECONDS)
+
+    _load_task = asyncio.get_running_loop().create_task(_load())
+
+
+async def stop():
+    if _load_task is not None:
+        _load_task.cancel()
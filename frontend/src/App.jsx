@@ -13,6 +13,8 @@ import { LocationModal } from './component/LocationModal';
 
 // --- Configuration ---
 const API_BASE_URL = 'http://localhost:8000';
+// Access tokens live 30 minutes (ACCESS_TOKEN_EXPIRE_MINUTES)
+const ACCESS_TOKEN_REFRESH_MS = 25 * 60 * 1000;
 
 // --- Main App ---
 function App() {
@@ -27,6 +29,39 @@ function App() {
     const [itemToEdit, setItemToEdit] = useState(null);
     const [dataVersion, setDataVersion] = useState(0);
 
+    const clearSession = () => {
+        setCurrentUser(null);
+        setToken(null);
+        localStorage.removeItem('rentifyUser');
+        localStorage.removeItem('rentifyToken');
+        localStorage.removeItem('rentifyRefreshToken');
+    };
+
+    // Trades the stored refresh token for a new access token (and the next refresh token)
+    const refreshSession = async () => {
+        const refreshToken = localStorage.getItem('rentifyRefreshToken');
+        if (!refreshToken) return false;
+        try {
+            const response = await fetch(`${API_BASE_URL}/api/token/refresh`, {
+                credentials: 'include',
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ refresh_token: refreshToken })
+            });
+            if (!response.ok) {
+                if (response.status === 401) clearSession();
+                return false;
+            }
+            const { access_token, refresh_token } = await response.json();
+            setToken(access_token);
+            localStorage.setItem('rentifyToken', access_token);
+            localStorage.setItem('rentifyRefreshToken', refresh_token);
+            return true;
+        } catch (err) {
+            return false;
+        }
+    };
+
     // Check for user session on initial load
     useEffect(() => {
         const storedUser = localStorage.getItem('rentifyUser');
@@ -34,22 +69,37 @@ function App() {
         if (storedUser && storedToken) {
             setCurrentUser(JSON.parse(storedUser));
             setToken(storedToken);
+            // The stored access token may have expired while the app was closed
+            refreshSession();
         }
     }, []);
 
-    const handleLoginSuccess = (user, accessToken) => {
+    // Renew the access token a few minutes before it expires
+    useEffect(() => {
+        if (!currentUser) return;
+        const timer = setInterval(refreshSession, ACCESS_TOKEN_REFRESH_MS);
+        return () => clearInterval(timer);
+    }, [currentUser]);
+
+    const handleLoginSuccess = (user, accessToken, refreshToken) => {
         setCurrentUser(user);
         setToken(accessToken);
         localStorage.setItem('rentifyUser', JSON.stringify(user));
         localStorage.setItem('rentifyToken', accessToken);
+        if (refreshToken) localStorage.setItem('rentifyRefreshToken', refreshToken);
         setIsAuthModalOpen(false);
     };
 
     const handleLogout = () => {
-        setCurrentUser(null);
-        setToken(null);
-        localStorage.removeItem('rentifyUser');
-        localStorage.removeItem('rentifyToken');
+        if (token) {
+            // Revokes the session server-side; the local state is cleared regardless
+            fetch(`${API_BASE_URL}/api/logout`, {
+                credentials: 'include',
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${token}` }
+            }).catch(() => {});
+        }
+        clearSession();
         navigate('/');
     };
     
@@ -29,6 +29,7 @@ export const AuthModal = ({ isOpen, onClose, apiBaseUrl, onLoginSuccess }) => {
         try {
             // Step 1: Get the access token
             const tokenResponse = await fetch(`${apiBaseUrl}/api/login`, {
+                credentials: 'include',
                 method: 'POST',
                 headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
                 body: new URLSearchParams({
@@ -42,10 +43,11 @@ export const AuthModal = ({ isOpen, onClose, apiBaseUrl, onLoginSuccess }) => {
                 throw new Error(errorData.detail || 'Failed to sign in.');
             }
 
-            const { access_token } = await tokenResponse.json();
+            const { access_token, refresh_token } = await tokenResponse.json();
 
             // Step 2: Use the token to get user details
             const userResponse = await fetch(`${apiBaseUrl}/api/users/me`, {
+                credentials: 'include',
                 headers: { 'Authorization': `Bearer ${access_token}` }
             });
 
@@ -56,7 +58,7 @@ export const AuthModal = ({ isOpen, onClose, apiBaseUrl, onLoginSuccess }) => {
             const userData = await userResponse.json();
             
             if (onLoginSuccess) {
-                onLoginSuccess(userData, access_token);
+                onLoginSuccess(userData, access_token, refresh_token);
             }
             handleClose(); // Close modal on success
 
@@ -74,6 +76,7 @@ export const AuthModal = ({ isOpen, onClose, apiBaseUrl, onLoginSuccess }) => {
 
         try {
             const registerResponse = await fetch(`${apiBaseUrl}/api/users/`, {
+                credentials: 'include',
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
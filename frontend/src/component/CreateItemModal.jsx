@@ -60,7 +60,7 @@ export const CreateItemModal = ({ isOpen, onClose, onItemCreated, apiBaseUrl, to
             // Fetch categories for the dropdown
             const fetchCategories = async () => {
                 try {
-                    const response = await fetch(`${apiBaseUrl}/api/categories/`);
+                    const response = await fetch(`${apiBaseUrl}/api/categories/`, { credentials: 'include' });
                     if (!response.ok) throw new Error('Failed to fetch categories');
                     const data = await response.json();
                     setCategories(data);
@@ -133,6 +133,7 @@ export const CreateItemModal = ({ isOpen, onClose, onItemCreated, apiBaseUrl, to
 
         try {
             const response = await fetch(`${apiBaseUrl}/api/items/`, {
+                credentials: 'include',
                 method: 'POST',
                 headers: { 'Authorization': `Bearer ${token}` },
                 body: data,
@@ -40,7 +40,7 @@ export const EditItemModal = ({ isOpen, onClose, item, onItemUpdated, apiBaseUrl
         if (isOpen) {
             const fetchCategories = async () => {
                 try {
-                    const response = await fetch(`${apiBaseUrl}/api/categories/`);
+                    const response = await fetch(`${apiBaseUrl}/api/categories/`, { credentials: 'include' });
                     if (!response.ok) throw new Error('Could not fetch categories.');
                     setCategories(await response.json());
                 } catch (err) {
@@ -90,6 +90,7 @@ export const EditItemModal = ({ isOpen, onClose, item, onItemUpdated, apiBaseUrl
 
         try {
             const response = await fetch(`${apiBaseUrl}/api/items/${item.id}`, {
+                credentials: 'include',
                 method: 'PUT',
                 headers: {
                     'Authorization': `Bearer ${token}`
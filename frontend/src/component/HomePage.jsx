@@ -23,6 +23,7 @@ export const HomePage = ({ apiBaseUrl, dataVersion }) => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [searchTerm, setSearchTerm] = useState('');
+    const [selectedCategory, setSelectedCategory] = useState(null);
     const debouncedSearchTerm = useDebounce(searchTerm, 500);
 
     useEffect(() => {
@@ -30,13 +31,16 @@ export const HomePage = ({ apiBaseUrl, dataVersion }) => {
              try {
                 setLoading(true);
                 setError(null);
+                // Category filtering happens on the server so it covers the whole catalog
                 const apiPath = debouncedSearchTerm 
                     ? `/api/items/search?q=${debouncedSearchTerm}`
-                    : `/api/items/`;
+                    : selectedCategory
+                        ? `/api/items/?category_id=${selectedCategory}`
+                        : `/api/items/`;
 
                 const [itemsResponse, categoriesResponse] = await Promise.all([
-                    fetch(`${apiBaseUrl}${apiPath}`),
-                    fetch(`${apiBaseUrl}/api/categories/`)
+                    fetch(`${apiBaseUrl}${apiPath}`, { credentials: 'include' }),
+                    fetch(`${apiBaseUrl}/api/categories/`, { credentials: 'include' })
                 ]);
 
                 if (!itemsResponse.ok) throw new Error('Failed to fetch items');
@@ -54,7 +58,7 @@ export const HomePage = ({ apiBaseUrl, dataVersion }) => {
             }
         };
         fetchInitialData();
-    }, [debouncedSearchTerm, dataVersion, apiBaseUrl]);
+    }, [debouncedSearchTerm, selectedCategory, dataVersion, apiBaseUrl]);
 
 
     return (
@@ -79,7 +83,11 @@ export const HomePage = ({ apiBaseUrl, dataVersion }) => {
                 <h3 className="text-lg font-semibold mb-4 text-center sm:text-left">Browse by Category</h3>
                 <div className="flex flex-wrap justify-center sm:justify-start gap-3">
                     {categories.map((category) => (
-                        <button key={category.id} className="flex items-center bg-gray-100 hover:bg-gray-200 text-black px-4 py-2 rounded-full transition-colors duration-200 text-sm font-medium">
+                        <button
+                            key={category.id}
+                            onClick={() => setSelectedCategory(selectedCategory === category.id ? null : category.id)}
+                            className={`flex items-center px-4 py-2 rounded-full transition-colors duration-200 text-sm font-medium ${selectedCategory === category.id ? 'bg-black text-white' : 'bg-gray-100 hover:bg-gray-200 text-black'}`}
+                        >
                             <Tag className="h-4 w-4 mr-2" />
                             {category.name}
                         </button>
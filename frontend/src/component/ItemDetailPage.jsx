@@ -21,6 +21,7 @@ export const ItemDetailPage = ({ currentUser, onEditClick, token, dataVersion })
     const { itemId } = useParams();
     const [item, setItem] = useState(null);
     const [bookings, setBookings] = useState([]);
+    const [similarItems, setSimilarItems] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [bookingError, setBookingError] = useState('');
@@ -46,8 +47,8 @@ export const ItemDetailPage = ({ currentUser, onEditClick, token, dataVersion })
             setError(null);
             try {
                 const [itemResponse, bookingsResponse] = await Promise.all([
-                    fetch(`${API_BASE_URL}/api/items/${itemId}`),
-                    fetch(`${API_BASE_URL}/api/items/${itemId}/bookings`)
+                    fetch(`${API_BASE_URL}/api/items/${itemId}`, { credentials: 'include' }),
+                    fetch(`${API_BASE_URL}/api/items/${itemId}/bookings`, { credentials: 'include' })
                 ]);
 
                 if (!itemResponse.ok) throw new Error('Item not found or there was a server error.');
@@ -65,8 +66,19 @@ export const ItemDetailPage = ({ currentUser, onEditClick, token, dataVersion })
             }
         };
 
+        // Similar items are optional: the page works without them
+        const fetchSimilarItems = async () => {
+            try {
+                const response = await fetch(`${API_BASE_URL}/api/items/${itemId}/similar?limit=4`, { credentials: 'include' });
+                setSimilarItems(response.ok ? await response.json() : []);
+            } catch (err) {
+                setSimilarItems([]);
+            }
+        };
+
         if (itemId) {
             fetchData();
+            fetchSimilarItems();
         }
         
         // Effect to handle clicks outside the calendars to close them
@@ -117,6 +129,7 @@ export const ItemDetailPage = ({ currentUser, onEditClick, token, dataVersion })
 
         try {
             const response = await fetch(`${API_BASE_URL}/api/items/${item.id}/bookings`, {
+                credentials: 'include',
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${token}` },
                 body: JSON.stringify({
@@ -342,6 +355,29 @@ export const ItemDetailPage = ({ currentUser, onEditClick, token, dataVersion })
                     )}
                 </div>
             </div>
+
+            {similarItems.length > 0 && (
+                <div className="mt-12">
+                    <h2 className="text-2xl font-bold mb-4">Similar items</h2>
+                    <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+                        {similarItems.map((similar) => (
+                            <Link key={similar.id} to={`/item/${similar.id}`} className="group">
+                                <div className="aspect-square bg-gray-100 rounded-xl overflow-hidden mb-2">
+                                    <img
+                                        src={similar.image_url
+                                            ? `${API_BASE_URL}${similar.image_url}`
+                                            : `https://placehold.co/300x300/e2e8f0/334155?text=${encodeURIComponent(similar.name)}`}
+                                        alt={similar.name}
+                                        className="w-full h-full object-cover group-hover:scale-105 transition-transform"
+                                    />
+                                </div>
+                                <p className="font-semibold truncate">{similar.name}</p>
+                                <p className="text-gray-600 text-sm">${similar.price_per_day.toFixed(2)} / day</p>
+                            </Link>
+                        ))}
+                    </div>
+                </div>
+            )}
         </div>
     );
 };
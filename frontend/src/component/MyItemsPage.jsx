@@ -37,7 +37,7 @@ export const MyItemsPage = ({ apiBaseUrl, currentUser, onBack, onCardClick }) =>
             try {
                 setLoading(true);
                 setError(null);
-                const response = await fetch(`${apiBaseUrl}/api/users/${currentUser.id}/items`);
+                const response = await fetch(`${apiBaseUrl}/api/users/${currentUser.id}/items`, { credentials: 'include' });
                 if (!response.ok) {
                     throw new Error('Failed to fetch your items.');
                 }
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { Loader2, AlertCircle, Package, Calendar, ArrowRight, Check, X as XIcon } from 'lucide-react';
 import { ProductCard } from './ProductCard'; 
@@ -12,6 +12,41 @@ export const ProfilePage = ({ currentUser, token, dataVersion }) => {
   const [bookingRequests, setBookingRequests] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [notificationFrequency, setNotificationFrequency] = useState('immediate');
+  // Bookings are loaded once per token and then kept current by booking events;
+  // a new token means a new event stream, which may have missed changes
+  const bookingsLoadedFor = useRef(null);
+
+  useEffect(() => {
+    if (!currentUser || !token) return;
+    fetch(`${API_BASE_URL}/api/me/preferences`, {
+      credentials: 'include',
+      headers: { 'Authorization': `Bearer ${token}` }
+    })
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => data && setNotificationFrequency(data.notification_frequency))
+      .catch(() => {});
+  }, [currentUser, token]);
+
+  const handleNotificationFrequencyChange = async (frequency) => {
+    const previous = notificationFrequency;
+    setNotificationFrequency(frequency);
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/me/preferences`, {
+        credentials: 'include',
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ notification_frequency: frequency })
+      });
+      if (!response.ok) throw new Error('Failed to save your email preference.');
+    } catch (err) {
+      setNotificationFrequency(previous);
+      setError(err.message);
+    }
+  };
 
   useEffect(() => {
     if (!currentUser || !token) {
@@ -24,25 +59,25 @@ export const ProfilePage = ({ currentUser, token, dataVersion }) => {
       setLoading(true);
       setError('');
       try {
-        const [listingsRes, rentalsRes, requestsRes] = await Promise.all([
-          fetch(`${API_BASE_URL}/api/users/${currentUser.id}/items`, {
-            headers: { 'Authorization': `Bearer ${token}` }
-          }),
-          fetch(`${API_BASE_URL}/api/my-bookings`, {
-            headers: { 'Authorization': `Bearer ${token}` }
-          }),
-          fetch(`${API_BASE_URL}/api/my-listings/bookings`, {
-            headers: { 'Authorization': `Bearer ${token}` }
-          })
-        ]);
-
-        if (!listingsRes.ok) throw new Error('Failed to fetch your listings.');
-        if (!rentalsRes.ok) throw new Error('Failed to fetch your rentals.');
-        if (!requestsRes.ok) throw new Error('Failed to fetch booking requests.');
-
-        setListings(await listingsRes.json());
-        setMyRentals(await rentalsRes.json());
-        setBookingRequests(await requestsRes.json());
+        // One request for all three tabs; the response is normalized (ids + lookup tables)
+        const sections = bookingsLoadedFor.current === token ? 'my_items' : 'my_items,my_bookings,listing_bookings';
+        const response = await fetch(`${API_BASE_URL}/api/me/dashboard?sections=${sections}`, {
+          credentials: 'include',
+          headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!response.ok) throw new Error('Failed to load your profile.');
+        const dashboard = await response.json();
+
+        const withItem = (bookingId) => {
+          const booking = dashboard.bookings[bookingId];
+          return { ...booking, item: dashboard.items[booking.item_id] };
+        };
+        setListings(dashboard.my_items.map(itemId => dashboard.items[itemId]));
+        if (dashboard.my_bookings) {
+          setMyRentals(dashboard.my_bookings.map(withItem));
+          setBookingRequests(dashboard.listing_bookings.map(withItem));
+          bookingsLoadedFor.current = token;
+        }
       } catch (err) {
         setError(err.message);
       } finally {
@@ -53,9 +88,53 @@ export const ProfilePage = ({ currentUser, token, dataVersion }) => {
     fetchData();
   }, [currentUser, token, dataVersion]);
 
+  useEffect(() => {
+    if (!currentUser || !token) return;
+
+    const source = new EventSource(
+      `${API_BASE_URL}/api/events/bookings?access_token=${encodeURIComponent(token)}`
+    );
+    const handleBookingEvent = async (message) => {
+      const event = JSON.parse(message.data);
+      const setBookings = event.owner_id === currentUser.id ? setBookingRequests : setMyRentals;
+
+      if (event.type === 'booking.status_changed') {
+        setBookings(prev =>
+          prev.map(booking => booking.id === event.booking_id ? { ...booking, status: event.status } : booking)
+        );
+        return;
+      }
+
+      // booking.created: the event carries the booking; its item is fetched once
+      let item = null;
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/items/?ids=${event.item_id}`, { credentials: 'include' });
+        if (response.ok) item = (await response.json())[0] || null;
+      } catch (err) {
+        // Shown as "Unknown Item" until the next reload
+      }
+      const booking = {
+        id: event.booking_id,
+        item_id: event.item_id,
+        renter_id: event.renter_id,
+        status: event.status,
+        start_date: event.start_date,
+        end_date: event.end_date,
+        total_price: event.total_price,
+        item,
+      };
+      setBookings(prev => (prev.some(b => b.id === booking.id) ? prev : [...prev, booking]));
+    };
+
+    source.addEventListener('booking.created', handleBookingEvent);
+    source.addEventListener('booking.status_changed', handleBookingEvent);
+    return () => source.close();
+  }, [currentUser, token]);
+
   const handleBookingStatusUpdate = async (bookingId, newStatus) => {
     try {
       const response = await fetch(`${API_BASE_URL}/api/bookings/${bookingId}`, {
+        credentials: 'include',
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -114,6 +193,19 @@ export const ProfilePage = ({ currentUser, token, dataVersion }) => {
   return (
     <div className="container mx-auto px-4 py-8">
       <h1 className="text-3xl font-bold mb-6">My Profile</h1>
+      <div className="mb-6 flex items-center gap-3 text-sm">
+        <label htmlFor="notification-frequency" className="font-medium text-gray-700">Booking emails</label>
+        <select
+          id="notification-frequency"
+          value={notificationFrequency}
+          onChange={(e) => handleNotificationFrequencyChange(e.target.value)}
+          className="border rounded-md px-2 py-1"
+        >
+          <option value="immediate">One email per booking</option>
+          <option value="hourly">Hourly digest</option>
+          <option value="daily">Daily digest</option>
+        </select>
+      </div>
       <div className="border-b mb-6">
         <nav className="-mb-px flex space-x-6">
           <button
@@ -8,6 +8,8 @@ export async function apiFetch(url, method = "GET", data = null, token = null) {
   const options = {
     method,
     headers,
+    // Sends the read-your-writes cookie (utilities/read_your_writes.py) cross-origin
+    credentials: "include",
     body: data ? JSON.stringify(data) : null,
   };
 